@@ -1,42 +1,150 @@
-from flask import Flask, jsonify, render_template, send_from_directory, request, redirect, url_for, flash, session
+from flask import Flask, Response, jsonify, render_template, render_template_string, send_from_directory, request, redirect, url_for, flash, session
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
 import requests
 from requests.auth import HTTPBasicAuth
+import io
 import os
 import logging
 import sys
 from datetime import datetime, timedelta
 import random
-import math
+import numpy as np
 from services.iso_ne_service import IsoNeService
+from services.timeseries_store import TimeSeriesStore, to_epoch, to_iso
+from services.downsampling import downsample_load, downsample_timeseries, target_points
+from services.load_series import LoadSeries
+from services.payload_cache import EncodedPayload, PayloadCache
+from services.compression import compress, negotiate
+from services.structured_logging import configure_logging, log_payload
+from services.database import configure_engine, database_url, engine_options
+from services.password_hashing import HashingUnavailable, PasswordHasher
+from services.session_store import ServerSessionInterface, load_secret_key
+from services.shared_snapshot import SharedSnapshot
+from services.iso_ne_parsers import parse_price
+from services.fuel_mix import carbon_intensity, normalize as normalize_fuel_mix, normalize_fields
+from services.carbon_intensity import RESOLUTIONS, carbon_intensity_series, hourly_carbon_per_kwh, trailing_hourly
+from services.local_time import ZONE
+from services.usage_rollups import apply_readings, latest_rollups, rebuild_rollups, user_readings
+from services.interval_import import ImportFormatError, ImportInterrupted, batched, iter_readings
+from xml.etree.ElementTree import ParseError
+import click
+from services.points import score as score_action, score_batch, score_ndjson
+from services.points_ledger import (
+    DUPLICATE, INSUFFICIENT, award_many, balance as ledger_balance, history as ledger_history,
+    open_balances, redeem as redeem_points, scope_keys
+)
+from services.window_finder import METRICS as WINDOW_METRICS
+import threading
 from config import Config
 from functools import wraps
-
-app = Flask(__name__, static_folder='static')
+from assets import load_manifest
+from articles import ARTICLES
+from jinja2 import FileSystemBytecodeCache
+import time
+import mimetypes
+import multiprocessing
+import uuid
+
+class PeakWiseJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes columnar series in their compact wire format."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, LoadSeries):
+            return o.to_wire()
+        return DefaultJSONProvider.default(o)
+
+# Static files are served by serve_static below so fingerprinted assets get immutable caching
+app = Flask(__name__, static_folder=None)
+app.static_folder = 'static'
+app.json = PeakWiseJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
 
+# Keep compiled templates on disk so a cold worker does not recompile them on its first requests
+_jinja_cache_dir = os.path.join(app.instance_path, Config.JINJA_BYTECODE_CACHE_DIR)
+os.makedirs(_jinja_cache_dir, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(_jinja_cache_dir)
+
+# Fingerprinted asset names produced by `python assets.py`; empty until assets are built
+asset_manifest = load_manifest(app.static_folder)
+fingerprinted_assets = {entry['path']: entry for entry in asset_manifest.values()}
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint, values):
+    """Point url_for('static', ...) at the fingerprinted copy of an asset when one exists."""
+    if endpoint == 'static' and values.get('filename') in asset_manifest:
+        values['filename'] = asset_manifest[values['filename']]['path']
+
 # Configure database
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///peakwise.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = database_url()
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SECRET_KEY'] = os.urandom(24)  # For session management
+# One key for every worker, so a session cookie validates wherever the request lands
+app.config['SECRET_KEY'] = load_secret_key(os.path.join(app.instance_path, Config.SECRET_KEY_FILENAME))
+app.config['MAX_CONTENT_LENGTH'] = Config.IMPORT_MAX_BYTES
 db = SQLAlchemy(app)
 
+# Hashes passwords on worker processes so a login burst does not stall other requests
+password_hasher = PasswordHasher()
+
 # User model
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128))
+    password_hash = db.Column(db.String(256))  # scrypt hashes are 162 characters
     points = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """Check ``password``, upgrading the stored hash if the hashing policy has changed since it was made."""
+        matches, new_hash = password_hasher.verify(self.password_hash, password)
+        if new_hash:
+            self.password_hash = new_hash
+        return matches
+
+# Append-only record of every points award and redemption; User.points is the running balance
+class PointsLedgerEntry(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'idempotency_key'),
+        db.Index('ix_points_ledger_entry_user_id_id', 'user_id', 'id'),
+        db.Index('ix_points_ledger_entry_idempotency_key', 'idempotency_key'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    delta = db.Column(db.Integer, nullable=False)  # Positive for awards, negative for redemptions
+    kind = db.Column(db.String(16), nullable=False)  # 'award', 'redemption' or 'opening'
+    reference = db.Column(db.String(120))  # Action type or reward id
+    idempotency_key = db.Column(db.String(64))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=db.func.current_timestamp())
+
+# Server-side session data; the cookie only carries the signed session id and version
+class UserSession(db.Model):
+    sid = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.Text, nullable=False)  # TaggedJSONSerializer output
+    version = db.Column(db.Integer, nullable=False, default=1)  # Bumped on every change
+    expires_at = db.Column(db.Integer, nullable=False, index=True)  # Epoch seconds
+
+# Metered interval consumption, one row per user and interval
+class UsageReading(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    ts = db.Column(db.Integer, primary_key=True)  # Interval start, epoch seconds
+    kwh = db.Column(db.Float, nullable=False)
+
+# Hourly and daily usage totals, kept up to date by services.usage_rollups as readings arrive
+class UsageRollup(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    period = db.Column(db.String(4), primary_key=True)  # 'hour' or 'day'
+    start = db.Column(db.Integer, primary_key=True)  # Local period start, epoch seconds
+    kwh = db.Column(db.Float, nullable=False, default=0)
+    peak_kwh = db.Column(db.Float, nullable=False, default=0)
+    cost = db.Column(db.Float, nullable=False, default=0)
+    carbon_kg = db.Column(db.Float, nullable=False, default=0)
 
 # Login required decorator
 def login_required(f):
@@ -48,18 +156,106 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
-# Create database tables
+# Tune the engine's connections, then create database tables
 with app.app_context():
+    configure_engine(db.engine)
     db.create_all()
+    with db.engine.begin() as conn:
+        scope_keys(conn)
+        open_balances(conn)
+    app.session_interface = ServerSessionInterface(db.engine)
 
 # Configure logging
-logging.basicConfig(
-    level=Config.LOG_LEVEL,
-    format=Config.LOG_FORMAT
-)
+configure_logging()
 logger = logging.getLogger('iso-ne-api')
 
-iso_service = IsoNeService()
+timeseries_store = TimeSeriesStore(os.path.join(app.instance_path, Config.TIMESERIES_DB_FILENAME))
+
+# Dashboard snapshot published by one worker and mapped by every other
+shared_snapshot = None
+if Config.SHARED_SNAPSHOT:
+    try:
+        shared_snapshot = SharedSnapshot(
+            os.path.join(app.instance_path, Config.SHARED_SNAPSHOT_FILENAME), Config.SHARED_SNAPSHOT_SIZE
+        )
+    except OSError as e:
+        logger.error("Shared snapshot unavailable, this worker will fetch its own: %s", e)
+iso_service = IsoNeService(store=timeseries_store, shared=shared_snapshot)
+# Spawned helper processes (the password hashing pool) re-import this module when it is run directly
+if Config.SNAPSHOT_BACKGROUND_REFRESH and multiprocessing.parent_process() is None:
+    iso_service.start_background_refresh()
+
+# Encoded dashboard bodies, shared by every request and stream for a snapshot version
+payload_cache = PayloadCache()
+
+def snapshot_payload(name, render=lambda data: data, points=None):
+    """Return ``(snapshot version, EncodedPayload)`` for a view of the dashboard snapshot.
+
+    ``render`` picks the part of the snapshot to send; its JSON encoding and
+    ETag are computed once per snapshot version and shared by all clients.
+    """
+    version, data = iso_service.get_versioned_dashboard_data(points=points)
+    # Key on the normalized point count so nearby requests share one encoding
+    points = target_points(points, len(data.get('systemLoad') or ()))
+    payload = payload_cache.get(
+        (name, points),
+        version,
+        lambda: EncodedPayload(
+            app.json.dumps(render(data)).encode('utf-8'),
+            iso_service.snapshot_fetched_at
+        )
+    )
+    return version, payload
+
+def payload_response(payload, mimetype, max_age):
+    """Build a conditional response for a pre-encoded payload.
+
+    A matching ``If-None-Match`` gets a 304 with no body. The body is
+    compressed with the negotiated encoding, reusing the payload's cached variant.
+    """
+    encoding = negotiate(request.accept_encodings, len(payload.body))
+    body, etag = payload.encoded(encoding)
+
+    response = Response(body, mimetype=mimetype)
+    if encoding:
+        response.content_encoding = encoding
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    response.last_modified = payload.last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = int(max_age)
+    return response.make_conditional(request)
+
+def snapshot_response(payload):
+    """Conditional JSON response cacheable until the next expected ISO update."""
+    return payload_response(payload, 'application/json', iso_service.seconds_until_snapshot_expires())
+
+# Education articles never change between deploys, so each is rendered once per process
+_rendered_articles = {}
+_process_started_at = time.time()
+
+def rendered_article(slug):
+    """Render an article from the registry into final HTML bytes, memoized per process."""
+    payload = _rendered_articles.get(slug)
+    if payload is None:
+        article = ARTICLES[slug]
+        html = render_template('article.html',
+            title=article['title'],
+            read_time=article['read_time'],
+            difficulty=article['difficulty'],
+            # Article bodies are Jinja snippets so their url_for calls pick up fingerprinted assets
+            content=render_template_string(article['content'])
+        )
+        payload = EncodedPayload(html.encode('utf-8'), _process_started_at)
+        _rendered_articles[slug] = payload
+    return payload
+
+def article_response(slug):
+    """Serve a pre-rendered education article."""
+    return payload_response(rendered_article(slug), 'text/html', Config.ARTICLE_MAX_AGE)
+
+_stream_clients = 0
+_stream_clients_lock = threading.Lock()
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -69,7 +265,16 @@ def login():
         
         user = User.query.filter_by(username=username).first()
         
-        if user and user.check_password(password):
+        try:
+            authenticated = user is not None and user.check_password(password)
+        except HashingUnavailable as e:
+            logger.warning("Login for %s refused: %s", username, e)
+            flash('Too many people are signing in right now. Please try again in a moment.', 'error')
+            return render_template('login.html'), 503
+
+        if authenticated:
+            db.session.commit()  # Persists an upgraded password hash
+            session.regenerate()  # A new session id on login, so a planted one is never authenticated
             session['user_id'] = user.id
             session['username'] = user.username
             flash('Successfully logged in!', 'success')
@@ -95,7 +300,12 @@ def register():
             return redirect(url_for('register'))
         
         user = User(username=username, email=email)
-        user.set_password(password)
+        try:
+            user.set_password(password)
+        except HashingUnavailable as e:
+            logger.warning("Registration for %s refused: %s", username, e)
+            flash('Too many people are signing up right now. Please try again in a moment.', 'error')
+            return render_template('register.html'), 503
         db.session.add(user)
         db.session.commit()
         
@@ -125,260 +335,208 @@ def education():
 @app.route('/education/grid-basics')
 def grid_basics():
     """Render the Grid Basics article."""
-    return render_template('article.html',
-        title="The Basics of the Electrical Grid",
-        read_time=5,
-        difficulty="Beginner",
-        content="""
-            <div class="article-image-container">
-                <img src="{{ url_for('static', filename='images/grid-basics.jpg') }}" alt="Electrical Grid Components" class="article-image">
-                <div class="image-caption">The electrical grid connects power plants to consumers through transmission and distribution networks.</div>
-            </div>
-
-            <h2><i class="fas fa-bolt"></i> What is the Electrical Grid?</h2>
-            <p>The electrical grid is a complex network of power plants, transmission lines, substations, and distribution systems that work together to deliver electricity from where it's generated to where it's needed. Think of it as a vast, interconnected web that powers our modern world.</p>
-
-            <h2><i class="fas fa-cogs"></i> Key Components</h2>
-            <p>The grid consists of three main components:</p>
-            <ul>
-                <li><i class="fas fa-industry"></i> <strong>Generation:</strong> Power plants that create electricity from various sources (coal, natural gas, nuclear, renewables)</li>
-                <li><i class="fas fa-tower-broadcast"></i> <strong>Transmission:</strong> High-voltage power lines that carry electricity over long distances</li>
-                <li><i class="fas fa-home"></i> <strong>Distribution:</strong> Lower-voltage lines that deliver power to homes and businesses</li>
-            </ul>
-
-            <div class="infobox">
-                <h3><i class="fas fa-lightbulb"></i> Did You Know?</h3>
-                <p>The U.S. electrical grid is often called the "largest machine in the world" because it connects thousands of power plants to millions of consumers across the country.</p>
-            </div>
-
-            <h2><i class="fas fa-random"></i> How Power Flows</h2>
-            <p>Electricity flows from power plants through transmission lines at high voltages (up to 765,000 volts) to reduce energy loss. At substations, transformers step down the voltage for distribution to homes and businesses, where it's typically used at 120/240 volts.</p>
-
-            <h2><i class="fas fa-balance-scale"></i> Grid Balance</h2>
-            <p>One of the most critical aspects of grid operation is maintaining balance between supply and demand. Grid operators must constantly adjust power generation to match consumer demand, as electricity cannot be stored in large quantities.</p>
-
-            <h2><i class="fas fa-user"></i> Your Role in the Grid</h2>
-            <p>As a consumer, your energy usage patterns directly impact the grid. During peak demand periods (like hot summer afternoons), the grid can become stressed, leading to higher prices and potential reliability issues. By understanding your energy usage and participating in demand response programs, you can help maintain grid stability.</p>
-        """
-    )
+    return article_response('grid-basics')
 
 @app.route('/education/demand-response')
 def demand_response():
     """Render the Demand Response article."""
-    return render_template('article.html',
-        title="Understanding Demand Response",
-        read_time=7,
-        difficulty="Intermediate",
-        content="""
-            <div class="article-image-container">
-                <img src="{{ url_for('static', filename='images/demand-response.jpg') }}" alt="Demand Response Concept" class="article-image">
-                <div class="image-caption">Smart meters and automated systems help manage electricity demand during peak periods.</div>
-            </div>
-
-            <h2><i class="fas fa-chart-line"></i> What is Demand Response?</h2>
-            <p>Demand response is a strategy used by grid operators to manage electricity consumption during peak periods. It involves adjusting power usage in response to signals about grid conditions, helping to maintain balance between supply and demand.</p>
-
-            <h2><i class="fas fa-cogs"></i> How Demand Response Works</h2>
-            <p>When the grid is stressed (during peak demand), grid operators can:</p>
-            <ul>
-                <li><i class="fas fa-bell"></i> Send signals to participating consumers to reduce their energy use</li>
-                <li><i class="fas fa-dollar-sign"></i> Offer financial incentives for reducing consumption</li>
-                <li><i class="fas fa-clock"></i> Implement time-of-use pricing to encourage off-peak usage</li>
-            </ul>
-
-            <div class="infobox">
-                <h3><i class="fas fa-chart-bar"></i> Real-World Impact</h3>
-                <p>During a major heat wave, demand response programs can reduce peak demand by 5-15%, helping to prevent blackouts and reduce electricity costs for everyone.</p>
-            </div>
-
-            <h2><i class="fas fa-tags"></i> Types of Demand Response</h2>
-            <p>There are several types of demand response programs:</p>
-            <ul>
-                <li><i class="fas fa-tag"></i> <strong>Price-based:</strong> Consumers respond to varying electricity prices</li>
-                <li><i class="fas fa-gift"></i> <strong>Incentive-based:</strong> Consumers receive payments for reducing usage</li>
-                <li><i class="fas fa-exclamation-triangle"></i> <strong>Emergency:</strong> Voluntary or mandatory reductions during grid emergencies</li>
-            </ul>
-
-            <h2><i class="fas fa-star"></i> Benefits of Participation</h2>
-            <p>Participating in demand response programs can:</p>
-            <ul>
-                <li><i class="fas fa-piggy-bank"></i> Reduce your electricity bills</li>
-                <li><i class="fas fa-shield-alt"></i> Help prevent blackouts</li>
-                <li><i class="fas fa-leaf"></i> Support the integration of renewable energy</li>
-                <li><i class="fas fa-globe"></i> Contribute to a more sustainable energy future</li>
-            </ul>
-
-            <h2><i class="fas fa-user-plus"></i> How to Participate</h2>
-            <p>Many utilities offer demand response programs. You can:</p>
-            <ul>
-                <li><i class="fas fa-phone"></i> Contact your utility to learn about available programs</li>
-                <li><i class="fas fa-thermometer-half"></i> Install smart thermostats and other automated devices</li>
-                <li><i class="fas fa-clock"></i> Sign up for time-of-use pricing plans</li>
-                <li><i class="fas fa-users"></i> Join community-based demand response initiatives</li>
-            </ul>
-        """
-    )
+    return article_response('demand-response')
 
 @app.route('/education/renewable-energy')
 def renewable_energy():
     """Render the Renewable Energy Integration article."""
-    return render_template('article.html',
-        title="Renewable Energy Integration",
-        read_time=6,
-        difficulty="Intermediate",
-        content="""
-            <div class="article-image-container">
-                <img src="{{ url_for('static', filename='images/renewable-energy.jpg') }}" alt="Renewable Energy Sources" class="article-image">
-                <div class="image-caption">Solar panels and wind turbines are becoming increasingly common sights in our energy landscape.</div>
-            </div>
-
-            <h2><i class="fas fa-sun"></i> The Rise of Renewable Energy</h2>
-            <p>Renewable energy sources like solar and wind are playing an increasingly important role in our electrical grid. However, integrating these variable resources presents unique challenges and opportunities.</p>
-
-            <h2><i class="fas fa-list"></i> Types of Renewable Energy</h2>
-            <p>The main renewable energy sources integrated into the grid include:</p>
-            <ul>
-                <li><i class="fas fa-solar-panel"></i> <strong>Solar Power:</strong> Photovoltaic panels and concentrated solar power</li>
-                <li><i class="fas fa-wind"></i> <strong>Wind Power:</strong> Onshore and offshore wind turbines</li>
-                <li><i class="fas fa-water"></i> <strong>Hydropower:</strong> Traditional dams and run-of-river systems</li>
-                <li><i class="fas fa-tree"></i> <strong>Biomass:</strong> Organic materials converted to energy</li>
-            </ul>
-
-            <div class="infobox">
-                <h3><i class="fas fa-sync"></i> Grid Flexibility</h3>
-                <p>To accommodate variable renewable energy, the grid needs to be more flexible. This means having the ability to quickly adjust power generation and consumption to match the changing output of renewable sources.</p>
-            </div>
-
-            <h2><i class="fas fa-exclamation-circle"></i> Challenges of Integration</h2>
-            <p>Integrating renewable energy presents several challenges:</p>
-            <ul>
-                <li><i class="fas fa-cloud-sun"></i> <strong>Variability:</strong> Solar and wind power output changes with weather conditions</li>
-                <li><i class="fas fa-chart-line"></i> <strong>Predictability:</strong> Accurate forecasting is essential for grid planning</li>
-                <li><i class="fas fa-balance-scale"></i> <strong>Grid Stability:</strong> Maintaining frequency and voltage within acceptable ranges</li>
-                <li><i class="fas fa-battery-full"></i> <strong>Storage:</strong> Need for energy storage to balance supply and demand</li>
-            </ul>
-
-            <h2><i class="fas fa-lightbulb"></i> Solutions and Innovations</h2>
-            <p>Grid operators and technology providers are developing various solutions:</p>
-            <ul>
-                <li><i class="fas fa-robot"></i> Advanced forecasting systems</li>
-                <li><i class="fas fa-battery-three-quarters"></i> Grid-scale energy storage</li>
-                <li><i class="fas fa-microchip"></i> Smart grid technologies</li>
-                <li><i class="fas fa-users"></i> Demand response programs</li>
-                <li><i class="fas fa-solar-panel"></i> Microgrids and distributed generation</li>
-            </ul>
-
-            <h2><i class="fas fa-rocket"></i> The Future of Renewable Integration</h2>
-            <p>As technology advances and costs decrease, renewable energy will play an even larger role in our grid. This transition requires:</p>
-            <ul>
-                <li><i class="fas fa-tools"></i> Continued investment in grid infrastructure</li>
-                <li><i class="fas fa-flask"></i> Development of new storage technologies</li>
-                <li><i class="fas fa-desktop"></i> Enhanced grid management systems</li>
-                <li><i class="fas fa-file-contract"></i> Supportive policies and regulations</li>
-            </ul>
-        """
-    )
+    return article_response('renewable-energy')
 
 @app.route('/education/smart-grid')
 def smart_grid():
     """Render the Smart Grid article."""
-    return render_template('article.html',
-        title="The Smart Grid Revolution",
-        read_time=8,
-        difficulty="Advanced",
-        content="""
-            <div class="article-image-container">
-                <img src="{{ url_for('static', filename='images/smart-grid.jpg') }}" alt="Smart Grid Technology" class="article-image">
-                <div class="image-caption">The smart grid uses digital technology to improve efficiency and reliability.</div>
-            </div>
-
-            <h2><i class="fas fa-microchip"></i> What is the Smart Grid?</h2>
-            <p>The smart grid is a modernized electrical grid that uses digital technology to improve efficiency, reliability, and sustainability. It represents a fundamental transformation in how we generate, distribute, and consume electricity.</p>
-
-            <h2><i class="fas fa-list-check"></i> Key Features of the Smart Grid</h2>
-            <p>The smart grid incorporates several advanced technologies:</p>
-            <ul>
-                <li><i class="fas fa-tachometer-alt"></i> <strong>Advanced Metering Infrastructure (AMI):</strong> Smart meters that provide real-time usage data</li>
-                <li><i class="fas fa-robot"></i> <strong>Distribution Automation:</strong> Self-healing systems that detect and respond to problems</li>
-                <li><i class="fas fa-battery-full"></i> <strong>Grid Storage:</strong> Advanced batteries and other storage solutions</li>
-                <li><i class="fas fa-network-wired"></i> <strong>Microgrids:</strong> Localized grids that can operate independently</li>
-                <li><i class="fas fa-sliders-h"></i> <strong>Demand Response:</strong> Automated systems for managing peak demand</li>
-            </ul>
-
-            <div class="infobox">
-                <h3><i class="fas fa-digital-tachograph"></i> Digital Transformation</h3>
-                <p>The smart grid uses digital communication technology to detect and react to local changes in usage, similar to how the internet routes data around problems.</p>
-            </div>
-
-            <h2><i class="fas fa-star"></i> Benefits of the Smart Grid</h2>
-            <p>The smart grid offers numerous advantages:</p>
-            <ul>
-                <li><i class="fas fa-shield-alt"></i> <strong>Improved Reliability:</strong> Faster detection and response to problems</li>
-                <li><i class="fas fa-bolt"></i> <strong>Better Efficiency:</strong> Reduced energy losses and optimized power flow</li>
-                <li><i class="fas fa-lock"></i> <strong>Enhanced Security:</strong> Better protection against cyber threats</li>
-                <li><i class="fas fa-user-shield"></i> <strong>Consumer Empowerment:</strong> More control over energy usage and costs</li>
-                <li><i class="fas fa-leaf"></i> <strong>Environmental Benefits:</strong> Better integration of renewable energy</li>
-            </ul>
-
-            <h2><i class="fas fa-tools"></i> Smart Grid Technologies</h2>
-            <p>Key technologies enabling the smart grid include:</p>
-            <ul>
-                <li><i class="fas fa-wave-square"></i> Phasor Measurement Units (PMUs)</li>
-                <li><i class="fas fa-desktop"></i> Advanced Distribution Management Systems (ADMS)</li>
-                <li><i class="fas fa-cogs"></i> Energy Management Systems (EMS)</li>
-                <li><i class="fas fa-battery-three-quarters"></i> Grid-scale Energy Storage</li>
-                <li><i class="fas fa-car"></i> Electric Vehicle Integration</li>
-            </ul>
-
-            <h2><i class="fas fa-rocket"></i> The Future of the Smart Grid</h2>
-            <p>The smart grid continues to evolve with new technologies and applications:</p>
-            <ul>
-                <li><i class="fas fa-brain"></i> Artificial Intelligence and Machine Learning</li>
-                <li><i class="fas fa-link"></i> Blockchain for Energy Trading</li>
-                <li><i class="fas fa-battery-full"></i> Advanced Energy Storage Solutions</li>
-                <li><i class="fas fa-car-battery"></i> Vehicle-to-Grid (V2G) Integration</li>
-                <li><i class="fas fa-building"></i> Grid-Interactive Efficient Buildings</li>
-            </ul>
-
-            <h2><i class="fas fa-user"></i> Your Role in the Smart Grid</h2>
-            <p>As a consumer, you can participate in the smart grid through:</p>
-            <ul>
-                <li><i class="fas fa-tachometer-alt"></i> Installing smart meters and devices</li>
-                <li><i class="fas fa-sliders-h"></i> Participating in demand response programs</li>
-                <li><i class="fas fa-home"></i> Using smart home technology</li>
-                <li><i class="fas fa-car"></i> Considering electric vehicles</li>
-                <li><i class="fas fa-solar-panel"></i> Installing solar panels or other distributed generation</li>
-            </ul>
-        """
-    )
+    return article_response('smart-grid')
 
 @app.route('/favicon.ico')
 def favicon():
     """Serve the favicon.ico file."""
     return send_from_directory(app.static_folder, 'favicon.ico')
 
-@app.route('/static/<path:filename>')
+@app.route('/static/<path:filename>', endpoint='static')
 def serve_static(filename):
-    """Serve static files."""
-    return send_from_directory(app.static_folder, filename)
+    """Serve static files, sending fingerprinted assets precompressed and cached forever."""
+    entry = fingerprinted_assets.get(filename)
+    if entry is None:
+        return send_from_directory(app.static_folder, filename)
+
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = next(
+        (e for e in entry['encodings'] if request.accept_encodings.quality(e) > 0),
+        None
+    )
+    suffix = {'br': '.br', 'gzip': '.gz'}.get(encoding, '')
+    response = send_from_directory(
+        app.static_folder,
+        filename + suffix,
+        mimetype=mimetype,
+        max_age=Config.ASSET_MAX_AGE
+    )
+    if encoding:
+        response.content_encoding = encoding
+    response.vary.add('Accept-Encoding')
+    # The name changes whenever the content does, so browsers never need to revalidate
+    response.cache_control.immutable = True
+    return response
 
 @app.route('/api/fuel-mix')
 def get_fuel_mix():
     """Get current fuel mix data."""
-    return jsonify(iso_service.get_fuel_mix())
+    _, payload = snapshot_payload(
+        'fuel_mix',
+        lambda data: [data['generationMix'], data['resourceMix']]
+    )
+    return snapshot_response(payload)
 
 @app.route('/api/price')
 def get_price():
     """Get current electricity price."""
-    return jsonify({
-        "price": iso_service.get_price(),
-        "unit": "$/MWh"
-    })
+    _, payload = snapshot_payload(
+        'price',
+        lambda data: {
+            "price": data['price']['current'],
+            "unit": "$/MWh"
+        }
+    )
+    return snapshot_response(payload)
 
 @app.route('/api/dashboard-data')
 def get_dashboard_data():
-    """Get consolidated dashboard data."""
-    return jsonify(iso_service.get_dashboard_data())
+    """Get consolidated dashboard data, optionally downsampled to ?points=N."""
+    _, payload = snapshot_payload('dashboard', points=request.args.get('points', type=int))
+    return snapshot_response(payload)
+
+@app.route('/api/history')
+def get_history():
+    """Get stored ISO-NE history for a series over a time range, optionally downsampled to ?points=N."""
+    series = request.args.get('series', 'load')
+    if series not in TimeSeriesStore.SERIES:
+        return jsonify({
+            "error": f"Unknown series '{series}', expected one of {', '.join(TimeSeriesStore.SERIES)}"
+        }), 400
+
+    try:
+        end = to_epoch(request.args.get('end') or datetime.now())
+        start = to_epoch(request.args.get('start') or end - int(Config.HISTORY_DEFAULT_WINDOW.total_seconds()))
+    except ValueError as e:
+        return jsonify({"error": f"Invalid start or end: {e}"}), 400
+
+    if start > end:
+        return jsonify({"error": "start must not be after end"}), 400
+
+    data = timeseries_store.query(series, start, end)
+    points = request.args.get('points', type=int)
+    if points and series == 'load':
+        data = downsample_load(data, points)
+    elif points and series == 'price':
+        data = downsample_timeseries(data, points)
+
+    return jsonify({
+        "series": series,
+        "start": to_iso(start),
+        "end": to_iso(end),
+        "data": data
+    })
+
+@app.route('/api/carbon-intensity/series')
+def get_carbon_intensity_series():
+    """Get grid carbon intensity over a time range from stored fuel mix history."""
+    resolution = request.args.get('resolution', 'raw')
+    if resolution not in RESOLUTIONS:
+        return jsonify({
+            "error": f"Unknown resolution '{resolution}', expected one of {', '.join(RESOLUTIONS)}"
+        }), 400
+
+    try:
+        end = to_epoch(request.args.get('end') or datetime.now())
+        start = to_epoch(request.args.get('start') or end - int(Config.HISTORY_DEFAULT_WINDOW.total_seconds()))
+    except ValueError as e:
+        return jsonify({"error": f"Invalid start or end: {e}"}), 400
+
+    if start > end:
+        return jsonify({"error": "start must not be after end"}), 400
+
+    return jsonify({
+        "resolution": resolution,
+        "start": to_iso(start),
+        "end": to_iso(end),
+        "data": carbon_intensity_series(timeseries_store, start, end, resolution)
+    })
+
+@app.route('/api/best-window')
+def get_best_window():
+    """Get the cheapest or cleanest upcoming window to run an appliance for ?duration minutes."""
+    metric = request.args.get('metric', 'price')
+    if metric not in WINDOW_METRICS:
+        return jsonify({
+            "error": f"Unknown metric '{metric}', expected one of {', '.join(WINDOW_METRICS)}"
+        }), 400
+
+    duration = request.args.get('duration', default=120, type=int)
+    if duration is None or duration <= 0:
+        return jsonify({"error": "duration must be a positive number of minutes"}), 400
+
+    window = iso_service.best_window(metric, duration)
+    if window is None:
+        return jsonify({"error": f"No {metric} forecast covering {duration} minutes yet"}), 404
+
+    return jsonify({
+        "metric": metric,
+        "duration": duration,
+        "start": to_iso(window.start),
+        "end": to_iso(window.end),
+        "average": round(window.average, 2),
+        "baseline": round(window.baseline, 2),
+        "unit": WINDOW_METRICS[metric]
+    })
+
+@app.route('/api/connection-stats')
+def get_connection_stats():
+    """Get connection reuse statistics for the ISO-NE HTTP client."""
+    return jsonify(iso_service.get_connection_stats())
+
+@app.route('/api/stream')
+def stream_dashboard_data():
+    """Stream a dashboard snapshot to the client each time fresh ISO data is published."""
+    global _stream_clients
+    # Take the slot before answering, so concurrent requests cannot all pass the check
+    with _stream_clients_lock:
+        if _stream_clients >= Config.SSE_MAX_CLIENTS:
+            return jsonify({"error": "Too many open streams, fall back to polling"}), 503
+        _stream_clients += 1
+
+    def release_slot():
+        global _stream_clients
+        with _stream_clients_lock:
+            _stream_clients -= 1
+
+    points = request.args.get('points', type=int)
+    last_version = request.headers.get('Last-Event-ID', default=0, type=int)
+
+    def events():
+        nonlocal last_version
+        yield f"retry: {Config.SSE_RETRY_MS}\n\n".encode('utf-8')
+        while True:
+            version, payload = snapshot_payload('dashboard', points=points)
+            if version != last_version:
+                last_version = version
+                yield b"id: %d\nevent: snapshot\ndata: %s\n\n" % (version, payload.body)
+            else:
+                # Comment line keeps proxies from closing an idle connection
+                yield b": keep-alive\n\n"
+            iso_service.wait_for_snapshot(last_version, timeout=Config.SSE_HEARTBEAT_INTERVAL)
+
+    response = Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Disable proxy buffering so events arrive immediately
+    })
+    # Runs when the server closes the response, even if the stream never started
+    response.call_on_close(release_slot)
+    return response
 
 @app.route('/api/test')
 def test_api_connection():
@@ -426,12 +584,10 @@ def get_sample_data():
     """Return sample data for testing."""
     current_time = datetime.now()
     
-    # Generate timestamps for the last 24 hours, one per minute
-    timestamps = [
-        (current_time - timedelta(minutes=i)).isoformat()
-        for i in range(24 * 60)  # 24 hours * 60 minutes
-    ]
-    timestamps.reverse()  # Most recent last
+    # Generate timestamps for the last 24 hours, one per minute, most recent last
+    now = int(current_time.timestamp())
+    minutes = np.arange(24 * 60)
+    timestamps = now - 60 * minutes[::-1]
     
     # Generate realistic load data
     base_load = 15000  # Base load in MW
@@ -440,27 +596,20 @@ def get_sample_data():
     forecast_error = 500  # Maximum forecast error in MW
     
     # Generate actual values with both daily and hourly patterns
-    actual_values = []
-    for i in range(24 * 60):
-        hour = i / 60
-        # Daily pattern: lowest at 3am, highest at 6pm
-        daily_factor = math.sin((hour - 3) * math.pi / 24)
-        # Add some random noise
-        noise = random.uniform(-200, 200)
-        
-        load = (
-            base_load +  # Base load
-            peak_variation * math.sin(i * math.pi / (12 * 60)) +  # 12-hour pattern
-            daily_pattern * daily_factor +  # Daily pattern
-            noise  # Random variation
-        )
-        actual_values.append(load)
+    hour = minutes / 60
+    # Daily pattern: lowest at 3am, highest at 6pm
+    daily_factor = np.sin((hour - 3) * np.pi / 24)
+    # Add some random noise
+    noise = np.random.uniform(-200, 200, len(minutes))
+    actual_values = (
+        base_load +  # Base load
+        peak_variation * np.sin(minutes * np.pi / (12 * 60)) +  # 12-hour pattern
+        daily_pattern * daily_factor +  # Daily pattern
+        noise  # Random variation
+    )
     
     # Generate forecast values with realistic errors
-    forecast_values = [
-        actual + random.uniform(-forecast_error, forecast_error)
-        for actual in actual_values
-    ]
+    forecast_values = actual_values + np.random.uniform(-forecast_error, forecast_error, len(minutes))
     
     sample_mix = {
         "natural_gas": 42,
@@ -490,15 +639,13 @@ def get_sample_data():
             "current": 230.5,
             "unit": "kg CO₂eq/MWh"
         },
-        "systemLoad": {
-            "timestamps": timestamps,
-            "actual": actual_values,
-            "forecast": forecast_values
-        },
+        "systemLoad": LoadSeries(timestamps, actual_values, forecast_values),
         "timestamp": current_time.isoformat(),
         "api_info": {
             "price_data_source": "sample",
             "fuel_mix_source": "sample",
+            "generation_mix_source": "sample",
+            "resource_mix_source": "sample",
             "system_load_source": "sample"
         }
     }
@@ -508,8 +655,8 @@ def get_sample_data():
 def test_connection():
     """Test the connection to the ISO-NE API."""
     try:
-        # Get a small amount of data to test the connection
-        data = iso_service.get_dashboard_data()
+        # Bypass the snapshot cache so the upstream API is actually exercised
+        data = iso_service.fetch_dashboard_data()
         return jsonify({
             "status": "success",
             "message": "Successfully connected to ISO-NE API",
@@ -524,96 +671,23 @@ def test_connection():
 
 def extract_price(price_data):
     """Extract price from various response formats."""
-    logger.info(f"Attempting to extract price from data: {str(price_data)[:200]}...")
+    log_payload(logger, "Attempting to extract price from data: %.200s...", price_data)
     
     # Handle default case
     if isinstance(price_data, dict) and price_data.get('default', False):
         return price_data.get('price', 50.0)
     
     try:
-        # Format 1: Prices array
-        if price_data and 'Prices' in price_data and len(price_data['Prices']) > 0:
-            price = price_data['Prices'][0].get('Price', 0)
-            if price: return price
-        
-        # Format 2: LmpData array
-        if price_data and 'LmpData' in price_data and len(price_data['LmpData']) > 0:
-            price = price_data['LmpData'][0].get('LmpTotal', 0)
-            if price: return price
-        
-        # Format 3: Direct price property
-        if price_data and 'Price' in price_data:
-            price = price_data['Price']
-            if price: return price
-            
-        # Format 4: SystemPrice
-        if price_data and 'SystemPrice' in price_data:
-            price = price_data['SystemPrice']
-            if price: return price
-        
-        # Format 5: FiveMinPrices
-        if price_data and 'FiveMinPrices' in price_data and len(price_data['FiveMinPrices']) > 0:
-            price = price_data['FiveMinPrices'][0].get('Price', 0)
-            if price: return price
-        
-        # Format 6: HourlyLmps
-        if price_data and 'HourlyLmps' in price_data and len(price_data['HourlyLmps']) > 0:
-            price = price_data['HourlyLmps'][0].get('LmpTotal', 0)
-            if price: return price
-        
-        # Format 7: FiveMinuteLmp
-        if price_data and 'FiveMinuteLmps' in price_data and len(price_data['FiveMinuteLmps']) > 0:
-            # Try to extract LMP price from first location
-            if 'Location' in price_data['FiveMinuteLmps'][0]:
-                location_data = price_data['FiveMinuteLmps'][0].get('Location', {})
-                price = location_data.get('LmpTotal', 0)
-                if price:
-                    logger.info(f"Found FiveMinuteLmp price: {price}")
-                    return price
-            
-            # If no specific Location or LmpTotal, try other potential price values
-            for field in ['TotalPrice', 'Price', 'Value', 'LmpTotal']:
-                price = price_data['FiveMinuteLmps'][0].get(field, 0)
-                if price:
-                    logger.info(f"Found FiveMinuteLmp {field}: {price}")
-                    return price
-        
-        # Format 8: HourlyLmp
-        if price_data and 'HourlyLmps' in price_data and len(price_data['HourlyLmps']) > 0:
-            hourly_lmp = price_data['HourlyLmps'][0]
-            
-            # Try Location object first
-            if 'Location' in hourly_lmp:
-                location = hourly_lmp.get('Location', {})
-                price = location.get('LmpTotal', 0)
-                if price:
-                    logger.info(f"Found hourly LMP price: {price}")
-                    return price
-            
-            # Try directly on the HourlyLmp object
-            for field in ['LmpTotal', 'TotalPrice', 'Price', 'Value']:
-                price = hourly_lmp.get(field, 0)
-                if price:
-                    logger.info(f"Found hourly LMP {field}: {price}")
-                    return price
-        
-        # Deeper search - first level
-        for key, value in price_data.items():
-            if isinstance(value, list) and len(value) > 0:
-                # Try to find a price field in the first item of the list
-                if isinstance(value[0], dict):
-                    for possible_price_key in ['Price', 'LmpTotal', 'price', 'value', 'Amount']:
-                        if possible_price_key in value[0]:
-                            price = value[0][possible_price_key]
-                            if isinstance(price, (int, float)) and price > 0:
-                                logger.info(f"Found price {price} in {key}[0].{possible_price_key}")
-                                return price
-        
+        price = parse_price(price_data)
+        if price is not None:
+            return price
+
         # Log the full data structure to help diagnosis
-        logger.warning(f"Could not extract price from data: {price_data}")
+        logger.warning("Could not extract price from data")
+        log_payload(logger, "Unrecognized price data: %s", price_data)
         return 50  # Default fallback
     except Exception as e:
-        logger.error(f"Error extracting price: {e}", exc_info=True)
+        logger.error("Error extracting price: %s", e, exc_info=True)
         return 50
 
 def extract_fuel_mix(fuel_mix_data):
@@ -621,7 +695,9 @@ def extract_fuel_mix(fuel_mix_data):
     default_mix = {
         "natural_gas": 40,
         "nuclear": 30,
-        "renewables": 20,
+        "hydro": 10,
+        "solar": 5,
+        "wind": 5,
         "coal": 5,
         "oil": 5
     }
@@ -630,35 +706,13 @@ def extract_fuel_mix(fuel_mix_data):
         return default_mix
     
     try:
-        mix = fuel_mix_data['GenFuelMixes'][0]
-        return {
-            "natural_gas": mix.get('NaturalGas', 0),
-            "nuclear": mix.get('Nuclear', 0),
-            "renewables": mix.get('Solar', 0) + mix.get('Wind', 0) + mix.get('Hydro', 0),
-            "coal": mix.get('Coal', 0),
-            "oil": mix.get('Oil', 0)
-        }
+        mix = normalize_fuel_mix(fuel_mix_data)
+        return mix['percentages'] if mix else default_mix
     except Exception:
         return default_mix
 
 def calculate_carbon_intensity(fuel_mix):
-    emission_factors = {
-        "natural_gas": 400,
-        "nuclear": 12,
-        "renewables": 25,
-        "coal": 820,
-        "oil": 650
-    }
-    
-    total_emissions = 0
-    total_percentage = 0
-    
-    for fuel, percentage in fuel_mix.items():
-        if percentage > 0:
-            total_emissions += percentage * emission_factors.get(fuel, 0)
-            total_percentage += percentage
-    
-    return total_emissions / total_percentage if total_percentage > 0 else 0
+    return carbon_intensity(fuel_mix)
 
 def calculate_estimated_price(fuel_mix):
     """Calculate an estimated price based on the fuel mix."""
@@ -666,7 +720,9 @@ def calculate_estimated_price(fuel_mix):
     fuel_costs = {
         "natural_gas": 60,
         "nuclear": 30,
-        "renewables": 15,
+        "hydro": 15,
+        "solar": 15,
+        "wind": 15,
         "coal": 65,
         "oil": 120
     }
@@ -698,7 +754,7 @@ def try_fetch_fuel_mix():
     
     for endpoint in fuel_mix_endpoints:
         try:
-            logger.info(f"Trying fuel mix endpoint: {endpoint}")
+            logger.info("Trying fuel mix endpoint: %s", endpoint)
             response = requests.get(
                 f"{ISO_NE_API_URL}{endpoint}",
                 auth=HTTPBasicAuth(ISO_USERNAME, ISO_PASSWORD),
@@ -707,7 +763,7 @@ def try_fetch_fuel_mix():
             )
             
             if response.status_code == 200:
-                logger.info(f"Success with fuel mix endpoint: {endpoint}")
+                logger.info("Success with fuel mix endpoint: %s", endpoint)
                 data = response.json()
                 
                 # Try to extract fuel mix data
@@ -720,14 +776,14 @@ def try_fetch_fuel_mix():
                 if fuel_mix:
                     return fuel_mix, endpoint
                 else:
-                    logger.warning(f"Could not extract fuel mix from {endpoint} response")
+                    logger.warning("Could not extract fuel mix from %s response", endpoint)
             else:
-                logger.warning(f"Endpoint {endpoint} returned status {response.status_code}")
+                logger.warning("Endpoint %s returned status %s", endpoint, response.status_code)
                 
         except requests.exceptions.Timeout:
-            logger.error(f"Request to {endpoint} timed out")
+            logger.error("Request to %s timed out", endpoint)
         except Exception as e:
-            logger.error(f"Error with endpoint {endpoint}: {e}")
+            logger.error("Error with endpoint %s: %s", endpoint, e)
     
     # If we got here, none of the endpoints worked
     return None, None
@@ -735,7 +791,12 @@ def try_fetch_fuel_mix():
 def extract_fuel_mix_current(data):
     """Extract fuel mix from the /genfuelmix/current endpoint response."""
     try:
-        logger.info(f"Extracting fuel mix from /genfuelmix/current data: {str(data)[:200]}...")
+        log_payload(logger, "Extracting fuel mix from /genfuelmix/current data: %.200s...", data)
+        
+        # Standard GenFuelMix entries, bucketed exactly as IsoNeService does
+        standard_mix = normalize_fuel_mix(data)
+        if standard_mix:
+            return standard_mix['percentages']
         
         # Check for different possible formats based on the API documentation
         if 'GenFuelMixes' in data and len(data['GenFuelMixes']) > 0:
@@ -749,42 +810,96 @@ def extract_fuel_mix_current(data):
             logger.warning("Could not find fuel mix data in expected format")
             return None
         
-        # Extract values with multiple possible field names
-        result = {
-            "natural_gas": get_first_value(mix, ['NaturalGas', 'Gas', 'Natural_Gas']),
-            "nuclear": get_first_value(mix, ['Nuclear']),
-            "renewables": sum([
-                get_first_value(mix, ['Solar', 'Photovoltaic']), 
-                get_first_value(mix, ['Wind']),
-                get_first_value(mix, ['Hydro', 'HydroElectric'])
-            ]),
-            "coal": get_first_value(mix, ['Coal']),
-            "oil": get_first_value(mix, ['Oil', 'Petroleum'])
-        }
+        # Bucket every recognized fuel field the same way the service does
+        result = {k: v for k, v in normalize_fields(mix).items() if v > 0}
         
         # Check if we got any meaningful data
         if sum(result.values()) < 10:  # If total is less than 10%, probably bad data
-            logger.warning(f"Fuel mix data appears invalid: {result}")
+            logger.warning("Fuel mix data appears invalid: %s", result)
             return None
             
-        logger.info(f"Successfully extracted fuel mix: {result}")
+        logger.info("Successfully extracted fuel mix: %s", result)
         return result
         
     except Exception as e:
-        logger.error(f"Error extracting fuel mix from current data: {e}")
+        logger.error("Error extracting fuel mix from current data: %s", e)
         return None
 
-def get_first_value(data_dict, possible_keys, default=0):
-    """Helper to get the first available value from multiple possible keys."""
-    for key in possible_keys:
-        if key in data_dict and isinstance(data_dict[key], (int, float)):
-            return data_dict[key]
-    return default
+def record_usage(user_id, readings):
+    """Store (epoch, kWh) interval readings for a user and update their rollups in one transaction."""
+    readings = list(readings)
+    if not readings:
+        return 0
 
-@app.route('/insights')
-@login_required
-def insights():
-    """Render the personalized insights page."""
+    carbon_by_hour = usage_carbon_by_hour(readings)
+    with db.engine.begin() as conn:
+        return apply_readings(conn, user_id, readings, carbon_by_hour)
+
+def usage_carbon_by_hour(readings):
+    """Stored grid carbon intensity for the hours spanned by (epoch, kWh) readings, for rollups."""
+    timestamps = [ts for ts, _ in readings]
+    try:
+        return hourly_carbon_per_kwh(timeseries_store, min(timestamps), max(timestamps) + 3600)
+    except Exception as e:
+        logger.error("Error loading grid carbon intensity for usage rollups: %s", e)
+        return {}
+
+def import_usage(user_id, stream):
+    """Stream interval readings from a Green Button XML or CSV file into a user's history.
+
+    Readings are written in batches of ``Config.IMPORT_BATCH_SIZE``, one
+    transaction per batch. Returns ``(rows read, rows new or changed)``.
+    A file that turns out to be malformed partway raises ``ImportInterrupted``
+    with the counts of the batches already stored, since those are kept.
+    """
+    read = changed = 0
+    try:
+        for batch in batched(iter_readings(stream), Config.IMPORT_BATCH_SIZE):
+            changed += record_usage(user_id, batch)
+            read += len(batch)
+    except (ImportFormatError, ParseError, ValueError) as e:
+        raise ImportInterrupted(e, read, changed) from e
+    return read, changed
+
+def percent_change(current, previous):
+    return (current - previous) / previous * 100 if previous else 0.0
+
+def rollup_insights(user_id):
+    """Insights figures for the user's most recent day of metered usage, or None without any."""
+    with db.engine.connect() as conn:
+        rollups = latest_rollups(conn, user_id, hours=Config.INSIGHTS_HOURS, days=8)
+    hours = rollups['hour']
+    if not hours:
+        return None
+
+    total_usage = sum(row['kwh'] for row in hours)
+    peak_usage = sum(row['peak_kwh'] for row in hours)
+
+    # Trends compare the latest day with the average day of the week before it
+    latest, prior = rollups['day'][-1], rollups['day'][:-1]
+
+    def daily_average(column):
+        return sum(row[column] for row in prior) / len(prior) if prior else 0.0
+
+    def peak_share(peak_kwh, kwh):
+        return peak_kwh / kwh * 100 if kwh else 0.0
+
+    return {
+        'usage_labels': [datetime.fromtimestamp(row['start'], ZONE).strftime('%H:%M') for row in hours],
+        'usage_values': [round(row['kwh'], 2) for row in hours],
+        'carbon_intensity': [round(row['carbon_kg'] / row['kwh'], 2) if row['kwh'] else 0.0 for row in hours],
+        'peak_usage': peak_usage,
+        'peak_impact': round(peak_share(peak_usage, total_usage), 1),
+        'carbon_impact': round(sum(row['carbon_kg'] for row in hours), 1),
+        'cost_impact': round(sum(row['cost'] for row in hours), 2),
+        'peak_trend': round(peak_share(latest['peak_kwh'], latest['kwh'])
+                            - peak_share(daily_average('peak_kwh'), daily_average('kwh')), 1) if prior else 0.0,
+        'carbon_trend': round(percent_change(latest['carbon_kg'], daily_average('carbon_kg')), 1),
+        'cost_trend': round(percent_change(latest['cost'], daily_average('cost')), 1)
+    }
+
+def sample_insights():
+    """Sample insights figures for users who have not imported any usage yet."""
     # Generate sample data for the last 24 hours
     current_time = datetime.now()
     hours = [(current_time - timedelta(hours=i)).strftime('%H:%M') for i in range(24)]
@@ -803,17 +918,26 @@ def insights():
             usage = base_usage * 0.5 + random.uniform(0.2, 0.8)
         usage_values.append(round(usage, 2))
 
-    # Generate sample carbon intensity data (kg CO₂/kWh)
+    # Grid carbon intensity (kg CO₂/kWh) from stored fuel mix history,
+    # with sample values for hours we have no history for
+    try:
+        hourly_carbon = trailing_hourly(timeseries_store, current_time.timestamp(), 24) / 1000
+    except Exception as e:
+        logger.error("Error loading hourly carbon intensity: %s", e)
+        hourly_carbon = np.full(24, np.nan)
+
     base_carbon = 0.5  # Base carbon intensity
     carbon_intensity = []
     for i in range(24):
-        if i in peak_hours:
+        if not np.isnan(hourly_carbon[i]):
+            carbon = hourly_carbon[i]
+        elif i in peak_hours:
             # Higher carbon intensity during peak hours
             carbon = base_carbon * 1.5 + random.uniform(0.1, 0.3)
         else:
             # Lower carbon intensity during off-peak hours
             carbon = base_carbon * 0.8 + random.uniform(0.05, 0.15)
-        carbon_intensity.append(round(carbon, 2))
+        carbon_intensity.append(round(float(carbon), 2))
 
     # Calculate peak impact percentage
     total_usage = sum(usage_values)
@@ -825,18 +949,58 @@ def insights():
     daily_carbon = round(daily_carbon, 1)
 
     # Calculate cost impact (assuming higher rates during peak hours)
-    base_rate = 0.15  # Base rate per kWh
-    peak_rate = 0.30  # Peak rate per kWh
     daily_cost = sum(
-        usage * (peak_rate if i in peak_hours else base_rate)
+        usage * (Config.PEAK_RATE if i in peak_hours else Config.BASE_RATE)
         for i, usage in enumerate(usage_values)
     )
     daily_cost = round(daily_cost, 2)
 
     # Generate trends (sample data)
-    peak_trend = random.uniform(-5, 5)
-    carbon_trend = random.uniform(-3, 3)
-    cost_trend = random.uniform(-2, 2)
+    peak_trend = round(random.uniform(-5, 5), 1)
+    carbon_trend = round(random.uniform(-3, 3), 1)
+    cost_trend = round(random.uniform(-2, 2), 1)
+
+    return {
+        'usage_labels': hours,
+        'usage_values': usage_values,
+        'carbon_intensity': carbon_intensity,
+        'peak_usage': peak_usage,
+        'peak_impact': peak_impact,
+        'carbon_impact': daily_carbon,
+        'cost_impact': daily_cost,
+        'peak_trend': peak_trend,
+        'carbon_trend': carbon_trend,
+        'cost_trend': cost_trend
+    }
+
+def upcoming_window(metric, minutes):
+    """Best upcoming window for ``metric`` as local datetimes plus per-MWh savings, or None."""
+    try:
+        window = iso_service.best_window(metric, minutes)
+    except Exception as e:
+        logger.error("Error finding best %s window: %s", metric, e)
+        return None
+    if window is None:
+        return None
+    return {
+        'start': datetime.fromtimestamp(window.start),
+        'end': datetime.fromtimestamp(window.end),
+        'savings': window.baseline - window.average
+    }
+
+@app.route('/insights')
+@login_required
+def insights():
+    """Render the personalized insights page."""
+    try:
+        figures = rollup_insights(session['user_id'])
+    except Exception as e:
+        logger.error("Error loading usage rollups: %s", e)
+        figures = None
+    # Users without metered usage see sample data
+    if figures is None:
+        figures = sample_insights()
+    peak_usage = figures.pop('peak_usage')
 
     # Generate personalized recommendations
     recommendations = [
@@ -860,124 +1024,191 @@ def insights():
         }
     ]
 
+    # Replace the generic advice with upcoming windows from the grid forecasts when we have them
+    cheapest = upcoming_window('price', 180)
+    if cheapest:
+        recommendations[0]['description'] = (
+            f"Your energy usage during peak hours (6-8 PM) is high. Wholesale power is cheapest "
+            f"between {cheapest['start']:%H:%M} and {cheapest['end']:%H:%M}; shift flexible activities there."
+        )
+        recommendations[0]['savings'] = f"${peak_usage * max(cheapest['savings'], 0) / 1000:.2f} per day"
+
+    cleanest = upcoming_window('carbon', 120)
+    if cleanest:
+        laundry_kwh, loads_per_week = 3.0, 4
+        recommendations[2]['description'] = (
+            f"The grid is cleanest between {cleanest['start']:%H:%M} and {cleanest['end']:%H:%M}. "
+            f"Run laundry then to cut its carbon footprint."
+        )
+        recommendations[2]['savings'] = (
+            f"{laundry_kwh * loads_per_week * max(cleanest['savings'], 0) / 1000:.1f} kg CO₂ per week"
+        )
+
     return render_template('insights.html',
-        usage_labels=hours,
-        usage_values=usage_values,
-        carbon_intensity=carbon_intensity,
-        peak_impact=peak_impact,
-        peak_trend=peak_trend,
-        carbon_impact=daily_carbon,
-        carbon_trend=carbon_trend,
-        cost_impact=daily_cost,
-        cost_trend=cost_trend,
-        recommendations=recommendations
+        recommendations=recommendations,
+        **figures
     )
 
+@app.route('/api/usage', methods=['POST'])
+@login_required
+def add_usage():
+    """Add interval readings ({"readings": [{"timestamp", "kwh"}]}) for the logged-in user."""
+    data = request.get_json(silent=True) or {}
+    try:
+        readings = [(to_epoch(r['timestamp']), float(r['kwh'])) for r in data.get('readings', [])]
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'success': False, 'message': f"Invalid reading: {e}"}), 400
+
+    changed = record_usage(session['user_id'], readings)
+    return jsonify({'success': True, 'received': len(readings), 'changed': changed})
+
+@app.route('/api/usage/import', methods=['POST'])
+@login_required
+def upload_usage():
+    """Import a Green Button XML or utility CSV interval file for the logged-in user."""
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({'success': False, 'message': "No file uploaded"}), 400
+
+    try:
+        read, changed = import_usage(session['user_id'], upload.stream)
+    except ImportInterrupted as e:
+        message = f"Could not import file: {e}"
+        if e.read:
+            message += f" (the first {e.read} readings were imported; fix the file and upload it again)"
+        return jsonify({'success': False, 'message': message, 'received': e.read, 'changed': e.changed}), 400
+
+    logger.info("Imported %s usage readings (%s new or changed) for user %s", read, changed, session['user_id'])
+    return jsonify({'success': True, 'received': read, 'changed': changed})
+
+# Reward catalog; points_cost is charged atomically by /api/redeem-reward
+AVAILABLE_REWARDS = [
+    {
+        'id': 'amazon-10',
+        'name': 'Amazon Gift Card',
+        'description': '$10 Amazon gift card',
+        'points_cost': 1000,
+        'image': 'amazon.png'
+    },
+    {
+        'id': 'nike-25',
+        'name': 'Nike Gift Card',
+        'description': '$25 Nike gift card',
+        'points_cost': 2500,
+        'image': 'nike.png'
+    },
+    {
+        'id': 'target-15',
+        'name': 'Target Gift Card',
+        'description': '$15 Target gift card',
+        'points_cost': 1500,
+        'image': 'target.png'
+    }
+]
+REWARDS_BY_ID = {reward['id']: reward for reward in AVAILABLE_REWARDS}
+
+# Icons for ledger entries on the rewards page, by action type
+LEDGER_ICONS = {
+    'peak_reduction': 'fa-bolt',
+    'carbon_reduction': 'fa-leaf',
+    'load_shift': 'fa-clock'
+}
+
 @app.route('/rewards')
 @login_required
 def rewards():
     """Render the rewards page."""
-    user = User.query.get(session['user_id'])
-    # Sample data - in a real app, this would come from a database
-    points_balance = user.points
-    
-    # Sample points history
+    with db.engine.connect() as conn:
+        points_balance = ledger_balance(conn, session['user_id'])
+        entries = ledger_history(conn, session['user_id'])
+
     points_history = [
         {
-            'icon': 'fa-bolt',
-            'title': 'Peak Load Reduction',
-            'description': 'Reduced energy usage during peak hours (6-8 PM)',
-            'points': 100
-        },
-        {
-            'icon': 'fa-leaf',
-            'title': 'Carbon Reduction',
-            'description': 'Shifted usage to low-carbon intensity hours',
-            'points': 75
-        },
-        {
-            'icon': 'fa-clock',
-            'title': 'Load Shifting',
-            'description': 'Moved laundry to off-peak hours',
-            'points': 50
+            'icon': LEDGER_ICONS.get(entry['reference'], 'fa-gift' if entry['delta'] < 0 else 'fa-star'),
+            'title': entry['reference'].replace('_', ' ').title() if entry['reference'] else entry['kind'].title(),
+            'description': f"{entry['kind'].title()} on {str(entry['created_at'])[:16]}",
+            'points': entry['delta']
         }
+        for entry in entries
     ]
+    if not points_history:
+        # Sample points history until the user has ledger entries
+        points_history = [
+            {
+                'icon': 'fa-bolt',
+                'title': 'Peak Load Reduction',
+                'description': 'Reduced energy usage during peak hours (6-8 PM)',
+                'points': 100
+            },
+            {
+                'icon': 'fa-leaf',
+                'title': 'Carbon Reduction',
+                'description': 'Shifted usage to low-carbon intensity hours',
+                'points': 75
+            },
+            {
+                'icon': 'fa-clock',
+                'title': 'Load Shifting',
+                'description': 'Moved laundry to off-peak hours',
+                'points': 50
+            }
+        ]
     
-    # Sample available rewards
-    available_rewards = [
-        {
-            'id': 'amazon-10',
-            'name': 'Amazon Gift Card',
-            'description': '$10 Amazon gift card',
-            'points_cost': 1000,
-            'image': 'amazon.png'
-        },
-        {
-            'id': 'nike-25',
-            'name': 'Nike Gift Card',
-            'description': '$25 Nike gift card',
-            'points_cost': 2500,
-            'image': 'nike.png'
-        },
-        {
-            'id': 'target-15',
-            'name': 'Target Gift Card',
-            'description': '$15 Target gift card',
-            'points_cost': 1500,
-            'image': 'target.png'
-        }
-    ]
     
     return render_template('rewards.html',
         points_balance=points_balance,
         points_history=points_history,
-        available_rewards=available_rewards
+        available_rewards=AVAILABLE_REWARDS
     )
 
 @app.route('/api/redeem-reward', methods=['POST'])
 @login_required
 def redeem_reward():
-    """Handle reward redemption."""
-    try:
-        data = request.get_json()
-        reward_id = data.get('reward_id')
-        user = User.query.get(session['user_id'])
-        
-        # In a real app, this would:
-        # 1. Verify the user has enough points
-        # 2. Deduct points from user's balance
-        # 3. Generate and send the gift card
-        # 4. Record the transaction
-        
+    """Handle reward redemption.
+
+    Send an ``Idempotency-Key`` header (or ``idempotency_key`` field) and reuse
+    it when retrying, so a repeated request never spends points twice.
+    """
+    data = request.get_json(silent=True) or {}
+    reward = REWARDS_BY_ID.get(data.get('reward_id'))
+    if reward is None:
         return jsonify({
-            'success': True,
-            'message': 'Reward redeemed successfully'
-        })
+            'success': False,
+            'message': 'Unknown reward'
+        }), 404
+
+    idempotency_key = request.headers.get('Idempotency-Key') or data.get('idempotency_key') or uuid.uuid4().hex
+    try:
+        outcome, balance = redeem_points(
+            db.engine, session['user_id'], reward['points_cost'], reward['id'], idempotency_key
+        )
     except Exception as e:
+        logger.error("Error redeeming reward %s: %s", reward['id'], e)
         return jsonify({
             'success': False,
-            'message': str(e)
-        })
+            'message': 'Could not redeem reward, please try again'
+        }), 503
+
+    if outcome == INSUFFICIENT:
+        return jsonify({
+            'success': False,
+            'message': 'Not enough points',
+            'balance': balance
+        }), 409
+
+    return jsonify({
+        'success': True,
+        'message': 'Reward redeemed successfully',
+        'duplicate': outcome == DUPLICATE,
+        'balance': balance
+    })
 
 @app.route('/api/calculate-points', methods=['POST'])
 def calculate_points():
     """Calculate points earned for energy-saving actions."""
     try:
         data = request.get_json()
-        action_type = data.get('action_type')
-        amount = data.get('amount', 0)
-        
-        # Points calculation logic
-        points = 0
-        if action_type == 'peak_reduction':
-            # Points for reducing peak usage
-            points = int(amount * 10)  # 10 points per kWh reduced during peak
-        elif action_type == 'carbon_reduction':
-            # Points for reducing carbon impact
-            points = int(amount * 5)  # 5 points per kg CO₂ reduced
-        elif action_type == 'load_shift':
-            # Points for shifting load to off-peak
-            points = int(amount * 8)  # 8 points per kWh shifted
+        points = score_action(data.get('action_type'), data.get('amount', 0))
         
         return jsonify({
             'success': True,
@@ -989,6 +1220,90 @@ def calculate_points():
             'message': str(e)
         })
 
+@app.route('/api/calculate-points/batch', methods=['POST'])
+def calculate_points_batch():
+    """Score many actions in one request and total the points per user.
+
+    Accepts ``{"actions": [{"user_id", "action_type", "amount"}, ...]}``, or
+    one action per line with ``Content-Type: application/x-ndjson``. NDJSON
+    bodies are scored as they stream in and only the totals are returned.
+    """
+    try:
+        if request.mimetype == 'application/x-ndjson':
+            # Werkzeug's input stream is unbuffered, which makes line iteration crawl
+            stream = request.stream
+            if isinstance(stream, io.RawIOBase):
+                stream = io.BufferedReader(stream, 1 << 16)
+            count, totals = score_ndjson(stream)
+            return jsonify({'success': True, 'count': count, 'totals': totals})
+
+        data = request.get_json(silent=True) or {}
+        points, totals = score_batch(data.get('actions', []))
+        return jsonify({
+            'success': True,
+            'count': len(points),
+            'points': points.tolist(),
+            'totals': totals
+        })
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'message': f"Invalid action: {e}"
+        }), 400
+
+@app.after_request
+def compress_json_response(response):
+    """Compress JSON responses that were not already encoded from a cached payload."""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or response.content_encoding or response.mimetype != 'application/json'):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    encoding = negotiate(request.accept_encodings, len(body))
+    if encoding:
+        response.set_data(compress(body, encoding))
+        response.content_encoding = encoding
+    return response
+
+@app.cli.command('import-usage')
+@click.argument('username')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+def import_usage_command(username, path):
+    """Import a Green Button XML or CSV interval file for USERNAME."""
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        raise click.ClickException(f"No user named '{username}'")
+
+    started = time.perf_counter()
+    with open(path, 'rb') as f:
+        try:
+            read, changed = import_usage(user.id, f)
+        except ImportInterrupted as e:
+            raise click.ClickException(f"{e}; imported {e.read} readings ({e.changed} new or changed) before it")
+    click.echo(f"Imported {read} readings ({changed} new or changed) in {time.perf_counter() - started:.1f}s")
+
+@app.cli.command('rebuild-rollups')
+def rebuild_rollups_command():
+    """Recompute every user's hourly and daily usage rollups from their stored readings."""
+    user_ids = [user_id for (user_id,) in db.session.query(UsageReading.user_id).distinct()]
+    for user_id in user_ids:
+        with db.engine.begin() as conn:
+            readings = user_readings(conn, user_id)
+            rebuild_rollups(conn, user_id, readings, usage_carbon_by_hour(readings) if readings else {})
+    click.echo(f"Rebuilt usage rollups for {len(user_ids)} users")
+
+@app.cli.command('award-points')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--key', help="Idempotency key for this run, e.g. its date; re-running with it never pays twice.")
+def award_points_command(path, key):
+    """Score an NDJSON file of actions and credit every user's total to the points ledger."""
+    with open(path, 'rb') as f:
+        count, totals = score_ndjson(f)
+    with db.engine.begin() as conn:
+        credited = award_many(conn, totals, 'batch', idempotency_key=key)
+    click.echo(f"Scored {count} actions; credited {credited} of {len(totals)} users")
+
 @app.context_processor
 def inject_api_status():
     return dict(show_api_status=True)
@@ -0,0 +1,222 @@
+"""Education article registry.
+
+Article bodies are Jinja snippets rendered into ``article.html`` once per
+process by ``app.rendered_article`` and then served as cached bytes.
+"""
+
+ARTICLES = {
+    'grid-basics': {
+        'title': "The Basics of the Electrical Grid",
+        'read_time': 5,
+        'difficulty': "Beginner",
+        'content': """
+            <div class="article-image-container">
+                <img src="{{ url_for('static', filename='images/grid-basics.jpg') }}" alt="Electrical Grid Components" class="article-image">
+                <div class="image-caption">The electrical grid connects power plants to consumers through transmission and distribution networks.</div>
+            </div>
+
+            <h2><i class="fas fa-bolt"></i> What is the Electrical Grid?</h2>
+            <p>The electrical grid is a complex network of power plants, transmission lines, substations, and distribution systems that work together to deliver electricity from where it's generated to where it's needed. Think of it as a vast, interconnected web that powers our modern world.</p>
+
+            <h2><i class="fas fa-cogs"></i> Key Components</h2>
+            <p>The grid consists of three main components:</p>
+            <ul>
+                <li><i class="fas fa-industry"></i> <strong>Generation:</strong> Power plants that create electricity from various sources (coal, natural gas, nuclear, renewables)</li>
+                <li><i class="fas fa-tower-broadcast"></i> <strong>Transmission:</strong> High-voltage power lines that carry electricity over long distances</li>
+                <li><i class="fas fa-home"></i> <strong>Distribution:</strong> Lower-voltage lines that deliver power to homes and businesses</li>
+            </ul>
+
+            <div class="infobox">
+                <h3><i class="fas fa-lightbulb"></i> Did You Know?</h3>
+                <p>The U.S. electrical grid is often called the "largest machine in the world" because it connects thousands of power plants to millions of consumers across the country.</p>
+            </div>
+
+            <h2><i class="fas fa-random"></i> How Power Flows</h2>
+            <p>Electricity flows from power plants through transmission lines at high voltages (up to 765,000 volts) to reduce energy loss. At substations, transformers step down the voltage for distribution to homes and businesses, where it's typically used at 120/240 volts.</p>
+
+            <h2><i class="fas fa-balance-scale"></i> Grid Balance</h2>
+            <p>One of the most critical aspects of grid operation is maintaining balance between supply and demand. Grid operators must constantly adjust power generation to match consumer demand, as electricity cannot be stored in large quantities.</p>
+
+            <h2><i class="fas fa-user"></i> Your Role in the Grid</h2>
+            <p>As a consumer, your energy usage patterns directly impact the grid. During peak demand periods (like hot summer afternoons), the grid can become stressed, leading to higher prices and potential reliability issues. By understanding your energy usage and participating in demand response programs, you can help maintain grid stability.</p>
+        """
+    },
+    'demand-response': {
+        'title': "Understanding Demand Response",
+        'read_time': 7,
+        'difficulty': "Intermediate",
+        'content': """
+            <div class="article-image-container">
+                <img src="{{ url_for('static', filename='images/demand-response.jpg') }}" alt="Demand Response Concept" class="article-image">
+                <div class="image-caption">Smart meters and automated systems help manage electricity demand during peak periods.</div>
+            </div>
+
+            <h2><i class="fas fa-chart-line"></i> What is Demand Response?</h2>
+            <p>Demand response is a strategy used by grid operators to manage electricity consumption during peak periods. It involves adjusting power usage in response to signals about grid conditions, helping to maintain balance between supply and demand.</p>
+
+            <h2><i class="fas fa-cogs"></i> How Demand Response Works</h2>
+            <p>When the grid is stressed (during peak demand), grid operators can:</p>
+            <ul>
+                <li><i class="fas fa-bell"></i> Send signals to participating consumers to reduce their energy use</li>
+                <li><i class="fas fa-dollar-sign"></i> Offer financial incentives for reducing consumption</li>
+                <li><i class="fas fa-clock"></i> Implement time-of-use pricing to encourage off-peak usage</li>
+            </ul>
+
+            <div class="infobox">
+                <h3><i class="fas fa-chart-bar"></i> Real-World Impact</h3>
+                <p>During a major heat wave, demand response programs can reduce peak demand by 5-15%, helping to prevent blackouts and reduce electricity costs for everyone.</p>
+            </div>
+
+            <h2><i class="fas fa-tags"></i> Types of Demand Response</h2>
+            <p>There are several types of demand response programs:</p>
+            <ul>
+                <li><i class="fas fa-tag"></i> <strong>Price-based:</strong> Consumers respond to varying electricity prices</li>
+                <li><i class="fas fa-gift"></i> <strong>Incentive-based:</strong> Consumers receive payments for reducing usage</li>
+                <li><i class="fas fa-exclamation-triangle"></i> <strong>Emergency:</strong> Voluntary or mandatory reductions during grid emergencies</li>
+            </ul>
+
+            <h2><i class="fas fa-star"></i> Benefits of Participation</h2>
+            <p>Participating in demand response programs can:</p>
+            <ul>
+                <li><i class="fas fa-piggy-bank"></i> Reduce your electricity bills</li>
+                <li><i class="fas fa-shield-alt"></i> Help prevent blackouts</li>
+                <li><i class="fas fa-leaf"></i> Support the integration of renewable energy</li>
+                <li><i class="fas fa-globe"></i> Contribute to a more sustainable energy future</li>
+            </ul>
+
+            <h2><i class="fas fa-user-plus"></i> How to Participate</h2>
+            <p>Many utilities offer demand response programs. You can:</p>
+            <ul>
+                <li><i class="fas fa-phone"></i> Contact your utility to learn about available programs</li>
+                <li><i class="fas fa-thermometer-half"></i> Install smart thermostats and other automated devices</li>
+                <li><i class="fas fa-clock"></i> Sign up for time-of-use pricing plans</li>
+                <li><i class="fas fa-users"></i> Join community-based demand response initiatives</li>
+            </ul>
+        """
+    },
+    'renewable-energy': {
+        'title': "Renewable Energy Integration",
+        'read_time': 6,
+        'difficulty': "Intermediate",
+        'content': """
+            <div class="article-image-container">
+                <img src="{{ url_for('static', filename='images/renewable-energy.jpg') }}" alt="Renewable Energy Sources" class="article-image">
+                <div class="image-caption">Solar panels and wind turbines are becoming increasingly common sights in our energy landscape.</div>
+            </div>
+
+            <h2><i class="fas fa-sun"></i> The Rise of Renewable Energy</h2>
+            <p>Renewable energy sources like solar and wind are playing an increasingly important role in our electrical grid. However, integrating these variable resources presents unique challenges and opportunities.</p>
+
+            <h2><i class="fas fa-list"></i> Types of Renewable Energy</h2>
+            <p>The main renewable energy sources integrated into the grid include:</p>
+            <ul>
+                <li><i class="fas fa-solar-panel"></i> <strong>Solar Power:</strong> Photovoltaic panels and concentrated solar power</li>
+                <li><i class="fas fa-wind"></i> <strong>Wind Power:</strong> Onshore and offshore wind turbines</li>
+                <li><i class="fas fa-water"></i> <strong>Hydropower:</strong> Traditional dams and run-of-river systems</li>
+                <li><i class="fas fa-tree"></i> <strong>Biomass:</strong> Organic materials converted to energy</li>
+            </ul>
+
+            <div class="infobox">
+                <h3><i class="fas fa-sync"></i> Grid Flexibility</h3>
+                <p>To accommodate variable renewable energy, the grid needs to be more flexible. This means having the ability to quickly adjust power generation and consumption to match the changing output of renewable sources.</p>
+            </div>
+
+            <h2><i class="fas fa-exclamation-circle"></i> Challenges of Integration</h2>
+            <p>Integrating renewable energy presents several challenges:</p>
+            <ul>
+                <li><i class="fas fa-cloud-sun"></i> <strong>Variability:</strong> Solar and wind power output changes with weather conditions</li>
+                <li><i class="fas fa-chart-line"></i> <strong>Predictability:</strong> Accurate forecasting is essential for grid planning</li>
+                <li><i class="fas fa-balance-scale"></i> <strong>Grid Stability:</strong> Maintaining frequency and voltage within acceptable ranges</li>
+                <li><i class="fas fa-battery-full"></i> <strong>Storage:</strong> Need for energy storage to balance supply and demand</li>
+            </ul>
+
+            <h2><i class="fas fa-lightbulb"></i> Solutions and Innovations</h2>
+            <p>Grid operators and technology providers are developing various solutions:</p>
+            <ul>
+                <li><i class="fas fa-robot"></i> Advanced forecasting systems</li>
+                <li><i class="fas fa-battery-three-quarters"></i> Grid-scale energy storage</li>
+                <li><i class="fas fa-microchip"></i> Smart grid technologies</li>
+                <li><i class="fas fa-users"></i> Demand response programs</li>
+                <li><i class="fas fa-solar-panel"></i> Microgrids and distributed generation</li>
+            </ul>
+
+            <h2><i class="fas fa-rocket"></i> The Future of Renewable Integration</h2>
+            <p>As technology advances and costs decrease, renewable energy will play an even larger role in our grid. This transition requires:</p>
+            <ul>
+                <li><i class="fas fa-tools"></i> Continued investment in grid infrastructure</li>
+                <li><i class="fas fa-flask"></i> Development of new storage technologies</li>
+                <li><i class="fas fa-desktop"></i> Enhanced grid management systems</li>
+                <li><i class="fas fa-file-contract"></i> Supportive policies and regulations</li>
+            </ul>
+        """
+    },
+    'smart-grid': {
+        'title': "The Smart Grid Revolution",
+        'read_time': 8,
+        'difficulty': "Advanced",
+        'content': """
+            <div class="article-image-container">
+                <img src="{{ url_for('static', filename='images/smart-grid.jpg') }}" alt="Smart Grid Technology" class="article-image">
+                <div class="image-caption">The smart grid uses digital technology to improve efficiency and reliability.</div>
+            </div>
+
+            <h2><i class="fas fa-microchip"></i> What is the Smart Grid?</h2>
+            <p>The smart grid is a modernized electrical grid that uses digital technology to improve efficiency, reliability, and sustainability. It represents a fundamental transformation in how we generate, distribute, and consume electricity.</p>
+
+            <h2><i class="fas fa-list-check"></i> Key Features of the Smart Grid</h2>
+            <p>The smart grid incorporates several advanced technologies:</p>
+            <ul>
+                <li><i class="fas fa-tachometer-alt"></i> <strong>Advanced Metering Infrastructure (AMI):</strong> Smart meters that provide real-time usage data</li>
+                <li><i class="fas fa-robot"></i> <strong>Distribution Automation:</strong> Self-healing systems that detect and respond to problems</li>
+                <li><i class="fas fa-battery-full"></i> <strong>Grid Storage:</strong> Advanced batteries and other storage solutions</li>
+                <li><i class="fas fa-network-wired"></i> <strong>Microgrids:</strong> Localized grids that can operate independently</li>
+                <li><i class="fas fa-sliders-h"></i> <strong>Demand Response:</strong> Automated systems for managing peak demand</li>
+            </ul>
+
+            <div class="infobox">
+                <h3><i class="fas fa-digital-tachograph"></i> Digital Transformation</h3>
+                <p>The smart grid uses digital communication technology to detect and react to local changes in usage, similar to how the internet routes data around problems.</p>
+            </div>
+
+            <h2><i class="fas fa-star"></i> Benefits of the Smart Grid</h2>
+            <p>The smart grid offers numerous advantages:</p>
+            <ul>
+                <li><i class="fas fa-shield-alt"></i> <strong>Improved Reliability:</strong> Faster detection and response to problems</li>
+                <li><i class="fas fa-bolt"></i> <strong>Better Efficiency:</strong> Reduced energy losses and optimized power flow</li>
+                <li><i class="fas fa-lock"></i> <strong>Enhanced Security:</strong> Better protection against cyber threats</li>
+                <li><i class="fas fa-user-shield"></i> <strong>Consumer Empowerment:</strong> More control over energy usage and costs</li>
+                <li><i class="fas fa-leaf"></i> <strong>Environmental Benefits:</strong> Better integration of renewable energy</li>
+            </ul>
+
+            <h2><i class="fas fa-tools"></i> Smart Grid Technologies</h2>
+            <p>Key technologies enabling the smart grid include:</p>
+            <ul>
+                <li><i class="fas fa-wave-square"></i> Phasor Measurement Units (PMUs)</li>
+                <li><i class="fas fa-desktop"></i> Advanced Distribution Management Systems (ADMS)</li>
+                <li><i class="fas fa-cogs"></i> Energy Management Systems (EMS)</li>
+                <li><i class="fas fa-battery-three-quarters"></i> Grid-scale Energy Storage</li>
+                <li><i class="fas fa-car"></i> Electric Vehicle Integration</li>
+            </ul>
+
+            <h2><i class="fas fa-rocket"></i> The Future of the Smart Grid</h2>
+            <p>The smart grid continues to evolve with new technologies and applications:</p>
+            <ul>
+                <li><i class="fas fa-brain"></i> Artificial Intelligence and Machine Learning</li>
+                <li><i class="fas fa-link"></i> Blockchain for Energy Trading</li>
+                <li><i class="fas fa-battery-full"></i> Advanced Energy Storage Solutions</li>
+                <li><i class="fas fa-car-battery"></i> Vehicle-to-Grid (V2G) Integration</li>
+                <li><i class="fas fa-building"></i> Grid-Interactive Efficient Buildings</li>
+            </ul>
+
+            <h2><i class="fas fa-user"></i> Your Role in the Smart Grid</h2>
+            <p>As a consumer, you can participate in the smart grid through:</p>
+            <ul>
+                <li><i class="fas fa-tachometer-alt"></i> Installing smart meters and devices</li>
+                <li><i class="fas fa-sliders-h"></i> Participating in demand response programs</li>
+                <li><i class="fas fa-home"></i> Using smart home technology</li>
+                <li><i class="fas fa-car"></i> Considering electric vehicles</li>
+                <li><i class="fas fa-solar-panel"></i> Installing solar panels or other distributed generation</li>
+            </ul>
+        """
+    }
+}
@@ -0,0 +1,107 @@
+"""Build fingerprinted, minified and precompressed static assets.
+
+Run ``python assets.py`` as part of a deploy. Every file under ``static/`` is
+copied to ``static/dist/`` with a content hash in its name, CSS (and JS when
+``rjsmin`` is installed) is minified, text assets get ``.gz`` and ``.br``
+siblings, and ``static/dist/manifest.json`` maps original names to the
+fingerprinted ones for ``url_for``.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # Optional: pip install brotli
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:  # Optional: pip install rjsmin
+    rjsmin = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = 'dist'
+COMPRESSIBLE = {'.css', '.js', '.svg', '.json', '.txt'}
+
+
+def minify_css(text):
+    """Strip comments and redundant whitespace from a stylesheet."""
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+    text = re.sub(r':\s+', ':', text)
+    return text.replace(';}', '}').strip()
+
+
+def minify_js(text):
+    """Minify JavaScript with rjsmin when available; otherwise leave it untouched."""
+    return rjsmin.jsmin(text) if rjsmin is not None else text
+
+
+def fingerprint(path, content):
+    """Insert a short content hash before the extension: ``css/styles.css`` -> ``css/styles.1a2b3c4d5e6f.css``."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+
+
+def load_manifest(static_dir=STATIC_DIR):
+    """Load the asset manifest, or an empty one when assets have not been built."""
+    try:
+        with open(os.path.join(static_dir, Config.ASSET_MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build(static_dir=STATIC_DIR):
+    """Build ``static/dist`` and its manifest; returns the manifest."""
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    shutil.rmtree(dist_dir, ignore_errors=True)
+
+    manifest = {}
+    for directory, subdirs, files in os.walk(static_dir):
+        if os.path.abspath(directory) == os.path.abspath(static_dir):
+            subdirs[:] = [d for d in subdirs if d != DIST_DIR]
+        for name in sorted(files):
+            source = os.path.join(directory, name)
+            rel_path = os.path.relpath(source, static_dir).replace(os.sep, '/')
+            ext = os.path.splitext(name)[1].lower()
+
+            with open(source, 'rb') as f:
+                content = f.read()
+            if ext == '.css':
+                content = minify_css(content.decode('utf-8')).encode('utf-8')
+            elif ext == '.js':
+                content = minify_js(content.decode('utf-8')).encode('utf-8')
+
+            hashed = f"{DIST_DIR}/{fingerprint(rel_path, content)}"
+            target = os.path.join(static_dir, hashed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(content)
+
+            encodings = []
+            if ext in COMPRESSIBLE:
+                if brotli is not None:
+                    with open(target + '.br', 'wb') as f:
+                        f.write(brotli.compress(content, quality=11))
+                    encodings.append('br')
+                with open(target + '.gz', 'wb') as f:
+                    f.write(gzip.compress(content, compresslevel=9, mtime=0))
+                encodings.append('gzip')
+
+            manifest[rel_path] = {"path": hashed, "encodings": encodings}
+
+    with open(os.path.join(static_dir, Config.ASSET_MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+if __name__ == '__main__':
+    built = build()
+    print(f"Built {len(built)} assets into {os.path.join(STATIC_DIR, DIST_DIR)}")
@@ -0,0 +1,144 @@
+"""Concurrent login/register throughput against the application database.
+
+Runs several worker processes, each with a few threads like a gunicorn
+gthread worker, issuing the queries behind /login (look up a user by name)
+and /register (check the name is free, insert the user) for a fixed time.
+Password hashing is left out so the numbers reflect the database alone.
+
+SQLite is measured twice: with the driver's default settings and with the
+WAL pragmas and pool from ``services.database``. Pass a URL to measure
+another database, such as Postgres, with the tuned options only:
+
+    python benchmarks/bench_db_auth.py [--workers 4] [--threads 4] [--seconds 5] [--url URL]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from services.database import configure_engine, database_url, engine_options  # noqa: E402
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS "user" ('
+    'id INTEGER PRIMARY KEY, username VARCHAR(80) UNIQUE NOT NULL, email VARCHAR(120) UNIQUE NOT NULL, '
+    'password_hash VARCHAR(128), points INTEGER DEFAULT 0, created_at TIMESTAMP)'
+)
+SEED_USERS = 2000
+PASSWORD_HASH = 'scrypt:32768:8:1$benchmark$' + '0' * 64
+
+_FIND_USER = text('SELECT id, password_hash FROM "user" WHERE username = :username')
+_INSERT_USER = text(
+    'INSERT INTO "user" (username, email, password_hash, points, created_at) '
+    'VALUES (:username, :email, :password_hash, 0, CURRENT_TIMESTAMP)'
+)
+
+
+def make_engine(url, tuned):
+    if not tuned:
+        return create_engine(url)
+    engine = create_engine(url, **engine_options(url))
+    configure_engine(engine)
+    return engine
+
+
+def setup(url):
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text(SCHEMA))
+        conn.execute(text('DELETE FROM "user"'))
+        conn.execute(_INSERT_USER, [
+            {'username': f'seed{i}', 'email': f'seed{i}@example.com', 'password_hash': PASSWORD_HASH}
+            for i in range(SEED_USERS)
+        ])
+    engine.dispose()
+
+
+def login(engine):
+    with engine.connect() as conn:
+        conn.execute(_FIND_USER, {'username': f'seed{random.randrange(SEED_USERS)}'}).first()
+
+
+def register(engine):
+    name = uuid.uuid4().hex[:20]
+    with engine.begin() as conn:
+        if conn.execute(_FIND_USER, {'username': name}).first() is None:
+            conn.execute(_INSERT_USER, {'username': name, 'email': f'{name}@example.com',
+                                        'password_hash': PASSWORD_HASH})
+
+
+def worker(url, tuned, threads, seconds, write_ratio, results):
+    engine = make_engine(url, tuned)
+    counts = {'ops': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def run():
+        ops = errors = 0
+        while time.perf_counter() < deadline:
+            try:
+                register(engine) if random.random() < write_ratio else login(engine)
+                ops += 1
+            except OperationalError:  # "database is locked"
+                errors += 1
+        with lock:
+            counts['ops'] += ops
+            counts['errors'] += errors
+
+    pool = [threading.Thread(target=run) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    engine.dispose()
+    results.put((counts['ops'], counts['errors']))
+
+
+def measure(label, url, tuned, args):
+    setup(url)
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=worker, args=(url, tuned, args.threads, args.seconds, args.write_ratio, results))
+        for _ in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    totals = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    ops = sum(ops for ops, _ in totals)
+    errors = sum(errors for _, errors in totals)
+    print(f"{label:<16} {ops / args.seconds:>10.0f} ops/s {errors:>8} lock errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4, help="Processes, like gunicorn workers")
+    parser.add_argument('--threads', type=int, default=4, help="Threads per process")
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--write-ratio', type=float, default=0.2, help="Share of operations that register")
+    parser.add_argument('--url', help="Database to measure instead of a temporary SQLite file")
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers x {args.threads} threads, {args.write_ratio:.0%} registrations")
+    if args.url:
+        measure('tuned', database_url(args.url), True, args)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        measure('sqlite default', f"sqlite:///{os.path.join(directory, 'default.db')}", False, args)
+        measure('sqlite tuned', f"sqlite:///{os.path.join(directory, 'tuned.db')}", True, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Login throughput and unrelated-request latency during a login burst.
+
+Starts the app on a threaded server in a child process, once hashing
+passwords inline and once on the hashing process pool, against a temporary
+database. Login threads then post to /login as fast as they can while a
+probe requests /api/connection-stats every 20 ms; the benchmark reports
+logins/sec and the probe's latency percentiles:
+
+    python benchmarks/bench_login_burst.py [--logins 16] [--seconds 10] [--pool-workers 2]
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USERNAME = 'burst'
+PASSWORD = 'correct horse battery staple'
+
+
+def serve(port):
+    """Run the app on a threaded server until killed; used by the child process."""
+    sys.path.insert(0, ROOT)
+    from werkzeug.serving import make_server
+    from app import app
+
+    make_server('127.0.0.1', port, app, threaded=True).serve_forever()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(pool_workers, directory):
+    port = free_port()
+    env = dict(
+        os.environ,
+        PASSWORD_HASH_WORKERS=str(pool_workers),
+        DATABASE_URL=f"sqlite:///{os.path.join(directory, f'bench-{pool_workers}.db')}",
+        SNAPSHOT_BACKGROUND_REFRESH='false',
+        LOG_LEVEL='WARNING',
+    )
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--serve', str(port)],
+        env=env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base = f'http://127.0.0.1:{port}'
+    for _ in range(300):
+        try:
+            requests.get(f'{base}/api/connection-stats', timeout=1)
+            return server, base
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("Server did not start")
+
+
+def login_loop(base, deadline, counts):
+    with requests.Session() as client:
+        while time.perf_counter() < deadline:
+            response = client.post(f'{base}/login', data={'username': USERNAME, 'password': PASSWORD},
+                                   allow_redirects=False)
+            counts.append(response.status_code == 302)
+
+
+def probe_loop(base, deadline, latencies):
+    with requests.Session() as client:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            client.get(f'{base}/api/connection-stats')
+            latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.02)
+
+
+def measure(label, pool_workers, directory, args):
+    server, base = start_server(pool_workers, directory)
+    try:
+        requests.post(f'{base}/register', data={'username': USERNAME, 'email': f'{USERNAME}@example.com',
+                                                 'password': PASSWORD})
+        requests.post(f'{base}/login', data={'username': USERNAME, 'password': PASSWORD})  # Starts the pool
+
+        logins, latencies = [], []
+        deadline = time.perf_counter() + args.seconds
+        threads = [threading.Thread(target=login_loop, args=(base, deadline, logins)) for _ in range(args.logins)]
+        threads.append(threading.Thread(target=probe_loop, args=(base, deadline, latencies)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.kill()
+        server.wait()
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{label:<18} {sum(logins) / args.seconds:>8.1f} logins/s "
+          f"({len(logins) - sum(logins)} refused)   probe p50 {p50:>7.1f} ms  p95 {p95:>7.1f} ms  "
+          f"p99 {p99:>7.1f} ms  max {max(latencies):>7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logins', type=int, default=16, help="Concurrent login clients")
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--pool-workers', type=int, default=2, help="Hashing processes for the pooled run")
+    parser.add_argument('--serve', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return
+
+    print(f"{args.logins} concurrent logins for {args.seconds:.0f}s, {os.cpu_count()} CPUs")
+    with tempfile.TemporaryDirectory() as directory:
+        measure('inline hashing', 0, directory, args)
+        measure(f'pool of {args.pool_workers}', args.pool_workers, directory, args)
+
+
+if __name__ == '__main__':
+    main()
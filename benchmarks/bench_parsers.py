@@ -0,0 +1,110 @@
+"""Parse-throughput benchmark for ISO-NE payloads.
+
+Compares the schema-resolving parsers in ``services.iso_ne_parsers`` with the
+previous per-entry field probing, on a day of five-minute system load and on
+price payloads. Pass paths to recorded JSON responses to benchmark those
+instead of the generated ones:
+
+    python benchmarks/bench_parsers.py [payload.json ...]
+"""
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import iso_ne_parsers  # noqa: E402
+
+
+def generated_load_payload(points=288):
+    """A /fiveminutesystemload/day response with ``points`` entries."""
+    start = datetime(2024, 7, 1, tzinfo=timezone(timedelta(hours=-4)))
+    return {
+        "SystemLoads": {
+            "SystemLoad": [
+                {
+                    "BeginDate": (start + timedelta(minutes=5 * i)).isoformat(timespec='milliseconds'),
+                    "LoadMw": 14000 + (i % 144) * 25.5,
+                    "NativeLoad": 14500 + (i % 144) * 25.5,
+                    "LoadMwForecasted": 14100 + (i % 144) * 25.0
+                }
+                for i in range(points)
+            ]
+        }
+    }
+
+
+def generated_price_payloads():
+    return {
+        "fiveminutelmp": {"FiveMinLmp": [{"BeginDate": "2024-07-01T12:05:00.000-04:00",
+                                          "Location": {"@LocId": "4000", "$": ".H.INTERNAL_HUB"},
+                                          "LmpTotal": 41.37, "EnergyComponent": 40.9}]},
+        "hourlylmp": {"HourlyLmps": {"HourlyLmp": [{"BeginDate": "2024-07-01T12:00:00.000-04:00",
+                                                    "Location": {"@LocId": "4000", "$": ".H.INTERNAL_HUB"},
+                                                    "LmpTotal": 39.12}]}},
+    }
+
+
+def legacy_parse_load(data):
+    """The pre-resolver loop: probe every candidate field name on every entry."""
+    load_data = data.get('SystemLoads', {}).get('SystemLoad') or data.get('SystemLoad') or data.get('Data')
+    points = []
+    for entry in load_data:
+        date_field = next((field for field in ['BeginDate', 'StartTime', 'Time', 'Timestamp']
+                           if field in entry), None)
+        if not date_field:
+            continue
+        timestamp = int(datetime.fromisoformat(entry[date_field].replace('Z', '+00:00')).timestamp())
+        actual = float(next((entry[field] for field in ['LoadMw', 'Load', 'ActualLoad', 'Value']
+                             if field in entry), 0))
+        forecast = float(next((entry[field] for field in ['LoadMwForecasted', 'ForecastLoad', 'Forecast']
+                               if field in entry), actual))
+        points.append((timestamp, actual, forecast))
+    points.sort()
+    return points
+
+
+def report(label, func, entries, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    per_entry = seconds / max(entries, 1) * 1e9
+    print(f"  {label:<28} {seconds * 1e6:10.1f} us/payload {per_entry:9.0f} ns/entry")
+
+
+def bench_payload(name, raw):
+    data = json.loads(raw)
+    entries = iso_ne_parsers.load_entries(data)
+    count = len(entries) if entries else 1
+    print(f"{name} ({len(raw)} bytes)")
+    report("json.loads", lambda: json.loads(raw), count, 200)
+    if iso_ne_parsers.orjson is not None:
+        report("orjson.loads", lambda: iso_ne_parsers.orjson.loads(raw), count, 200)
+
+    if entries:
+        assert legacy_parse_load(data) == iso_ne_parsers.parse_load(data)
+        report("legacy load parse", lambda: legacy_parse_load(data), len(entries), 50)
+        report("resolved load parse", lambda: iso_ne_parsers.parse_load(data), len(entries), 50)
+        since = iso_ne_parsers.parse_load(data)[-2][0]
+        report("incremental (since)", lambda: iso_ne_parsers.parse_load(data, since), 1, 2000)
+    else:
+        report("parse_price", lambda: iso_ne_parsers.parse_price(data), 1, 20000)
+
+
+def main(paths):
+    if paths:
+        payloads = {}
+        for path in paths:
+            with open(path, 'rb') as f:
+                payloads[os.path.basename(path)] = f.read()
+    else:
+        payloads = {"fiveminutesystemload/day": json.dumps(generated_load_payload()).encode()}
+        payloads.update({name: json.dumps(body).encode() for name, body in generated_price_payloads().items()})
+
+    print(f"orjson: {'available' if iso_ne_parsers.orjson is not None else 'not installed'}")
+    for name, raw in payloads.items():
+        bench_payload(name, raw)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -15,6 +15,15 @@ class Config:
     # Cache Configuration
     CACHE_TYPE = 'SimpleCache'
     CACHE_DEFAULT_TIMEOUT = 300  # 5 minutes
+    ISO_PUBLICATION_INTERVAL = 300  # ISO-NE publishes five-minute data
+    SNAPSHOT_REFRESH_DELAY = 30  # Seconds past each boundary before new data is available
+    SNAPSHOT_BACKGROUND_REFRESH = os.environ.get('SNAPSHOT_BACKGROUND_REFRESH', 'true').lower() == 'true'
+    
+    # Shared Snapshot Configuration
+    SHARED_SNAPSHOT = os.environ.get('SHARED_SNAPSHOT', 'true').lower() == 'true'  # One worker fetches for all
+    SHARED_SNAPSHOT_FILENAME = 'snapshot.mmap'  # Created under the Flask instance folder
+    SHARED_SNAPSHOT_SIZE = 4 * 1024 * 1024  # Bytes reserved for the encoded snapshot
+    SHARED_SNAPSHOT_POLL_INTERVAL = 1.0  # Seconds between checks for a newly published snapshot
     
     # API Rate Limits
     RATELIMIT_DEFAULT = "100 per minute"
@@ -25,9 +34,95 @@ class Config:
     RETRY_BACKOFF_FACTOR = 0.5
     RETRY_STATUS_FORCELIST = [500, 502, 503, 504]
     
+    # HTTP Connection Pool Configuration
+    HTTP_POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', 4))  # Host pools kept alive
+    HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', 10))  # Connections kept per host
+    HTTP_POOL_BLOCK = os.environ.get('HTTP_POOL_BLOCK', 'false').lower() == 'true'
+    
+    # Dashboard Fetch Configuration
+    DASHBOARD_FETCH_WORKERS = int(os.environ.get('DASHBOARD_FETCH_WORKERS', 4))  # One per upstream source
+    DASHBOARD_FETCH_DEADLINE = float(os.environ.get('DASHBOARD_FETCH_DEADLINE', 15))  # Seconds for all sources
+    
+    # Database Configuration
+    DATABASE_URL = os.environ.get('DATABASE_URL', 'sqlite:///peakwise.db')  # Relative SQLite paths live in the instance folder
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))  # Connections kept open per worker
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))  # Extra connections allowed under bursts
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))  # Seconds before a server connection is replaced
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))  # Milliseconds to wait on the write lock
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))  # Bytes of the file read via mmap
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 20000))  # Page cache per connection
+    
+    # Password Hashing Configuration
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')  # Older hashes are upgraded at login
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))  # Hashing processes; 0 hashes inline
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 32))  # Queued hashes before logins are refused
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))  # Seconds a request waits for its hash
+    
+    # Session Configuration
+    SECRET_KEY = os.environ.get('SECRET_KEY')  # Defaults to a key generated once into the instance folder
+    SECRET_KEY_FILENAME = 'secret_key'
+    SESSION_CACHE_SIZE = int(os.environ.get('SESSION_CACHE_SIZE', 10000))  # Sessions cached per worker
+    SESSION_CACHE_TTL = float(os.environ.get('SESSION_CACHE_TTL', 30))  # Seconds a logout elsewhere can go unseen
+    SESSION_PURGE_INTERVAL = 3600  # Seconds between sweeps of expired sessions
+    
+    # Time-Series Store Configuration
+    TIMESERIES_DB_FILENAME = 'timeseries.db'  # Created under the Flask instance folder
+    TIMESERIES_BUSY_TIMEOUT = 5  # Seconds to wait on a locked database
+    HISTORY_DEFAULT_WINDOW = timedelta(hours=24)
+    LOAD_BUFFER_DAYS = int(os.environ.get('LOAD_BUFFER_DAYS', 1))  # Days of load kept in memory
+    
+    # Downsampling Configuration
+    DOWNSAMPLE_MIN_POINTS = 50  # Smallest series a client can ask for
+    DOWNSAMPLE_POINT_STEP = 50  # Requested point counts are rounded up to this step
+    
+    # Local Time Configuration
+    TIMEZONE = os.environ.get('TIMEZONE', 'America/New_York')  # Hourly/daily bins and peak hours follow this zone
+    
+    # Best-Window Configuration
+    WINDOW_DURATIONS = (30, 60, 120, 180, 240)  # Appliance run lengths precomputed, in minutes
+    WINDOW_HORIZON = timedelta(hours=24)  # How far ahead windows are searched
+    
+    # Usage Rollup Configuration
+    PEAK_HOURS = (18, 19, 20)  # Local hours billed at the peak rate
+    BASE_RATE = 0.15  # $/kWh off-peak
+    PEAK_RATE = 0.30  # $/kWh during PEAK_HOURS
+    INSIGHTS_HOURS = 24  # Hourly rollups shown on the insights page
+    IMPORT_BATCH_SIZE = 10000  # Interval readings written per transaction
+    IMPORT_MAX_BYTES = 64 * 1024 * 1024  # Largest accepted upload
+    
+    # Server-Sent Events Configuration
+    SSE_HEARTBEAT_INTERVAL = 15  # Seconds between keep-alive comments on idle streams
+    SSE_RETRY_MS = 5000  # Client reconnect delay sent to EventSource
+    WORKER_THREADS = int(os.environ.get('WORKER_THREADS', 200))  # Should match gunicorn --threads
+    # Each open stream holds a worker thread; the rest stay free for ordinary requests
+    SSE_MAX_CLIENTS = int(os.environ.get('SSE_MAX_CLIENTS', WORKER_THREADS // 2))  # Open streams allowed per process
+    
+    # Response Compression Configuration
+    COMPRESSION_MIN_SIZE = 1024  # Bytes; smaller bodies are sent uncompressed
+    COMPRESSION_LEVELS = {
+        "gzip": 6,
+        "br": 5,
+        "zstd": 3
+    }
+    
+    # Static Asset Configuration
+    ASSET_MANIFEST = 'dist/manifest.json'  # Relative to the static folder, written by assets.py
+    ASSET_MAX_AGE = 365 * 24 * 3600  # Fingerprinted assets are immutable
+    
+    # Template Configuration
+    JINJA_BYTECODE_CACHE_DIR = 'jinja_cache'  # Under the Flask instance folder
+    ARTICLE_MAX_AGE = 3600  # Seconds browsers may reuse a rendered article
+    
     # Logging Configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    LOG_JSON = os.environ.get('LOG_JSON', 'false').lower() == 'true'  # One JSON object per line
+    LOG_PAYLOADS = os.environ.get('LOG_PAYLOADS', 'false').lower() == 'true'  # Dump upstream bodies at DEBUG
+    LOG_RATE_LIMIT_PER_MINUTE = 60  # Sustained records per message template
+    LOG_RATE_LIMIT_BURST = 10
+    LOG_RATE_LIMIT_KEYS = 1024  # Message templates tracked at once; least recently used are dropped
     
     # Default Values
     DEFAULT_FUEL_MIX = {
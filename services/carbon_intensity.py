@@ -0,0 +1,80 @@
+import numpy as np
+from services.fuel_mix import BUCKET_INDEX, BUCKETS, FACTORS
+from services.local_time import bin_starts
+from services.timeseries_store import to_iso
+
+# Aggregation bin width in seconds; raw keeps one value per stored snapshot
+RESOLUTIONS = {'raw': None, 'hourly': 3600, 'daily': 86400}
+UNIT = 'kg CO₂eq/MWh'
+
+
+def fuel_mix_matrix(rows):
+    """Pivot (ts, fuel, mw) rows into sorted epoch times and a time x bucket MW matrix."""
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.zeros((0, len(BUCKETS)))
+
+    ts, fuels, mw = zip(*rows)
+    times, row_index = np.unique(np.array(ts, dtype=np.int64), return_inverse=True)
+    other = BUCKET_INDEX['other']
+    columns = np.fromiter((BUCKET_INDEX.get(fuel, other) for fuel in fuels), dtype=np.intp, count=len(fuels))
+
+    matrix = np.zeros((len(times), len(BUCKETS)))
+    np.add.at(matrix, (row_index, columns), np.array(mw, dtype=np.float64))
+    return times, matrix
+
+
+def intensity(matrix):
+    """Generation-weighted carbon intensity of every snapshot (row) in one matrix product."""
+    generation = matrix.sum(axis=1)
+    return np.divide(matrix @ FACTORS, generation, out=np.zeros_like(generation), where=generation > 0)
+
+
+def aggregate(times, matrix, resolution='raw'):
+    """Carbon intensity per snapshot, or per local hour/day for coarser resolutions.
+
+    Aggregates are total emissions over total generation in each bin, so a
+    high-output interval weighs more than a quiet one. Returns the bin start
+    times (epoch seconds) and the intensities.
+    """
+    width = RESOLUTIONS[resolution]
+    if width is None or not len(times):
+        return times, intensity(matrix)
+
+    # Bin on local wall-clock hours and days, with each timestamp's own DST offset
+    bins, inverse = np.unique(bin_starts(times, width), return_inverse=True)
+    emissions = np.bincount(inverse, weights=matrix @ FACTORS)
+    generation = np.bincount(inverse, weights=matrix.sum(axis=1))
+    values = np.divide(emissions, generation, out=np.zeros_like(generation), where=generation > 0)
+    return bins, values
+
+
+def carbon_intensity_series(store, start, end, resolution='raw'):
+    """Carbon intensity over [start, end] from the stored fuel mix history."""
+    times, values = aggregate(*fuel_mix_matrix(store.fuel_mix_rows(start, end)), resolution)
+    return {
+        'timestamps': [to_iso(ts) for ts in times.tolist()],
+        'carbon_intensity': np.round(values, 1).tolist(),
+        'unit': UNIT
+    }
+
+
+def trailing_hourly(store, end, hours):
+    """Hourly carbon intensity for the ``hours`` local hours up to ``end``, oldest first.
+
+    Hours without any stored fuel mix are NaN so callers can fill them in.
+    """
+    end = int(end)
+    start = end - hours * 3600
+    times, values = aggregate(*fuel_mix_matrix(store.fuel_mix_rows(start, end)), 'hourly')
+
+    result = np.full(hours, np.nan)
+    slots = (times - int(bin_starts(end, 3600))) // 3600 + hours - 1
+    valid = (slots >= 0) & (slots < hours)
+    result[slots[valid]] = values[valid]
+    return result
+
+
+def hourly_carbon_per_kwh(store, start, end):
+    """``{local hour start: kg CO₂/kWh}`` for every hour in [start, end] with stored fuel mix."""
+    times, values = aggregate(*fuel_mix_matrix(store.fuel_mix_rows(start, end)), 'hourly')
+    return dict(zip(times.tolist(), (values / 1000).tolist()))
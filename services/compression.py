@@ -0,0 +1,55 @@
+import gzip
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # Optional: pip install brotli
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: pip install zstandard
+    zstandard = None
+
+
+def _gzip(body):
+    return gzip.compress(body, compresslevel=Config.COMPRESSION_LEVELS['gzip'])
+
+
+def _brotli(body):
+    return brotli.compress(body, quality=Config.COMPRESSION_LEVELS['br'])
+
+
+def _zstd(body):
+    return zstandard.ZstdCompressor(level=Config.COMPRESSION_LEVELS['zstd']).compress(body)
+
+
+# Server preference order, used to break ties between equally weighted encodings
+ENCODERS = {}
+if brotli is not None:
+    ENCODERS['br'] = _brotli
+if zstandard is not None:
+    ENCODERS['zstd'] = _zstd
+ENCODERS['gzip'] = _gzip
+
+
+def negotiate(accept_encodings, size):
+    """Pick the best encoding the client accepts, or None to send the body as is.
+
+    ``accept_encodings`` is Werkzeug's parsed ``Accept-Encoding`` header.
+    Bodies smaller than ``Config.COMPRESSION_MIN_SIZE`` are never compressed.
+    """
+    if size < Config.COMPRESSION_MIN_SIZE or not accept_encodings:
+        return None
+
+    best, best_quality = None, 0
+    for encoding in ENCODERS:
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body, encoding):
+    """Compress ``body`` with one of the encodings returned by ``negotiate``."""
+    return ENCODERS[encoding](body)
@@ -0,0 +1,69 @@
+import logging
+from sqlalchemy import event
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def database_url(url=None):
+    """The configured database URL, accepting the ``postgres://`` scheme hosting providers hand out."""
+    url = url or Config.DATABASE_URL
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def is_sqlite(url):
+    return url.startswith('sqlite')
+
+
+def engine_options(url):
+    """Connection pool options for ``url``, for ``SQLALCHEMY_ENGINE_OPTIONS``."""
+    if is_sqlite(url):
+        if ':memory:' in url or url.rstrip('/') in ('sqlite:', 'sqlite+pysqlite:'):
+            return {}  # In-memory databases use a single shared connection
+        return {
+            'pool_size': Config.DB_POOL_SIZE,
+            'max_overflow': Config.DB_MAX_OVERFLOW,
+            'pool_timeout': Config.DB_POOL_TIMEOUT,
+            # The driver's busy handler, so a writer waits for the lock instead of failing at once
+            'connect_args': {'timeout': Config.SQLITE_BUSY_TIMEOUT / 1000},
+        }
+    return {
+        'pool_size': Config.DB_POOL_SIZE,
+        'max_overflow': Config.DB_MAX_OVERFLOW,
+        'pool_timeout': Config.DB_POOL_TIMEOUT,
+        'pool_recycle': Config.DB_POOL_RECYCLE,  # Drop connections before the server or a proxy times them out
+        'pool_pre_ping': True,
+    }
+
+
+def sqlite_pragmas():
+    """Per-connection SQLite settings, in the order they are applied."""
+    return {
+        # Readers no longer block on the writer, and commits append to the log instead of rewriting pages
+        'journal_mode': 'WAL',
+        # NORMAL only syncs at checkpoints in WAL mode; still safe against corruption, not power loss
+        'synchronous': Config.SQLITE_SYNCHRONOUS,
+        'busy_timeout': Config.SQLITE_BUSY_TIMEOUT,
+        'mmap_size': Config.SQLITE_MMAP_SIZE,
+        'cache_size': -Config.SQLITE_CACHE_SIZE_KB,  # Negative values are KiB rather than pages
+        'temp_store': 'MEMORY',
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f'PRAGMA {name}={value}')
+    except Exception as e:
+        logger.error("Error applying SQLite pragmas: %s", e)
+    finally:
+        cursor.close()
+
+
+def configure_engine(engine):
+    """Apply backend-specific tuning to every new connection ``engine`` opens."""
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', _apply_sqlite_pragmas)
@@ -0,0 +1,93 @@
+import numpy as np
+from config import Config
+from services.timeseries_store import to_epoch, to_iso
+
+
+def target_points(points, length):
+    """Normalize a requested point count, or return None when no downsampling is needed.
+
+    Requests are rounded up to ``Config.DOWNSAMPLE_POINT_STEP`` so clients with
+    slightly different canvas widths share cached results.
+    """
+    if not points or points <= 0:
+        return None
+    step = Config.DOWNSAMPLE_POINT_STEP
+    points = max(Config.DOWNSAMPLE_MIN_POINTS, -(-points // step) * step)
+    return points if points < length else None
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    ``y`` may be 1-D or an (n, k) array; with several columns the triangle
+    areas are summed so one set of indices preserves the shape of every series.
+    The first and last points are always kept.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if y.ndim == 1:
+        y = y[:, np.newaxis]
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets spread over the interior points [1, n - 1)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:n - 1], edges[:-1], axis=0) / counts[:, np.newaxis]
+    # Each bucket is scored against the average of the next one; the last uses the final point
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.vstack([avg_y[1:], y[-1]])
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        areas = np.abs(
+            (x[a] - next_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi, np.newaxis]) * (next_y[i] - y[a])
+        ).sum(axis=1)
+        a = lo + int(np.argmax(areas))
+        indices[i + 1] = a
+    return indices
+
+
+def downsample_series(timestamps, columns, points):
+    """Downsample parallel ``columns`` sharing ``timestamps`` to about ``points`` points.
+
+    ``timestamps`` are epoch seconds; ``columns`` is a dict of name -> values.
+    Returns (kept timestamps, dict of kept columns) as plain lists.
+    """
+    n_out = target_points(points, len(timestamps))
+    if n_out is None:
+        return list(timestamps), {name: list(values) for name, values in columns.items()}
+
+    x = np.asarray(timestamps, dtype=np.int64)
+    y = np.column_stack([np.asarray(values, dtype=np.float64) for values in columns.values()])
+    keep = lttb_indices(x, y, n_out)
+    return x[keep].tolist(), {name: y[keep, i].tolist() for i, name in enumerate(columns)}
+
+
+def downsample_timeseries(data, points):
+    """Downsample a ``{'timestamps': [...], <column>: [...], ...}`` dict of ISO timestamps.
+
+    Used for the price history series; the dict is returned unchanged when
+    it is already small enough.
+    """
+    timestamps = data.get('timestamps') or []
+    if target_points(points, len(timestamps)) is None:
+        return data
+
+    columns = {name: values for name, values in data.items() if name != 'timestamps'}
+    kept, columns = downsample_series([to_epoch(t) for t in timestamps], columns, points)
+    return {'timestamps': [to_iso(ts) for ts in kept], **columns}
+
+
+def downsample_load(series, points):
+    """Downsample a ``LoadSeries``, keeping actual and forecast aligned."""
+    n_out = target_points(points, len(series))
+    if n_out is None:
+        return series
+    keep = lttb_indices(series.times, np.column_stack([series.actual, series.forecast]), n_out)
+    return series.take(keep)
@@ -0,0 +1,117 @@
+import re
+from functools import lru_cache
+import numpy as np
+from config import Config
+
+# Every fuel mix in the app is reported in these buckets, in this order
+BUCKETS = tuple(Config.CARBON_INTENSITY_FACTORS)
+BUCKET_INDEX = {bucket: i for i, bucket in enumerate(BUCKETS)}
+FACTORS = np.array([Config.CARBON_INTENSITY_FACTORS[b] for b in BUCKETS], dtype=np.float64)
+
+# ISO-NE fuel categories (and field names used by the /genfuelmix/current style
+# payloads) matched in order, first hit wins. Biomass comes before natural gas
+# so "Landfill Gas" is not counted as gas.
+_RULES = [
+    ('biomass', r'wood|refuse|landfill|biomass'),
+    ('natural_gas', r'natural.?gas|^gas$'),
+    ('nuclear', r'nuclear'),
+    ('coal', r'coal'),
+    ('oil', r'oil|petroleum'),
+    ('hydro', r'hydro'),
+    ('solar', r'solar|photovoltaic'),
+    ('wind', r'wind'),
+    ('imports', r'import'),
+    ('other', r'^other$'),
+]
+_RULE_PATTERNS = [(bucket, re.compile(pattern, re.I)) for bucket, pattern in _RULES]
+
+
+@lru_cache(maxsize=256)
+def bucket_for(category, default='other'):
+    """Map an ISO-NE fuel category to its bucket; unknown categories get ``default``."""
+    for bucket, pattern in _RULE_PATTERNS:
+        if pattern.search(category):
+            return bucket
+    return default
+
+
+def genfuelmix_entries(payload):
+    """The GenFuelMix entries of a /genfuelmix or /genfuelmix/current payload, or []."""
+    if not payload:
+        return []
+    entries = payload.get('GenFuelMixes', {})
+    entries = entries.get('GenFuelMix', []) if isinstance(entries, dict) else []
+    return [entries] if isinstance(entries, dict) else entries
+
+
+def megawatts_by_bucket(entries):
+    """Sum ``GenMw`` per bucket for one interval's GenFuelMix entries."""
+    totals = dict.fromkeys(BUCKETS, 0.0)
+    for entry in entries:
+        totals[bucket_for(entry['FuelCategory'])] += float(entry['GenMw'])
+    return totals
+
+
+def to_mix(megawatts):
+    """``{'percentages', 'megawatts'}`` for positive buckets, or None when nothing is generating."""
+    total = sum(megawatts.values())
+    if total <= 0:
+        return None
+    return {
+        'percentages': {k: round(v / total * 100, 2) for k, v in megawatts.items() if v > 0},
+        'megawatts': {k: round(v, 2) for k, v in megawatts.items() if v > 0}
+    }
+
+
+def normalize(payload):
+    """Bucket one GenFuelMix payload; returns None when it holds no generation."""
+    return to_mix(megawatts_by_bucket(genfuelmix_entries(payload)))
+
+
+def normalize_fields(mix):
+    """Bucket a flat ``{'NaturalGas': 40, 'Wind': 5, ...}`` record; unrecognized fields are ignored."""
+    totals = dict.fromkeys(BUCKETS, 0.0)
+    for field, value in mix.items():
+        bucket = bucket_for(field, None)
+        if bucket is not None and isinstance(value, (int, float)):
+            totals[bucket] += value
+    return totals
+
+
+def normalize_batch(payloads):
+    """Bucket many GenFuelMix payloads at once, for backfills and history views.
+
+    Returns a ``(len(payloads), len(BUCKETS))`` float64 array of MW, one row per
+    payload in input order; payloads without entries give a row of zeros.
+    """
+    rows, columns, values = [], [], []
+    for row, payload in enumerate(payloads):
+        for entry in genfuelmix_entries(payload):
+            rows.append(row)
+            columns.append(BUCKET_INDEX[bucket_for(entry['FuelCategory'])])
+            values.append(entry['GenMw'])
+
+    matrix = np.zeros((len(payloads), len(BUCKETS)), dtype=np.float64)
+    np.add.at(matrix, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)),
+              np.array(values, dtype=np.float64))
+    return matrix
+
+
+def batch_percentages(matrix):
+    """Row-normalize a bucket MW matrix to percentages; all-zero rows stay zero."""
+    totals = matrix.sum(axis=1, keepdims=True)
+    return np.divide(matrix * 100, totals, out=np.zeros_like(matrix), where=totals > 0)
+
+
+def carbon_intensity(mix):
+    """Weighted carbon intensity (kg CO2eq/MWh) of a bucket mix in MW or percent."""
+    total = sum(mix.values())
+    if total <= 0:
+        return 0
+    return sum(value * Config.CARBON_INTENSITY_FACTORS.get(bucket, 0) for bucket, value in mix.items()) / total
+
+
+def batch_carbon_intensity(matrix):
+    """Carbon intensity of every row of a bucket matrix; all-zero rows give 0."""
+    totals = matrix.sum(axis=1)
+    return np.divide(matrix @ FACTORS, totals, out=np.zeros_like(totals), where=totals > 0)
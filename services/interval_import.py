@@ -0,0 +1,159 @@
+import csv
+import io
+from datetime import datetime
+from itertools import islice
+from xml.etree.ElementTree import iterparse
+from services.local_time import ZONE
+
+ESPI = '{http://naesb.org/espi}'
+WH_UOM = '72'  # ESPI unit-of-measure code for watt-hours
+
+# Header names used by utility CSV exports, most common first
+CSV_TIME_COLUMNS = ('start time', 'start', 'interval start', 'start date', 'datetime', 'timestamp', 'date/time')
+CSV_DATE_COLUMNS = ('date', 'day')
+CSV_USAGE_COLUMNS = ('usage (kwh)', 'usage', 'kwh', 'consumption', 'value', 'import (kwh)')
+CSV_DATE_FORMATS = ('%m/%d/%Y %H:%M', '%m/%d/%Y %I:%M %p', '%m/%d/%y %H:%M', '%Y/%m/%d %H:%M', '%d/%m/%Y %H:%M')
+
+
+class ImportFormatError(ValueError):
+    """The file is not a Green Button or interval CSV export we understand."""
+
+
+class ImportInterrupted(Exception):
+    """An import failed partway through; the ``read`` readings before the failure are already stored."""
+
+    def __init__(self, error, read, changed):
+        super().__init__(str(error))
+        self.read = read
+        self.changed = changed
+
+
+def sniff_format(stream):
+    """Return 'xml' or 'csv' for a binary stream, without consuming it."""
+    head = stream.peek(512)[:512] if hasattr(stream, 'peek') else b''
+    return 'xml' if head.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'<') else 'csv'
+
+
+def parse_green_button(stream):
+    """Yield readings from a Green Button XML feed.
+
+    ``ReadingType`` entries carry the unit and power-of-ten multiplier for the
+    ``IntervalBlock`` entries that follow them. Elements are cleared as soon
+    as they are read.
+    """
+    multiplier = 1e-3  # Wh -> kWh until a ReadingType says otherwise
+    for _, elem in iterparse(stream, events=('end',)):
+        tag = elem.tag
+        if tag == f'{ESPI}IntervalReading':
+            start = elem.findtext(f'{ESPI}timePeriod/{ESPI}start')
+            value = elem.findtext(f'{ESPI}value')
+            if start is not None and value is not None:
+                yield int(start), int(value) * multiplier
+            elem.clear()
+        elif tag == f'{ESPI}ReadingType':
+            power = int(elem.findtext(f'{ESPI}powerOfTenMultiplier') or 0)
+            uom = elem.findtext(f'{ESPI}uom') or WH_UOM
+            multiplier = 10.0 ** power * (1e-3 if uom == WH_UOM else 1.0)
+            elem.clear()
+        elif tag == f'{ESPI}IntervalBlock' or tag == '{http://www.w3.org/2005/Atom}entry':
+            elem.clear()
+
+
+def _first_column(header, candidates):
+    return next((header.index(name) for name in candidates if name in header), None)
+
+
+def _local_epochs(parse):
+    """Turn a datetime parser into one returning epoch seconds, reading naive times in ``Config.TIMEZONE``.
+
+    Times that carry an offset keep it. In the hour repeated when clocks
+    fall back, a time at or before the previous row's is the second pass.
+    """
+    previous = None
+
+    def to_epoch(value):
+        nonlocal previous
+        moment = parse(value)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=ZONE)
+            if previous is not None and moment.timestamp() <= previous < moment.replace(fold=1).timestamp():
+                moment = moment.replace(fold=1)
+        previous = int(moment.timestamp())
+        return previous
+
+    return to_epoch
+
+
+def _timestamp_parser(sample):
+    """Pick a parser for the file's date format from its first timestamp; used for every row."""
+    try:
+        datetime.fromisoformat(sample)
+        return _local_epochs(datetime.fromisoformat)
+    except ValueError:
+        pass
+    for fmt in CSV_DATE_FORMATS:
+        try:
+            datetime.strptime(sample, fmt)
+            return _local_epochs(lambda value, fmt=fmt: datetime.strptime(value, fmt))
+        except ValueError:
+            continue
+    raise ImportFormatError(f"Unrecognized timestamp '{sample}'")
+
+
+def parse_csv(lines):
+    """Yield readings from a utility interval CSV given as an iterable of text lines.
+
+    Preamble lines before the header (account numbers, addresses) are
+    skipped. Times without an offset are taken as ``Config.TIMEZONE`` local time.
+    """
+    rows = csv.reader(lines)
+    for header in rows:
+        header = [name.strip().lower() for name in header]
+        usage = _first_column(header, CSV_USAGE_COLUMNS)
+        if usage is not None:
+            break
+    else:
+        raise ImportFormatError("No usage column found in CSV")
+
+    time_column = _first_column(header, CSV_TIME_COLUMNS)
+    date_column = _first_column(header, CSV_DATE_COLUMNS)
+    if time_column is None and date_column is None:
+        raise ImportFormatError("No timestamp column found in CSV")
+
+    # Separate DATE and START TIME columns are joined into one timestamp
+    if date_column is not None and time_column is not None and header[time_column] in ('start time', 'start'):
+        def timestamp_text(row):
+            return f"{row[date_column].strip()} {row[time_column].strip()}"
+    else:
+        column = time_column if time_column is not None else date_column
+
+        def timestamp_text(row):
+            return row[column].strip()
+
+    to_epoch = None
+    for row in rows:
+        if len(row) <= usage or not row[usage].strip():
+            continue
+        text = timestamp_text(row)
+        if to_epoch is None:
+            to_epoch = _timestamp_parser(text)
+        yield to_epoch(text), float(row[usage].replace(',', ''))
+
+
+def iter_readings(stream):
+    """Yield ``(epoch seconds, kWh)`` from a Green Button XML or utility CSV binary stream.
+
+    Both formats are parsed incrementally, so memory use stays flat however
+    many years of intervals the file holds.
+    """
+    stream = stream if hasattr(stream, 'peek') else io.BufferedReader(stream)
+    if sniff_format(stream) == 'xml':
+        return parse_green_button(stream)
+    return parse_csv(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+
+
+def batched(readings, size):
+    """Group an iterable of readings into lists of at most ``size``."""
+    readings = iter(readings)
+    while batch := list(islice(readings, size)):
+        yield batch
@@ -0,0 +1,194 @@
+import json
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install orjson
+    orjson = None
+
+# Candidate field names, most common first
+LOAD_TIME_FIELDS = ('BeginDate', 'StartTime', 'Time', 'Timestamp')
+LOAD_ACTUAL_FIELDS = ('LoadMw', 'Load', 'ActualLoad', 'Value')
+LOAD_FORECAST_FIELDS = ('LoadMwForecasted', 'ForecastLoad', 'Forecast')
+LOAD_CONTAINERS = (('SystemLoads', 'SystemLoad'), ('SystemLoad',), ('Data',))
+
+# (top-level key, price fields to try on its first record); "Location." reads a nested object
+PRICE_SCHEMAS = (
+    ('FiveMinLmp', ('LmpTotal', 'Location.LmpTotal')),
+    ('FiveMinuteLmps', ('Location.LmpTotal', 'TotalPrice', 'Price', 'Value', 'LmpTotal')),
+    ('HourlyLmps', ('Location.LmpTotal', 'LmpTotal', 'TotalPrice', 'Price', 'Value')),
+    ('DaLmps', ('LmpTotal',)),
+    ('Prices', ('Price',)),
+    ('LmpData', ('LmpTotal',)),
+    ('FiveMinPrices', ('Price',)),
+)
+PRICE_SCALAR_KEYS = ('Price', 'SystemPrice')
+PRICE_FALLBACK_FIELDS = ('Price', 'LmpTotal', 'price', 'value', 'Amount')
+
+LoadSchema = namedtuple('LoadSchema', ['time', 'actual', 'forecast'])
+
+
+def loads(content):
+    """Decode a JSON body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def decode_response(response):
+    """Decode a ``requests`` response body without going through ``response.json()``."""
+    return loads(response.content)
+
+
+def parse_timestamp(value):
+    """Epoch seconds of an ISO-8601 timestamp as published by ISO-NE; raises ValueError when malformed."""
+    if not value:
+        raise ValueError("Empty timestamp")
+    if value[-1] == 'Z':
+        value = value[:-1] + '+00:00'
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+def _first_field(entry, candidates):
+    return next((field for field in candidates if field in entry), None)
+
+
+def load_entries(data):
+    """The list of load entries in a system load payload, or None if there is none."""
+    for path in LOAD_CONTAINERS:
+        node = data
+        for key in path:
+            node = node.get(key) if isinstance(node, dict) else None
+        if node:
+            # A single current reading comes back as an object rather than an array
+            return [node] if isinstance(node, dict) else node
+    return None
+
+
+def resolve_load_schema(entry):
+    """Work out which fields carry the timestamp, actual and forecast load.
+
+    ISO-NE uses one naming scheme per payload, so this is done on the first
+    entry and the result applied to the whole array.
+    """
+    return LoadSchema(
+        _first_field(entry, LOAD_TIME_FIELDS),
+        _first_field(entry, LOAD_ACTUAL_FIELDS),
+        _first_field(entry, LOAD_FORECAST_FIELDS)
+    )
+
+
+def parse_load(data, since=None):
+    """Parse a system load payload into sorted (epoch, actual, forecast) points newer than ``since``.
+
+    Returns None when the payload holds no recognizable load array.
+    """
+    entries = load_entries(data)
+    if not entries:
+        return None
+
+    schema = resolve_load_schema(entries[0])
+    if schema.time is None:
+        return []
+    time_field, actual_field, forecast_field = schema
+
+    def entry_time(entry):
+        try:
+            return parse_timestamp(entry[time_field])
+        except (KeyError, ValueError, TypeError):
+            return float('-inf')
+
+    # Entries are chronological, so binary-search past the ones we already hold
+    first = 0
+    if since is not None and entry_time(entries[0]) <= entry_time(entries[-1]):
+        first = bisect_right(entries, since, key=entry_time)
+
+    points = []
+    for entry in entries[first:]:
+        try:
+            timestamp = parse_timestamp(entry[time_field])
+        except (KeyError, ValueError, TypeError):
+            continue
+        if since is not None and timestamp <= since:
+            continue
+        try:
+            actual = float(entry[actual_field]) if actual_field in entry else 0.0
+            forecast = float(entry[forecast_field]) if forecast_field in entry else actual
+        except (ValueError, TypeError):
+            continue
+        points.append((timestamp, actual, forecast))
+
+    points.sort()
+    return points
+
+
+def _first_record(node):
+    """First record of a price container: ``[...]``, ``{"X": [...]}`` or a bare object."""
+    if isinstance(node, list):
+        return node[0] if node else None
+    if isinstance(node, dict):
+        if len(node) == 1:
+            key, inner = next(iter(node.items()))
+            if isinstance(inner, list) or (isinstance(inner, dict) and key != 'Location'):
+                return _first_record(inner)
+        return node
+    return None
+
+
+def _record_price(record, fields):
+    for field in fields:
+        if field.startswith('Location.'):
+            location = record.get('Location')
+            value = location.get(field[9:]) if isinstance(location, dict) else None
+        else:
+            value = record.get(field)
+        if value is None or value == '':
+            continue
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            continue
+    return None
+
+
+def resolve_price_schema(data):
+    """Return ``(key, fields)`` for the first price format present in ``data``, or None."""
+    for key, fields in PRICE_SCHEMAS:
+        if data.get(key):
+            return key, fields
+    return None
+
+
+def parse_price(data):
+    """Extract the current LMP ($/MWh) from any known price payload, or None.
+
+    Any number is a valid price, including zero and negative LMPs.
+    """
+    if not isinstance(data, dict):
+        return None
+
+    schema = resolve_price_schema(data)
+    if schema is not None:
+        key, fields = schema
+        record = _first_record(data[key])
+        if isinstance(record, dict):
+            price = _record_price(record, fields)
+            if price is not None:
+                return price
+
+    for key in PRICE_SCALAR_KEYS:
+        if key in data:
+            try:
+                return float(data[key])
+            except (ValueError, TypeError):
+                pass
+
+    # Unknown wrapper: look for a price-like field on the first record of any array
+    for value in data.values():
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            price = _record_price(value[0], PRICE_FALLBACK_FIELDS)
+            if price is not None:
+                return price
+    return None
@@ -1,30 +1,61 @@
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
-from datetime import datetime
+import numpy as np
+from datetime import datetime, timedelta
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from functools import wraps
 from config import Config
+from services.load_buffer import LoadRingBuffer
+from services.downsampling import downsample_load, target_points
+from services.load_series import LoadSeries
+from services.structured_logging import log_payload
+from services.iso_ne_parsers import decode_response, parse_load, parse_price
+from services.fuel_mix import carbon_intensity, normalize
+from services.carbon_intensity import aggregate, fuel_mix_matrix
+from services.window_finder import WindowIndex, persistence_forecast
 
 logger = logging.getLogger(__name__)
 
 def with_retry_and_circuit_breaker(func):
+    """Run the call on the service's long-lived pooled session.
+
+    Retries are configured once on the session's adapter, so every call reuses
+    the same keep-alive connections instead of paying a new TCP+TLS handshake.
+    """
     @wraps(func)
-    def wrapper(*args, **kwargs):
-        retry_strategy = Retry(
-            total=Config.MAX_RETRIES,
-            backoff_factor=Config.RETRY_BACKOFF_FACTOR,
-            status_forcelist=Config.RETRY_STATUS_FORCELIST
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        with requests.Session() as session:
-            session.mount("https://", adapter)
-            session.mount("http://", adapter)
-            return func(*args, session=session, **kwargs)
+    def wrapper(self, *args, **kwargs):
+        if kwargs.get('session') is None:
+            kwargs['session'] = self.session
+        return func(self, *args, **kwargs)
     return wrapper
 
+def build_pooled_session(pool_connections=None, pool_maxsize=None, pool_block=None):
+    """Create a keep-alive session with retries and bounded per-host connection pools."""
+    retry_strategy = Retry(
+        total=Config.MAX_RETRIES,
+        backoff_factor=Config.RETRY_BACKOFF_FACTOR,
+        status_forcelist=Config.RETRY_STATUS_FORCELIST
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections or Config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize or Config.HTTP_POOL_MAXSIZE,
+        pool_block=Config.HTTP_POOL_BLOCK if pool_block is None else pool_block,
+        max_retries=retry_strategy
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 class IsoNeService:
-    def __init__(self):
+    def __init__(self, session=None, store=None, shared=None):
+        self.session = session or build_pooled_session()
+        self.store = store  # Optional TimeSeriesStore that keeps every ingested point
+        self.shared = shared  # Optional SharedSnapshot that one worker publishes for all the others
         self.base_url = Config.ISO_NE_API_URL
         self.auth = (Config.ISO_USERNAME, Config.ISO_PASSWORD)
         self.headers = {
@@ -34,265 +65,587 @@ class IsoNeService:
         }
         self._last_successful_fuel_mix = None
         self._last_successful_price = None
+
+        # Last N days of five-minute load, refreshed incrementally
+        self._load_buffer = LoadRingBuffer(
+            Config.LOAD_BUFFER_DAYS * 86400 // Config.ISO_PUBLICATION_INTERVAL
+        )
+        self._load_buffer_from_store()
+
+        # Dashboard snapshot shared by all requests, refreshed once per ISO interval
+        self._snapshot = None
+        self._snapshot_version = 0
+        self._shared_version = 0  # Last shared snapshot version published or adopted
+        self._snapshot_fetched_at = 0.0
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_published = threading.Condition()
+        self._refresher = None
+        self._refresher_stop = threading.Event()
+        self._downsampled = {}  # (snapshot version, points) -> downsampled snapshot
+        self._window_indexes = {}  # metric -> WindowIndex, rebuilt with each snapshot
+
+        # Bounded pool for fanning out the independent dashboard fetches
+        self._executor = ThreadPoolExecutor(
+            max_workers=Config.DASHBOARD_FETCH_WORKERS,
+            thread_name_prefix='iso-ne-fetch'
+        )
+
+        # A new worker starts from the snapshot already published by the others
+        self._adopt_shared()
     
     @with_retry_and_circuit_breaker
     def get_fuel_mix(self, session=None):
         """Get current fuel mix data with retries and circuit breaker."""
         try:
-            # Get generation mix data
-            gen_mix_data = None
-            try:
-                response = session.get(
-                    f"{self.base_url}/genfuelmix/current",
-                    auth=self.auth,
-                    headers=self.headers,
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    gen_mix_data = response.json()
-                    logger.info(f"Generation mix API response: {gen_mix_data}")
-            except Exception as e:
-                logger.error(f"Error fetching generation mix: {str(e)}")
-
-            # Get resource mix data
-            resource_mix_data = None
-            try:
-                response = session.get(
-                    f"{self.base_url}/fuelmix/current",
-                    auth=self.auth,
-                    headers=self.headers,
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    resource_mix_data = response.json()
-                    logger.info(f"Resource mix API response: {resource_mix_data}")
-            except Exception as e:
-                logger.error(f"Error fetching resource mix: {str(e)}")
-
-            # Process both datasets
-            gen_mix = self._process_generation_mix(gen_mix_data) if gen_mix_data else Config.DEFAULT_FUEL_MIX
-            resource_mix = self._process_resource_mix(resource_mix_data) if resource_mix_data else Config.DEFAULT_FUEL_MIX
-
-            # Store the resource mix as last successful
-            if resource_mix != Config.DEFAULT_FUEL_MIX:
-                self._last_successful_fuel_mix = resource_mix
-
-            return gen_mix, resource_mix
+            gen_mix_data = self._fetch_generation_mix(session)
+            resource_mix_data = self._fetch_resource_mix(session)
+            return self._combine_fuel_mix(gen_mix_data, resource_mix_data)
 
         except Exception as e:
-            logger.error(f"Error in get_fuel_mix: {str(e)}")
-            return Config.DEFAULT_FUEL_MIX, Config.DEFAULT_FUEL_MIX
-    
-    @with_retry_and_circuit_breaker
-    def get_price(self, session=None):
-        """Get current price data with retries and circuit breaker."""
+            logger.error("Error in get_fuel_mix: %s", e)
+            return self._default_mix(), self._default_mix()
+
+    def _fetch_generation_mix(self, session):
+        """Fetch the raw generation mix payload, or None if unavailable."""
         try:
-            # Try the five-minute LMP endpoint first
             response = session.get(
-                f"{self.base_url}/fiveminutelmp/current/location/4000",  # Hub location
+                f"{self.base_url}/genfuelmix/current",
                 auth=self.auth,
                 headers=self.headers,
                 timeout=10
             )
             
-            response.raise_for_status()  # Raise error for non-200 status
-            data = response.json()
-            logger.info(f"Price API response: {data}")
-            
-            # Process the price data
-            price = self._process_price(data)
-            if price is not None:  # Any number, including negative, is valid
-                self._last_successful_price = price
-                logger.info(f"Using current price from API: {price}")
-                return price
-                
-            # If first endpoint failed, try hourly
+            if response.status_code == 200:
+                gen_mix_data = decode_response(response)
+                log_payload(logger, "Generation mix API response: %s", gen_mix_data)
+                return gen_mix_data
+        except Exception as e:
+            logger.error("Error fetching generation mix: %s", e)
+        return None
+
+    def _fetch_resource_mix(self, session):
+        """Fetch the raw resource mix payload, or None if unavailable."""
+        try:
             response = session.get(
-                f"{self.base_url}/hourlylmp/current/location/4000",
+                f"{self.base_url}/fuelmix/current",
                 auth=self.auth,
                 headers=self.headers,
                 timeout=10
             )
             
             if response.status_code == 200:
-                data = response.json()
+                resource_mix_data = decode_response(response)
+                log_payload(logger, "Resource mix API response: %s", resource_mix_data)
+                return resource_mix_data
+        except Exception as e:
+            logger.error("Error fetching resource mix: %s", e)
+        return None
+
+    def _combine_fuel_mix(self, gen_mix_data, resource_mix_data):
+        """Process both fuel mix payloads, falling back to defaults for missing ones."""
+        gen_mix = self._process_generation_mix(gen_mix_data) if gen_mix_data else self._default_mix()
+        resource_mix = self._process_resource_mix(resource_mix_data) if resource_mix_data else self._default_mix()
+
+        # Store the resource mix as last successful
+        if resource_mix_data:
+            self._last_successful_fuel_mix = resource_mix
+
+        return gen_mix, resource_mix
+
+    def _default_mix(self):
+        return {
+            'percentages': Config.DEFAULT_FUEL_MIX,
+            'megawatts': {k: 0 for k in Config.DEFAULT_FUEL_MIX.keys()}
+        }
+    
+    @with_retry_and_circuit_breaker
+    def get_price(self, session=None):
+        """Get current price data with retries and circuit breaker."""
+        price = self._fetch_price(session)
+        if price is not None:
+            return price
+
+        # If we have a last successful price, use it
+        if self._last_successful_price is not None:
+            logger.info("Using last successful price: %s", self._last_successful_price)
+            return self._last_successful_price
+        
+        # Only use default as last resort
+        logger.warning("No valid price found, using default: %s", Config.DEFAULT_PRICE)
+        return Config.DEFAULT_PRICE
+
+    def _fetch_price(self, session):
+        """Fetch the current price from the five-minute then hourly LMP endpoints."""
+        endpoints = [
+            '/fiveminutelmp/current/location/4000',  # Hub location
+            '/hourlylmp/current/location/4000'
+        ]
+
+        for endpoint in endpoints:
+            try:
+                response = session.get(
+                    f"{self.base_url}{endpoint}",
+                    auth=self.auth,
+                    headers=self.headers,
+                    timeout=10
+                )
+                
+                if response.status_code != 200:
+                    logger.warning("Price endpoint %s returned status %s", endpoint, response.status_code)
+                    continue
+
+                data = decode_response(response)
+                log_payload(logger, "Price API response: %s", data)
+                
                 price = self._process_price(data)
-                if price is not None:
+                if price is not None:  # Any number, including negative, is valid
                     self._last_successful_price = price
-                    logger.info(f"Using current hourly price: {price}")
+                    logger.info("Using current price from %s: %s", endpoint, price)
                     return price
-            
-            # If we have a last successful price, use it
-            if self._last_successful_price is not None:
-                logger.info(f"Using last successful price: {self._last_successful_price}")
-                return self._last_successful_price
-            
-            # Only use default as last resort
-            logger.warning(f"No valid price found, using default: {Config.DEFAULT_PRICE}")
-            return Config.DEFAULT_PRICE
-            
-        except Exception as e:
-            logger.error(f"Error fetching price: {str(e)}")
-            if self._last_successful_price is not None:
-                logger.info(f"Using last successful price after error: {self._last_successful_price}")
-                return self._last_successful_price
-            return Config.DEFAULT_PRICE
+            except Exception as e:
+                logger.error("Error fetching price from %s: %s", endpoint, e)
+
+        return None
     
     @with_retry_and_circuit_breaker
     def get_system_load(self, session=None):
         """Get system load data with retries and circuit breaker."""
         try:
-            # Try multiple endpoints in case the primary one fails
-            endpoints = [
-                '/fiveminutesystemload/current',  # Try current data first
-                '/fiveminutesystemload',          # Then try general endpoint
-                '/systemload/current'             # Fallback endpoint
-            ]
-            
-            for endpoint in endpoints:
-                try:
-                    response = session.get(
-                        f"{self.base_url}{endpoint}",
-                        auth=self.auth,
-                        headers=self.headers,
-                        timeout=10
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        logger.info(f"Successfully fetched system load data from {endpoint}")
-                        processed_data = self._process_system_load(data)
-                        if processed_data:
-                            return processed_data
-                except Exception as e:
-                    logger.warning(f"Failed to fetch system load from {endpoint}: {str(e)}")
-                    continue
-            
-            logger.error("All system load endpoints failed")
+            processed_data = self._fetch_system_load(session)
+            if processed_data:
+                return processed_data
             return self._generate_fallback_load_data()
                 
         except Exception as e:
-            logger.error(f"Error in get_system_load: {str(e)}")
+            logger.error("Error in get_system_load: %s", e)
             return self._generate_fallback_load_data()
 
-    def _process_system_load(self, data):
-        """Process system load data into time series format."""
+    def _fetch_system_load(self, session):
+        """Fetch only the load points newer than the ring buffer's last timestamp.
+
+        Returns a copy of the buffered window as a ``LoadSeries``, or None if
+        the buffer is still empty because every endpoint failed.
+        """
+        last_ts = self._load_buffer.last_timestamp
+        new_points = []
+        for endpoint in self._system_load_endpoints(last_ts):
+            points = self._fetch_load_points(session, endpoint, last_ts)
+            if points:
+                new_points.extend(points)
+                last_ts = points[-1][0]
+
+        # Legacy endpoints, used when the day/current endpoints return nothing
+        if not new_points and not len(self._load_buffer):
+            for endpoint in ['/fiveminutesystemload', '/systemload/current']:
+                new_points = self._fetch_load_points(session, endpoint, last_ts)
+                if new_points:
+                    break
+
+        appended = self._load_buffer.extend(new_points)
+        logger.info("Appended %s new system load points (%s buffered)", appended, len(self._load_buffer))
+        if appended and self.store is not None:
+            try:
+                self.store.record_load(*zip(*new_points))
+            except Exception as e:
+                logger.error("Error recording system load history: %s", e)
+
+        if not len(self._load_buffer):
+            logger.error("All system load endpoints failed")
+            return None
+        # Copy so the snapshot is not mutated by the next refresh's appends
+        return self._load_buffer.series().copy()
+
+    def _system_load_endpoints(self, last_ts):
+        """Pick the smallest set of load endpoints that covers everything after last_ts."""
+        now = datetime.now()
+        if last_ts is not None and now.timestamp() - last_ts <= 2 * Config.ISO_PUBLICATION_INTERVAL:
+            return ['/fiveminutesystemload/current']
+
+        if last_ts is not None:
+            since = datetime.fromtimestamp(last_ts)
+        else:
+            since = now - timedelta(days=Config.LOAD_BUFFER_DAYS)
+        days = (now.date() - since.date()).days
+        return [
+            f"/fiveminutesystemload/day/{since.date() + timedelta(days=i):%Y%m%d}"
+            for i in range(days + 1)
+        ]
+
+    def _fetch_load_points(self, session, endpoint, since):
+        """Fetch one load endpoint and parse the points newer than ``since``."""
         try:
-            # Try different possible response formats
-            load_data = None
-            
-            # Format 1: SystemLoads.SystemLoad array
-            if data.get('SystemLoads', {}).get('SystemLoad'):
-                load_data = data['SystemLoads']['SystemLoad']
-            # Format 2: Direct SystemLoad array
-            elif data.get('SystemLoad'):
-                load_data = data['SystemLoad']
-            # Format 3: Data array
-            elif data.get('Data'):
-                load_data = data['Data']
+            response = session.get(
+                f"{self.base_url}{endpoint}",
+                auth=self.auth,
+                headers=self.headers,
+                timeout=10
+            )
             
-            if not load_data:
-                logger.warning("Could not find load data in response")
-                return None
-
-            timestamps = []
-            actual_values = []
-            forecast_values = []
-
-            for entry in load_data:
-                try:
-                    # Try different date field names
-                    date_field = next((field for field in ['BeginDate', 'StartTime', 'Time', 'Timestamp']
-                                    if field in entry), None)
-                    if not date_field:
-                        continue
-                        
-                    timestamp = datetime.fromisoformat(entry[date_field].replace('Z', '+00:00'))
-                    
-                    # Try different load field names
-                    actual = float(next((entry[field] for field in ['LoadMw', 'Load', 'ActualLoad', 'Value']
-                                      if field in entry), 0))
-                    forecast = float(next((entry[field] for field in ['LoadMwForecasted', 'ForecastLoad', 'Forecast']
-                                        if field in entry), actual))  # Use actual as fallback
-                    
-                    timestamps.append(timestamp.isoformat())
-                    actual_values.append(actual)
-                    forecast_values.append(forecast)
-                except (ValueError, KeyError) as e:
-                    logger.warning(f"Error processing load entry: {e}")
-                    continue
-
-            if not timestamps:
-                logger.warning("No valid load entries found")
-                return None
+            if response.status_code == 200:
+                logger.info("Successfully fetched system load data from %s", endpoint)
+                return self._process_system_load(decode_response(response), since) or []
+            logger.warning("System load endpoint %s returned status %s", endpoint, response.status_code)
+        except Exception as e:
+            logger.warning("Failed to fetch system load from %s: %s", endpoint, e)
+        return []
 
-            return {
-                'timestamps': timestamps,
-                'actual': actual_values,
-                'forecast': forecast_values
-            }
+    def _load_buffer_from_store(self):
+        """Seed the ring buffer from stored history so a restart only fetches the gap."""
+        if self.store is None:
+            return
+        try:
+            since = time.time() - Config.LOAD_BUFFER_DAYS * 86400
+            self._load_buffer.extend(self.store.load_rows(since, time.time()))
+        except Exception as e:
+            logger.error("Error seeding system load buffer from history: %s", e)
 
+    def _process_system_load(self, data, since=None):
+        """Parse system load data into (epoch, actual, forecast) points newer than ``since``."""
+        try:
+            points = parse_load(data, since)
+            if points is None:
+                logger.warning("Could not find load data in response")
+            return points
         except Exception as e:
-            logger.error(f"Error processing system load data: {str(e)}")
+            logger.error("Error processing system load data: %s", e)
             return None
 
     def _generate_fallback_load_data(self):
         """Generate fallback load data when API fails."""
-        from datetime import timedelta
-        import random
-        import math
-        
-        current_time = datetime.now()
-        timestamps = []
-        actual_values = []
-        forecast_values = []
-        
-        # Generate 24 hours of data points, one per 5 minutes
-        for i in range(24 * 12):  # 12 five-minute intervals per hour
-            timestamp = current_time - timedelta(minutes=5 * i)
-            hour = timestamp.hour
-            
-            # Base load varies by time of day
-            base_load = 15000  # Base load in MW
-            time_factor = math.sin((hour - 3) * math.pi / 24)  # Peak at 3 PM, trough at 3 AM
-            load = base_load + (3000 * time_factor)  # Vary by ±3000 MW
-            
-            # Add some random variation
-            actual = load + random.uniform(-200, 200)
-            forecast = actual + random.uniform(-500, 500)  # Forecast error
-            
-            timestamps.append(timestamp.isoformat())
-            actual_values.append(actual)
-            forecast_values.append(forecast)
-        
-        # Reverse lists so most recent is last
-        timestamps.reverse()
-        actual_values.reverse()
-        forecast_values.reverse()
-        
+        # 24 hours of data points, one per 5 minutes, most recent last
+        now = int(time.time())
+        times = now - Config.ISO_PUBLICATION_INTERVAL * np.arange(24 * 12)[::-1]
+        utc_offset = datetime.now().astimezone().utcoffset().total_seconds()
+        hours = ((times + utc_offset) // 3600) % 24
+
+        # Base load varies by time of day
+        base_load = 15000  # Base load in MW
+        time_factor = np.sin((hours - 3) * np.pi / 24)  # Peak at 3 PM, trough at 3 AM
+        load = base_load + (3000 * time_factor)  # Vary by ±3000 MW
+
+        # Add some random variation
+        actual = load + np.random.uniform(-200, 200, len(times))
+        forecast = actual + np.random.uniform(-500, 500, len(times))  # Forecast error
+
+        return LoadSeries(times, actual, forecast)
+
+    def get_connection_stats(self):
+        """Report how often requests reused a pooled connection instead of opening one."""
+        hosts = []
+        adapters = {id(adapter): adapter for adapter in self.session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                hosts.append({
+                    "host": f"{pool.scheme}://{pool.host}:{pool.port}",
+                    "requests": pool.num_requests,
+                    "connections_opened": pool.num_connections,
+                    "reused_requests": max(pool.num_requests - pool.num_connections, 0),
+                    "idle_connections": pool.pool.qsize() if pool.pool is not None else 0
+                })
+
+        total_requests = sum(h["requests"] for h in hosts)
+        total_connections = sum(h["connections_opened"] for h in hosts)
+        reused = sum(h["reused_requests"] for h in hosts)
         return {
-            'timestamps': timestamps,
-            'actual': actual_values,
-            'forecast': forecast_values
+            "pool_connections": Config.HTTP_POOL_CONNECTIONS,
+            "pool_maxsize": Config.HTTP_POOL_MAXSIZE,
+            "requests": total_requests,
+            "connections_opened": total_connections,
+            "reused_requests": reused,
+            "reuse_ratio": round(reused / total_requests, 4) if total_requests else 0.0,
+            "hosts": hosts
         }
 
-    def get_dashboard_data(self):
-        """Get all dashboard data with proper error handling."""
+    def close(self):
+        """Stop background work and release pooled connections."""
+        self.stop_background_refresh()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+        if self.shared is not None:
+            self.shared.close()
+
+    def get_dashboard_data(self, points=None):
+        """Get the cached dashboard snapshot, fetching it only when missing or stale.
+
+        When ``points`` is given, ``systemLoad`` is downsampled to roughly that
+        many points; results are memoized per snapshot version.
+        """
+        return self.get_versioned_dashboard_data(points)[1]
+
+    def get_versioned_dashboard_data(self, points=None):
+        """Same as ``get_dashboard_data`` but returns ``(snapshot version, data)``."""
+        version, snapshot = self._snapshot_version, self._snapshot
+        if snapshot is None or (self._snapshot_is_stale() and not self._snapshot_lock.locked()):
+            # Serve the current snapshot while another thread is refreshing it
+            snapshot = self.refresh_snapshot(only_if_stale=True)
+            version = self._snapshot_version
+
+        load = snapshot.get('systemLoad')
+        points = target_points(points, len(load) if load is not None else 0)
+        if points is None:
+            return version, snapshot
+
+        key = (version, points)
+        downsampled = self._downsampled.get(key)
+        if downsampled is None:
+            downsampled = dict(snapshot, systemLoad=downsample_load(load, points))
+            # Only keep results for the current snapshot version
+            self._downsampled = {k: v for k, v in self._downsampled.items() if k[0] == version}
+            self._downsampled[key] = downsampled
+        return version, downsampled
+
+    def get_cached_price(self):
+        """Get the current price from the dashboard snapshot."""
+        return self.get_dashboard_data()['price']['current']
+
+    def get_cached_fuel_mix(self):
+        """Get the generation and resource mix from the dashboard snapshot."""
+        data = self.get_dashboard_data()
+        return data['generationMix'], data['resourceMix']
+
+    @property
+    def snapshot_version(self):
+        """Monotonic counter bumped every time a new snapshot is published."""
+        return self._snapshot_version
+
+    @property
+    def snapshot_fetched_at(self):
+        """Epoch seconds when the current snapshot was fetched from ISO-NE."""
+        return self._snapshot_fetched_at
+
+    def seconds_until_snapshot_expires(self):
+        """How long clients may cache the current snapshot before a newer one is expected."""
+        if self._refresher is not None and self._refresher.is_alive():
+            return max(0.0, self.seconds_until_next_refresh())
+        age = time.time() - self._snapshot_fetched_at
+        return max(0.0, Config.CACHE_DEFAULT_TIMEOUT - age)
+
+    def refresh_snapshot(self, only_if_stale=False):
+        """Fetch dashboard data from ISO-NE and publish it as the new snapshot.
+
+        Concurrent callers are serialized on the snapshot lock, so a burst of
+        misses results in a single upstream fetch.
+        """
+        with self._snapshot_lock:
+            if only_if_stale and self._snapshot is not None and not self._snapshot_is_stale():
+                return self._snapshot
+
+            changed = False
+            if self.shared is not None and not self.shared.try_become_writer():
+                # Another worker fetches from ISO-NE and publishes; take its latest snapshot
+                changed = self._adopt_shared()
+                fetch = self._snapshot is None  # Nothing has been published yet
+            else:
+                fetch = True
+
+            if fetch:
+                changed = True
+                data = self.fetch_dashboard_data()
+                self._snapshot = data
+                self._snapshot_fetched_at = time.time()
+                self._snapshot_version += 1
+                if self.shared is not None and self.shared.is_writer:
+                    published = self.shared.publish(data, self._snapshot_fetched_at)
+                    if published is not None:
+                        self._shared_version = published
+                        self._snapshot_version = max(published, self._snapshot_version)
+                self._update_window_indexes(data)
+            data = self._snapshot
+
+        if changed:
+            with self._snapshot_published:
+                self._snapshot_published.notify_all()
+        return data
+
+    def sync_shared_snapshot(self):
+        """Adopt a newer snapshot published by the writer process; returns whether there was one."""
+        with self._snapshot_lock:
+            changed = self._adopt_shared()
+        if changed:
+            with self._snapshot_published:
+                self._snapshot_published.notify_all()
+        return changed
+
+    def _adopt_shared(self):
+        """Replace our snapshot with the shared one if it is newer; the caller holds the snapshot lock."""
+        if self.shared is None or self.shared.version <= self._shared_version:
+            return False
         try:
-            gen_mix, resource_mix = self.get_fuel_mix()
-            price = self.get_price()
-            system_load = self.get_system_load()
-            
-            # Calculate carbon intensity using resource mix percentages
-            carbon_intensity = self._calculate_carbon_intensity(
-                resource_mix['percentages'] if isinstance(resource_mix, dict) and 'percentages' in resource_mix
-                else Config.DEFAULT_FUEL_MIX
+            published = self.shared.read()
+        except Exception as e:
+            logger.error("Error reading shared snapshot: %s", e)
+            return False
+        if published is None:
+            return False
+
+        version, fetched_at, data = published
+        self._snapshot = data
+        self._snapshot_fetched_at = fetched_at
+        self._snapshot_version = max(version, self._snapshot_version + 1)
+        self._shared_version = version
+
+        # Keep the writer's fallbacks, in case this worker has to take over fetching
+        api_info = data.get('api_info', {})
+        if api_info.get('price_data_source') == 'api':
+            self._last_successful_price = data['price']['current']
+        if api_info.get('fuel_mix_source') == 'api':
+            self._last_successful_fuel_mix = data['resourceMix']
+
+        self._update_window_indexes(data)
+        return True
+
+    def _update_window_indexes(self, data):
+        """Rebuild the best-window indexes from the forecasts behind a new snapshot.
+
+        The load forecast comes from the snapshot itself, and only when ISO-NE
+        supplied it; a snapshot with generated fallback load keeps the last
+        index built from real data. Price and carbon intensity have no upstream
+        forecast, so the last day of stored history is repeated one day ahead.
+        """
+        now = int(time.time())
+        horizon = int(Config.WINDOW_HORIZON.total_seconds())
+        sources = {}
+        try:
+            load = data.get('systemLoad')
+            load_is_real = data.get('api_info', {}).get('system_load_source') == 'api'
+            if load_is_real and isinstance(load, LoadSeries) and len(load):
+                sources['load'] = (load.times, load.forecast)
+            if self.store is not None:
+                rows = self.store.price_rows(now - 86400, now)
+                if rows:
+                    sources['price'] = tuple(zip(*rows))
+                times, matrix = fuel_mix_matrix(self.store.fuel_mix_rows(now - 86400, now))
+                if len(times):
+                    sources['carbon'] = aggregate(times, matrix)
+        except Exception as e:
+            logger.error("Error loading best-window forecasts: %s", e)
+
+        indexes = {}
+        for metric, (times, values) in sources.items():
+            try:
+                times, values = persistence_forecast(times, values, now, horizon)
+                if len(times):
+                    indexes[metric] = WindowIndex(
+                        times, values, Config.ISO_PUBLICATION_INTERVAL, Config.WINDOW_DURATIONS
+                    )
+            except Exception as e:
+                logger.error("Error building %s best-window index: %s", metric, e)
+        if 'load' not in indexes and 'load' in self._window_indexes:
+            indexes['load'] = self._window_indexes['load']
+        self._window_indexes = indexes
+
+    def best_window(self, metric, minutes, earliest=None):
+        """Lowest-``metric`` window of ``minutes`` starting at or after ``earliest`` (default now).
+
+        ``metric`` is one of 'price', 'carbon' or 'load'. Returns None when
+        there is no forecast for it or it is shorter than ``minutes``.
+        """
+        if self._snapshot is None:
+            self.refresh_snapshot(only_if_stale=True)
+        index = self._window_indexes.get(metric)
+        if index is None:
+            return None
+        return index.best(minutes, time.time() if earliest is None else earliest)
+
+    def wait_for_snapshot(self, after_version, timeout=None):
+        """Block until a snapshot newer than ``after_version`` is published or ``timeout`` passes.
+
+        Returns the current snapshot version either way.
+        """
+        with self._snapshot_published:
+            self._snapshot_published.wait_for(
+                lambda: self._snapshot_version > after_version,
+                timeout=timeout
             )
+        return self._snapshot_version
+
+    def _snapshot_is_stale(self):
+        return time.time() - self._snapshot_fetched_at >= Config.CACHE_DEFAULT_TIMEOUT
+
+    def seconds_until_next_refresh(self, now=None):
+        """Seconds until the next ISO publication boundary plus the configured delay."""
+        interval = Config.ISO_PUBLICATION_INTERVAL
+        delay = Config.SNAPSHOT_REFRESH_DELAY
+        now = time.time() if now is None else now
+        next_refresh = ((now - delay) // interval + 1) * interval + delay
+        return next_refresh - now
+
+    def start_background_refresh(self):
+        """Start a daemon thread that refreshes the snapshot on every ISO interval."""
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._refresher_stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop,
+            name='iso-ne-snapshot-refresher',
+            daemon=True
+        )
+        self._refresher.start()
+
+    def stop_background_refresh(self):
+        """Stop the background refresher thread."""
+        self._refresher_stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+            self._refresher = None
+
+    def _refresh_loop(self):
+        """Warm the snapshot immediately, then refresh it on each ISO boundary.
+
+        Workers that are not the shared snapshot writer instead check for a
+        newly published snapshot every ``SHARED_SNAPSHOT_POLL_INTERVAL``, and
+        take over fetching if the writer exits.
+        """
+        while True:
+            wait = Config.SHARED_SNAPSHOT_POLL_INTERVAL
+            try:
+                was_writer = self.shared is None or self.shared.is_writer
+                if self.shared is None or self.shared.try_become_writer():
+                    # A worker taking over from an exited writer keeps a still-fresh snapshot
+                    self.refresh_snapshot(only_if_stale=not was_writer)
+                    logger.info("Refreshed dashboard snapshot (version %s)", self._snapshot_version)
+                    wait = self.seconds_until_next_refresh()
+                elif self.sync_shared_snapshot():
+                    logger.info("Adopted shared dashboard snapshot (version %s)", self._snapshot_version)
+            except Exception as e:
+                logger.error("Error refreshing dashboard snapshot: %s", e, exc_info=True)
+
+            if self._refresher_stop.wait(wait):
+                return
+
+    def fetch_dashboard_data(self):
+        """Get all dashboard data from ISO-NE with proper error handling."""
+        try:
+            results = self._fetch_concurrently({
+                'generation_mix': self._fetch_generation_mix,
+                'resource_mix': self._fetch_resource_mix,
+                'price': self._fetch_price,
+                'system_load': self._fetch_system_load
+            })
+
+            gen_mix_data = results['generation_mix']
+            resource_mix_data = results['resource_mix']
+            gen_mix, resource_mix = self._combine_fuel_mix(gen_mix_data, resource_mix_data)
+
+            price = results['price']
+            if price is not None:
+                price_source = "api"
+            elif self._last_successful_price is not None:
+                price, price_source = self._last_successful_price, "cached"
+            else:
+                price, price_source = Config.DEFAULT_PRICE, "fallback"
+
+            system_load = results['system_load']
+            system_load_source = "api" if system_load else "fallback"
+            if not system_load:
+                system_load = self._generate_fallback_load_data()
             
-            # Check if we're using API data
-            is_api_price = price != Config.DEFAULT_PRICE
+            # Calculate carbon intensity using resource mix percentages
+            carbon_intensity = self._calculate_carbon_intensity(resource_mix['percentages'])
             
             # Prepare the response data
             data = {
@@ -300,14 +653,8 @@ class IsoNeService:
                     "current": price,
                     "unit": "$/MWh"
                 },
-                "generationMix": gen_mix or {
-                    'percentages': Config.DEFAULT_FUEL_MIX,
-                    'megawatts': {k: 0 for k in Config.DEFAULT_FUEL_MIX.keys()}
-                },
-                "resourceMix": resource_mix or {
-                    'percentages': Config.DEFAULT_FUEL_MIX,
-                    'megawatts': {k: 0 for k in Config.DEFAULT_FUEL_MIX.keys()}
-                },
+                "generationMix": gen_mix,
+                "resourceMix": resource_mix,
                 "carbonIntensity": {
                     "current": carbon_intensity,
                     "unit": "kg CO₂eq/MWh"
@@ -315,17 +662,22 @@ class IsoNeService:
                 "systemLoad": system_load,  # Add system load data
                 "timestamp": datetime.now().isoformat(),
                 "api_info": {
-                    "price_data_source": "api" if is_api_price else "fallback",
-                    "fuel_mix_source": "api" if gen_mix and resource_mix else "fallback",
-                    "system_load_source": "api" if system_load else "fallback"
+                    "price_data_source": price_source,
+                    # Carbon intensity and the cached fuel mix both come from the resource mix
+                    "fuel_mix_source": "api" if resource_mix_data else "fallback",
+                    "generation_mix_source": "api" if gen_mix_data else "fallback",
+                    "resource_mix_source": "api" if resource_mix_data else "fallback",
+                    "system_load_source": system_load_source
                 }
             }
             
-            logger.info(f"Returning dashboard data with price: {price}")
+            self._record_history(data)
+
+            logger.info("Returning dashboard data with price: %s", price)
             return data
             
         except Exception as e:
-            logger.error(f"Error getting dashboard data: {e}", exc_info=True)
+            logger.error("Error getting dashboard data: %s", e, exc_info=True)
             # Return fallback data
             default_mix = {
                 'percentages': Config.DEFAULT_FUEL_MIX,
@@ -347,208 +699,86 @@ class IsoNeService:
                 "api_info": {
                     "price_data_source": "fallback",
                     "fuel_mix_source": "fallback",
+                    "generation_mix_source": "fallback",
+                    "resource_mix_source": "fallback",
                     "system_load_source": "fallback"
                 }
             }
     
+    def _record_history(self, data):
+        """Append the API-sourced parts of a snapshot to the time-series store."""
+        if self.store is None:
+            return
+        try:
+            self.store.record_snapshot(data)
+        except Exception as e:
+            logger.error("Error recording dashboard history: %s", e)
+
+    def _fetch_concurrently(self, fetchers):
+        """Run independent upstream fetches in parallel under one overall deadline.
+
+        Returns a dict with the same keys as ``fetchers``; sources that failed or
+        missed the deadline map to None so callers can fall back per source.
+        """
+        futures = {
+            name: self._executor.submit(fetch, self.session)
+            for name, fetch in fetchers.items()
+        }
+        done, not_done = wait(futures.values(), timeout=Config.DASHBOARD_FETCH_DEADLINE)
+
+        results = {}
+        for name, future in futures.items():
+            if future in not_done:
+                future.cancel()
+                logger.warning("Fetching %s missed the %ss dashboard deadline", name, Config.DASHBOARD_FETCH_DEADLINE)
+                results[name] = None
+                continue
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.error("Error fetching %s: %s", name, e)
+                results[name] = None
+        return results
+
     def _process_generation_mix(self, gen_mix_data):
         """Process generation mix data."""
         try:
-            # Initialize totals with expanded categories
-            total_mw = {
-                "natural_gas": 0,
-                "nuclear": 0,
-                "hydro": 0,
-                "solar": 0,
-                "wind": 0,
-                "coal": 0,
-                "oil": 0,
-                "biomass": 0,  # Wood, Refuse, Landfill Gas
-                "other": 0
-            }
-            
-            if gen_mix_data and 'GenFuelMixes' in gen_mix_data and 'GenFuelMix' in gen_mix_data['GenFuelMixes']:
-                for entry in gen_mix_data['GenFuelMixes']['GenFuelMix']:
-                    category = entry['FuelCategory']
-                    mw = float(entry['GenMw'])
-                    
-                    if category == 'Natural Gas':
-                        total_mw['natural_gas'] += mw
-                    elif category == 'Nuclear':
-                        total_mw['nuclear'] += mw
-                    elif category == 'Coal':
-                        total_mw['coal'] += mw
-                    elif category == 'Oil':
-                        total_mw['oil'] += mw
-                    elif category == 'Hydro':
-                        total_mw['hydro'] += mw
-                    elif category == 'Solar':
-                        total_mw['solar'] += mw
-                    elif category == 'Wind':
-                        total_mw['wind'] += mw
-                    elif category in ['Wood', 'Refuse', 'Landfill Gas']:
-                        total_mw['biomass'] += mw
-                    elif category == 'Other':
-                        total_mw['other'] += mw
-
-                # Calculate percentages
-                total = sum(total_mw.values())
-                if total > 0:
-                    percentages = {
-                        key: round((value / total) * 100, 2)
-                        for key, value in total_mw.items()
-                        if value > 0
-                    }
-                    
-                    # Return both MW values and percentages
-                    result = {
-                        'percentages': percentages,
-                        'megawatts': {k: round(v, 2) for k, v in total_mw.items() if v > 0}
-                    }
-                    
-                    logger.info(f"Processed generation mix: {result}")
-                    return result
-
-            return {
-                'percentages': Config.DEFAULT_FUEL_MIX,
-                'megawatts': {k: 0 for k in Config.DEFAULT_FUEL_MIX.keys()}
-            }
+            result = normalize(gen_mix_data)
+            if result is not None:
+                logger.debug("Processed generation mix: %s", result)
+                return result
         except Exception as e:
-            logger.error(f"Error processing generation mix: {str(e)}")
-            return {
-                'percentages': Config.DEFAULT_FUEL_MIX,
-                'megawatts': {k: 0 for k in Config.DEFAULT_FUEL_MIX.keys()}
-            }
+            logger.error("Error processing generation mix: %s", e)
+        return self._default_mix()
 
     def _process_resource_mix(self, resource_mix_data):
         """Process resource mix data."""
         try:
-            # Initialize totals with expanded categories
-            total_mw = {
-                "natural_gas": 0,
-                "nuclear": 0,
-                "hydro": 0,
-                "solar": 0,
-                "wind": 0,
-                "coal": 0,
-                "oil": 0,
-                "biomass": 0,
-                "imports": 0,
-                "other": 0
-            }
-            
-            # Process the GenFuelMixes format
-            if resource_mix_data and 'GenFuelMixes' in resource_mix_data and 'GenFuelMix' in resource_mix_data['GenFuelMixes']:
-                for entry in resource_mix_data['GenFuelMixes']['GenFuelMix']:
-                    category = entry['FuelCategory']
-                    mw = float(entry['GenMw'])
-                    
-                    if 'Natural Gas' in category:
-                        total_mw['natural_gas'] += mw
-                    elif 'Nuclear' in category:
-                        total_mw['nuclear'] += mw
-                    elif 'Coal' in category:
-                        total_mw['coal'] += mw
-                    elif 'Oil' in category:
-                        total_mw['oil'] += mw
-                    elif 'Hydro' in category:
-                        total_mw['hydro'] += mw
-                    elif 'Solar' in category:
-                        total_mw['solar'] += mw
-                    elif 'Wind' in category:
-                        total_mw['wind'] += mw
-                    elif any(x in category for x in ['Wood', 'Refuse', 'Landfill']):
-                        total_mw['biomass'] += mw
-                    else:
-                        total_mw['other'] += mw
-
-                # Calculate percentages
-                total = sum(total_mw.values())
-                if total > 0:
-                    percentages = {
-                        key: round((value / total) * 100, 2)
-                        for key, value in total_mw.items()
-                        if value > 0
-                    }
-                    
-                    # Return both MW values and percentages
-                    result = {
-                        'percentages': percentages,
-                        'megawatts': {k: round(v, 2) for k, v in total_mw.items() if v > 0}
-                    }
-                    
-                    logger.info(f"Processed resource mix: {result}")
-                    return result
-
-            # If we get here, either there was no data or processing failed
-            logger.warning("Could not process resource mix data, using generation mix data instead")
-            return self._process_generation_mix(resource_mix_data)
-
+            result = normalize(resource_mix_data)
+            if result is not None:
+                logger.debug("Processed resource mix: %s", result)
+                return result
+            logger.warning("Could not process resource mix data, using default mix instead")
         except Exception as e:
-            logger.error(f"Error processing resource mix: {str(e)}")
-            return {
-                'percentages': Config.DEFAULT_FUEL_MIX,
-                'megawatts': {k: 0 for k in Config.DEFAULT_FUEL_MIX.keys()}
-            }
+            logger.error("Error processing resource mix: %s", e)
+        return self._default_mix()
     
     def _process_price(self, data):
         """Process raw price data into standardized format."""
         try:
-            logger.info(f"Processing price data: {data}")
-            
-            # Try to extract price from FiveMinLmp format
-            if 'FiveMinLmp' in data:
-                try:
-                    # The price is directly in the LmpTotal field
-                    price = float(data['FiveMinLmp']['LmpTotal'])
-                    logger.info(f"Found price in FiveMinLmp: {price}")
-                    return price  # Return the price directly, whether positive or negative
-                except (KeyError, ValueError, TypeError) as e:
-                    logger.error(f"Error extracting FiveMinLmp price: {e}")
-                    
-                    # Try alternate structure where price might be nested in Location
-                    try:
-                        if 'Location' in data['FiveMinLmp']:
-                            price = float(data['FiveMinLmp']['Location'].get('LmpTotal', 0))
-                            logger.info(f"Found price in FiveMinLmp Location: {price}")
-                            return price
-                    except (KeyError, ValueError, TypeError) as e:
-                        logger.error(f"Error extracting nested FiveMinLmp price: {e}")
-                
-            # Try to extract from HourlyLmps format
-            if 'HourlyLmps' in data and len(data['HourlyLmps']) > 0:
-                try:
-                    price = float(data['HourlyLmps'][0]['LmpTotal'])
-                    logger.info(f"Found price in HourlyLmps: {price}")
-                    return price
-                except (KeyError, ValueError, TypeError) as e:
-                    logger.error(f"Error extracting HourlyLmps price: {e}")
-                
-            # Try to extract from DaLmps format
-            if 'DaLmps' in data and len(data['DaLmps']) > 0:
-                try:
-                    price = float(data['DaLmps'][0]['LmpTotal'])
-                    logger.info(f"Found price in DaLmps: {price}")
-                    return price
-                except (KeyError, ValueError, TypeError) as e:
-                    logger.error(f"Error extracting DaLmps price: {e}")
-            
-            logger.error("No recognized price data format found")
-            return None
-            
+            log_payload(logger, "Processing price data: %s", data)
+            price = parse_price(data)
+            if price is None:
+                logger.error("No recognized price data format found")
+            return price
         except Exception as e:
-            logger.error(f"Error processing price data: {str(e)}")
+            logger.error("Error processing price data: %s", e)
             return None
     
     def _calculate_carbon_intensity(self, fuel_mix):
         """Calculate carbon intensity from fuel mix."""
         try:
-            total_emissions = sum(
-                percentage * Config.CARBON_INTENSITY_FACTORS[fuel]
-                for fuel, percentage in fuel_mix.items()
-            )
-            total_percentage = sum(fuel_mix.values())
-            return total_emissions / total_percentage if total_percentage > 0 else 0
+            return carbon_intensity(fuel_mix)
         except Exception as e:
-            logger.error(f"Error calculating carbon intensity: {str(e)}")
-            return 0 
\ No newline at end of file
+            logger.error("Error calculating carbon intensity: %s", e)
+            return 0
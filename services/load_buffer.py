@@ -0,0 +1,86 @@
+import threading
+from array import array
+from bisect import bisect_left
+import numpy as np
+from services.load_series import LoadSeries
+
+
+class LoadRingBuffer:
+    """Fixed-size ring buffer of five-minute system load points.
+
+    Every point is written twice, at ``i`` and ``i + capacity``, so the live
+    window is always one contiguous slice of the backing arrays and ``view()``
+    can hand out memoryviews without copying. Timestamps are epoch seconds and
+    MW values are float32, matching ``LoadSeries``.
+    """
+
+    def __init__(self, capacity):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._times = array('q', [0]) * (2 * capacity)
+        self._actual = array('f', [0.0]) * (2 * capacity)
+        self._forecast = array('f', [0.0]) * (2 * capacity)
+        self._start = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def last_timestamp(self):
+        """Epoch seconds of the newest point, or None when empty."""
+        if not self._size:
+            return None
+        return self._times[self._start + self._size - 1]
+
+    def append(self, ts, actual, forecast):
+        """Append a point newer than the last one; older or duplicate points are ignored."""
+        with self._lock:
+            if self._size and ts <= self._times[self._start + self._size - 1]:
+                return False
+
+            if self._size < self.capacity:
+                pos = (self._start + self._size) % self.capacity
+                self._size += 1
+            else:
+                # Full: overwrite the oldest slot and advance the window
+                pos = self._start
+                self._start = (self._start + 1) % self.capacity
+
+            for column, value in ((self._times, ts), (self._actual, actual), (self._forecast, forecast)):
+                column[pos] = value
+                column[pos + self.capacity] = value
+            return True
+
+    def extend(self, points):
+        """Append (ts, actual, forecast) points in order; returns how many were new."""
+        return sum(1 for ts, actual, forecast in points if self.append(ts, actual, forecast))
+
+    def view(self, start_ts=None):
+        """Zero-copy (times, actual, forecast) memoryviews of the buffered window.
+
+        The views alias the ring's storage, so they stay valid only until the
+        next append; copy them if they must outlive a refresh.
+        """
+        with self._lock:
+            start, end = self._start, self._start + self._size
+            times = memoryview(self._times)[start:end]
+            if start_ts is not None:
+                offset = bisect_left(times, start_ts)
+                times, start = times[offset:], start + offset
+            return (
+                times,
+                memoryview(self._actual)[start:end],
+                memoryview(self._forecast)[start:end]
+            )
+
+    def series(self, start_ts=None):
+        """Zero-copy ``LoadSeries`` over the buffered window; same lifetime as ``view()``."""
+        times, actual, forecast = self.view(start_ts)
+        return LoadSeries(
+            np.frombuffer(times, dtype=np.int64),
+            np.frombuffer(actual, dtype=np.float32),
+            np.frombuffer(forecast, dtype=np.float32)
+        )
@@ -0,0 +1,74 @@
+import numpy as np
+
+
+class LoadSeries:
+    """Columnar system load series: int64 epoch seconds plus float32 MW columns.
+
+    Roughly 16 bytes per point instead of a Python string and two floats.
+    The JSON wire format sends ``start`` + ``step`` (or integer ``offsets``
+    when the spacing is irregular) instead of one timestamp string per point.
+    """
+
+    __slots__ = ('times', 'actual', 'forecast')
+
+    def __init__(self, times, actual, forecast):
+        self.times = np.asarray(times, dtype=np.int64)
+        self.actual = np.asarray(actual, dtype=np.float32)
+        self.forecast = np.asarray(forecast, dtype=np.float32)
+
+    @classmethod
+    def from_points(cls, points):
+        """Build a series from (epoch seconds, actual, forecast) tuples."""
+        if not points:
+            return cls.empty()
+        times, actual, forecast = zip(*points)
+        return cls(times, actual, forecast)
+
+    @classmethod
+    def empty(cls):
+        return cls([], [], [])
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def nbytes(self):
+        return self.times.nbytes + self.actual.nbytes + self.forecast.nbytes
+
+    @property
+    def step(self):
+        """Spacing in seconds if the series is evenly spaced, else None."""
+        if len(self.times) < 2:
+            return None
+        deltas = np.diff(self.times)
+        return int(deltas[0]) if (deltas == deltas[0]).all() else None
+
+    def copy(self):
+        return LoadSeries(self.times.copy(), self.actual.copy(), self.forecast.copy())
+
+    def take(self, indices):
+        """Series made of the points at ``indices``."""
+        return LoadSeries(self.times[indices], self.actual[indices], self.forecast[indices])
+
+    def since(self, start_ts):
+        """Zero-copy view of the points at or after ``start_ts``."""
+        first = int(np.searchsorted(self.times, start_ts, side='left'))
+        return LoadSeries(self.times[first:], self.actual[first:], self.forecast[first:])
+
+    def points(self):
+        """Iterate (epoch seconds, actual, forecast) tuples."""
+        return zip(self.times.tolist(), self.actual.tolist(), self.forecast.tolist())
+
+    def to_wire(self, decimals=1):
+        """Compact JSON-ready dict; MW values are rounded to ``decimals`` places."""
+        wire = {
+            'start': int(self.times[0]) if len(self.times) else None,
+            'actual': np.round(self.actual.astype(np.float64), decimals).tolist(),
+            'forecast': np.round(self.forecast.astype(np.float64), decimals).tolist()
+        }
+        step = self.step
+        if step is not None:
+            wire['step'] = step
+        elif len(self.times):
+            wire['offsets'] = (self.times - self.times[0]).tolist()
+        return wire
@@ -0,0 +1,33 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import numpy as np
+from config import Config
+
+ZONE = ZoneInfo(Config.TIMEZONE)
+
+
+def utc_offsets(ts):
+    """UTC offset in seconds in effect at each epoch timestamp, daylight saving included."""
+    ts = np.asarray(ts, dtype=np.int64)
+    # Offsets only change on hour boundaries, so each distinct hour is looked up once
+    hours, inverse = np.unique(ts // 3600, return_inverse=True)
+    offsets = np.fromiter(
+        (datetime.fromtimestamp(hour * 3600, ZONE).utcoffset().total_seconds() for hour in hours.tolist()),
+        dtype=np.int64, count=len(hours)
+    )
+    return offsets[inverse].reshape(ts.shape)
+
+
+def bin_starts(ts, width):
+    """Epoch start of the local hour (``width`` 3600) or day (86400) containing each timestamp."""
+    ts = np.asarray(ts, dtype=np.int64)
+    offsets = utc_offsets(ts)
+    local = (ts + offsets) // width * width
+    # A day can start under a different offset than ts has, e.g. midnight before a 2 AM change
+    return local - utc_offsets(local - offsets)
+
+
+def local_hours(ts):
+    """Local hour of day (0-23) of each epoch timestamp."""
+    ts = np.asarray(ts, dtype=np.int64)
+    return (ts + utc_offsets(ts)) // 3600 % 24
@@ -0,0 +1,121 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from werkzeug.security import check_password_hash, generate_password_hash
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class HashingUnavailable(Exception):
+    """Every pending hashing slot is taken (the pool is saturated, not down), or a hash did not finish in time."""
+
+
+@lru_cache(maxsize=None)
+def method_prefix(method):
+    """The method string werkzeug stores in front of a hash, with every cost parameter spelled out."""
+    return generate_password_hash('', method).split('$', 1)[0]
+
+
+def needs_rehash(pwhash, method):
+    """Whether ``pwhash`` was made with a different method or cost than ``method``."""
+    return pwhash.split('$', 1)[0] != method_prefix(method)
+
+
+def _verify(pwhash, password, method):
+    """Check a password and, if it matches a hash made under an old policy, hash it again.
+
+    Runs in a pool process; both hashes cost one round trip.
+    """
+    if not check_password_hash(pwhash, password):
+        return False, None
+    if not needs_rehash(pwhash, method):
+        return True, None
+    return True, generate_password_hash(password, method)
+
+
+class PasswordHasher:
+    """Password hashing on a bounded pool of worker processes.
+
+    A slow hash then burns a pool process's CPU rather than the request's
+    worker, so concurrent requests keep being served during a login burst,
+    and no more than ``workers`` hashes ever run at once. Requests beyond
+    ``max_pending`` are turned away with ``HashingUnavailable`` instead of
+    queueing without limit. Processes are spawned, not forked, so they do
+    not inherit the server's threads and locks. With ``workers=0`` hashing
+    runs inline.
+    """
+
+    def __init__(self, method=None, workers=None, max_pending=None, timeout=None):
+        self.method = method or Config.PASSWORD_HASH_METHOD
+        self.workers = Config.PASSWORD_HASH_WORKERS if workers is None else workers
+        self.timeout = Config.PASSWORD_HASH_TIMEOUT if timeout is None else timeout
+        self.max_pending = Config.PASSWORD_HASH_MAX_PENDING if max_pending is None else max_pending
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def _discard_pool(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        # Overload is refused at once rather than holding the request's thread waiting for a slot
+        if not self._slots.acquire(blocking=False):
+            raise HashingUnavailable(
+                f"Hashing pool saturated: all {self.max_pending} pending slots are taken "
+                f"({self.workers} worker processes running)"
+            )
+
+        executor = self._pool()
+        future = None
+        try:
+            future = executor.submit(fn, *args)
+            # The slot is held until the hash actually finishes, even if this request stops waiting
+            future.add_done_callback(lambda _: self._slots.release())
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HashingUnavailable(f"Password hash took longer than {self.timeout}s")
+        except BrokenProcessPool as e:
+            logger.error("Password hashing pool failed, hashing inline: %s", e)
+            self._discard_pool(executor)
+            return fn(*args)
+        finally:
+            if future is None:
+                self._slots.release()
+
+    def hash(self, password):
+        """Hash ``password`` under the current policy."""
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        """Check ``password`` against ``pwhash``; returns ``(matches, new hash or None)``.
+
+        A new hash is returned when the password matches but ``pwhash`` was
+        made under an older method or cost, so the caller can store it.
+        """
+        if not pwhash:
+            return False, None
+        return self._run(_verify, pwhash, password, self.method)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
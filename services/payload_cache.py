@@ -0,0 +1,68 @@
+import hashlib
+import threading
+from datetime import datetime, timezone
+from services.compression import compress
+
+
+class EncodedPayload:
+    """A response body together with its strong ETag and modification time.
+
+    Compressed variants are produced lazily and kept with the payload, so a
+    cached snapshot is compressed once per encoding rather than once per request.
+    """
+
+    __slots__ = ('body', 'etag', 'last_modified', '_variants')
+
+    def __init__(self, body, last_modified=None):
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.last_modified = (
+            datetime.fromtimestamp(last_modified, timezone.utc) if last_modified else None
+        )
+        self._variants = {}
+
+    def encoded(self, encoding):
+        """Return ``(body, etag)`` for ``encoding``, or the identity body when it is None."""
+        if encoding is None:
+            return self.body, self.etag
+        variant = self._variants.get(encoding)
+        if variant is None:
+            # Strong ETags must differ between representations
+            variant = (compress(self.body, encoding), f"{self.etag}-{encoding}")
+            self._variants[encoding] = variant
+        return variant
+
+
+class PayloadCache:
+    """Encoded response bodies memoized per snapshot version.
+
+    Every client asking for the same view of the same snapshot gets the same
+    bytes, so serialization happens once per version instead of once per
+    request or per connected stream. Entries from older versions are dropped
+    as soon as a newer version is cached.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self, key, version, build):
+        """Return the cached value for ``key`` at ``version``, building it on a miss."""
+        entry = self._entries.get((key, version))
+        if entry is not None:
+            return entry
+
+        value = build()
+        with self._lock:
+            if self._version is None or version > self._version:
+                self._version = version
+                self._entries = {k: v for k, v in self._entries.items() if k[1] >= version}
+            if version >= self._version:
+                self._entries[(key, version)] = value
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._version = None
@@ -0,0 +1,66 @@
+from itertools import islice
+import numpy as np
+from services.iso_ne_parsers import loads
+
+# Points per unit of each energy-saving action
+POINT_RATES = {
+    'peak_reduction': 10,  # Per kWh reduced during peak
+    'carbon_reduction': 5,  # Per kg CO₂ reduced
+    'load_shift': 8  # Per kWh shifted to off-peak
+}
+
+NDJSON_CHUNK_SIZE = 50000  # Actions scored per vectorized pass when streaming
+
+
+def score(action_type, amount):
+    """Points for a single action; unknown action types earn nothing."""
+    return int(amount * POINT_RATES.get(action_type, 0))
+
+
+def score_actions(action_types, amounts):
+    """Points for many actions at once, one rate lookup per distinct action type.
+
+    Truncates toward zero like ``score``, and returns an int64 array aligned
+    with the inputs.
+    """
+    amounts = np.asarray(amounts, dtype=np.float64)
+    if not len(amounts):
+        return np.zeros(0, dtype=np.int64)
+    kinds, inverse = np.unique(np.asarray(action_types, dtype=object).astype(str), return_inverse=True)
+    rates = np.array([POINT_RATES.get(kind, 0) for kind in kinds], dtype=np.float64)
+    return np.trunc(amounts * rates[inverse]).astype(np.int64)
+
+
+def user_totals(user_ids, points):
+    """Sum points per user id; returns ``{user_id: total}``."""
+    if not len(points):
+        return {}
+    users, inverse = np.unique(np.asarray(user_ids), return_inverse=True)
+    totals = np.bincount(inverse, weights=points, minlength=len(users))
+    return {user: int(total) for user, total in zip(users.tolist(), totals.tolist())}
+
+
+def score_batch(actions):
+    """Score ``{'user_id', 'action_type', 'amount'}`` dicts; returns per-action points and per-user totals."""
+    user_ids, action_types, amounts = [], [], []
+    for action in actions:
+        user_ids.append(int(action['user_id']))
+        action_types.append(action.get('action_type'))
+        amounts.append(float(action.get('amount', 0)))
+
+    points = score_actions(action_types, amounts)
+    return points, user_totals(user_ids, points)
+
+
+def score_ndjson(lines, chunk_size=NDJSON_CHUNK_SIZE):
+    """Score a stream of NDJSON actions in fixed-size chunks; returns ``(count, totals)``.
+
+    Only per-user totals are kept, so memory does not grow with the stream.
+    """
+    actions = (loads(line) for line in lines if line.strip())
+    count, totals = 0, {}
+    while chunk := list(islice(actions, chunk_size)):
+        count += len(chunk)
+        for user_id, total in score_batch(chunk)[1].items():
+            totals[user_id] = totals.get(user_id, 0) + total
+    return count, totals
@@ -0,0 +1,140 @@
+from sqlalchemy import bindparam, text
+
+_INSERT_ENTRY = text(
+    'INSERT INTO points_ledger_entry (user_id, delta, kind, reference, idempotency_key) '
+    'VALUES (:user_id, :delta, :kind, :reference, :idempotency_key) '
+    'ON CONFLICT (user_id, idempotency_key) DO NOTHING'
+)
+_APPEND_ENTRY = text(
+    'INSERT INTO points_ledger_entry (user_id, delta, kind, reference, idempotency_key) '
+    'VALUES (:user_id, :delta, :kind, :reference, :idempotency_key)'
+)
+# Keys are stored prefixed by kind, so a client's redemption key can never match a batch award's
+# key or the 'opening' entry's. Stored keys keep to the column's 64 characters.
+KEY_PREFIXES = {'award': 'award:', 'redemption': 'redeem:'}
+KEY_LENGTH = 64
+_SCOPE_KEYS = text(
+    'UPDATE points_ledger_entry SET idempotency_key = SUBSTR(:prefix || idempotency_key, 1, 64) '
+    'WHERE kind = :kind AND idempotency_key NOT LIKE :pattern'
+)
+_CREDITED_UNDER_KEY = text('SELECT user_id FROM points_ledger_entry WHERE idempotency_key = :idempotency_key')
+# "user" is quoted because it is a reserved word in PostgreSQL
+_EXISTING_USERS = text('SELECT id FROM "user" WHERE id IN :user_ids').bindparams(bindparam('user_ids', expanding=True))
+# Balances that predate the ledger, or were set outside it, become one 'opening' entry per user
+_OPEN_BALANCES = text(
+    'INSERT INTO points_ledger_entry (user_id, delta, kind, reference, idempotency_key) '
+    'SELECT u.id, COALESCE(u.points, 0) - COALESCE(SUM(e.delta), 0), \'opening\', NULL, \'opening\' '
+    'FROM "user" u LEFT JOIN points_ledger_entry e ON e.user_id = u.id '
+    'GROUP BY u.id, u.points '
+    'HAVING COALESCE(u.points, 0) != COALESCE(SUM(e.delta), 0) '
+    'ON CONFLICT (user_id, idempotency_key) DO NOTHING'
+)
+_CREDIT = text('UPDATE "user" SET points = COALESCE(points, 0) + :delta WHERE id = :user_id')
+_DEBIT = text(
+    'UPDATE "user" SET points = points - :cost '
+    'WHERE id = :user_id AND points >= :cost '
+    'RETURNING points'
+)
+_BALANCE = text('SELECT COALESCE(points, 0) FROM "user" WHERE id = :user_id')
+_HISTORY = text(
+    'SELECT delta, kind, reference, created_at FROM points_ledger_entry '
+    'WHERE user_id = :user_id ORDER BY id DESC LIMIT :limit'
+)
+
+# Outcomes of redeem()
+REDEEMED = 'redeemed'
+DUPLICATE = 'duplicate'
+INSUFFICIENT = 'insufficient'
+
+
+class InsufficientPoints(Exception):
+    """Raised inside the redemption transaction so the ledger entry is rolled back."""
+
+
+def scoped_key(kind, idempotency_key):
+    """The key stored for a ``kind`` entry made under a caller's ``idempotency_key``."""
+    if idempotency_key is None:
+        return None
+    return (KEY_PREFIXES[kind] + idempotency_key)[:KEY_LENGTH]
+
+
+def award_many(conn, totals, reference, idempotency_key=None):
+    """Award ``{user_id: points}`` to a whole population in one transaction.
+
+    With an ``idempotency_key`` (e.g. the nightly job's run date), users
+    already credited under that key are skipped, so a retried run never pays
+    twice; a concurrent run with the same key fails on the unique key and
+    rolls back. Ids with no user are skipped. Returns the number of users
+    credited.
+    """
+    idempotency_key = scoped_key('award', idempotency_key)
+    if idempotency_key is not None:
+        credited = {row[0] for row in conn.execute(_CREDITED_UNDER_KEY, {'idempotency_key': idempotency_key})}
+    else:
+        credited = set()
+    existing = {row[0] for row in conn.execute(_EXISTING_USERS, {'user_ids': list(totals)})} if totals else set()
+
+    rows = [
+        {'user_id': user_id, 'delta': int(points), 'kind': 'award',
+         'reference': reference, 'idempotency_key': idempotency_key}
+        for user_id, points in totals.items()
+        if int(points) and user_id in existing and user_id not in credited
+    ]
+    if rows:
+        conn.execute(_APPEND_ENTRY, rows)
+        conn.execute(_CREDIT, rows)
+    return len(rows)
+
+
+def scope_keys(conn):
+    """Prefix keys stored before they were scoped by kind; returns how many were updated."""
+    return sum(
+        conn.execute(_SCOPE_KEYS, {'kind': kind, 'prefix': prefix, 'pattern': f'{prefix}%'}).rowcount
+        for kind, prefix in KEY_PREFIXES.items()
+    )
+
+
+def open_balances(conn):
+    """Record each balance the ledger does not account for as an ``opening`` entry; returns how many.
+
+    Run once the ledger table exists, so balances earned before it count
+    toward history. Each user gets at most one opening entry.
+    """
+    return conn.execute(_OPEN_BALANCES).rowcount
+
+
+def redeem(engine, user_id, cost, reward_id, idempotency_key):
+    """Spend ``cost`` points on a reward exactly once per ``idempotency_key``.
+
+    The ledger insert claims the key first, so a retried request conflicts
+    and never reaches the balance. The balance is then debited by a single
+    conditional UPDATE, which cannot go negative or lose a concurrent
+    update, and the whole transaction rolls back if it matches no row.
+    Returns ``(outcome, balance)``.
+    """
+    try:
+        with engine.begin() as conn:
+            claimed = conn.execute(_INSERT_ENTRY, {
+                'user_id': user_id, 'delta': -int(cost), 'kind': 'redemption',
+                'reference': reward_id, 'idempotency_key': scoped_key('redemption', idempotency_key)
+            }).rowcount
+            if not claimed:
+                return DUPLICATE, balance(conn, user_id)
+
+            remaining = conn.execute(_DEBIT, {'user_id': user_id, 'cost': int(cost)}).scalar()
+            if remaining is None:
+                raise InsufficientPoints()
+            return REDEEMED, remaining
+    except InsufficientPoints:
+        with engine.connect() as conn:
+            return INSUFFICIENT, balance(conn, user_id)
+
+
+def balance(conn, user_id):
+    """The user's maintained balance snapshot; never sums the ledger."""
+    return conn.execute(_BALANCE, {'user_id': user_id}).scalar() or 0
+
+
+def history(conn, user_id, limit=10):
+    """The user's most recent ledger entries, newest first."""
+    return [dict(row) for row in conn.execute(_HISTORY, {'user_id': user_id, 'limit': limit}).mappings()]
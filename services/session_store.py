@@ -0,0 +1,224 @@
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from sqlalchemy import text
+from werkzeug.datastructures import CallbackDict
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_LOAD = text('SELECT data, version, expires_at FROM user_session WHERE sid = :sid')
+_SAVE = text(
+    'INSERT INTO user_session (sid, data, version, expires_at) VALUES (:sid, :data, 1, :expires_at) '
+    'ON CONFLICT (sid) DO UPDATE SET data = excluded.data, version = user_session.version + 1, '
+    'expires_at = excluded.expires_at '
+    'RETURNING version'
+)
+_DELETE = text('DELETE FROM user_session WHERE sid = :sid')
+_PURGE = text('DELETE FROM user_session WHERE expires_at < :now')
+
+
+def load_secret_key(path):
+    """The ``SECRET_KEY`` setting, or a random key kept in ``path`` and shared by every worker.
+
+    The first process to start creates the file; concurrent starters link
+    their own candidate into place, so exactly one key wins and all read it.
+    """
+    if Config.SECRET_KEY:
+        return Config.SECRET_KEY
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+
+    candidate = f'{path}.{os.getpid()}'
+    with open(os.open(candidate, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as f:
+        f.write(secrets.token_bytes(32))
+    try:
+        os.link(candidate, path)
+    except FileExistsError:
+        pass
+    finally:
+        os.remove(candidate)
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Session data held server-side under ``sid``; the cookie carries only the signed id and version."""
+
+    def __init__(self, initial=None, sid=None, version=0):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.version = version
+        self.regenerated = False
+        self.modified = False
+        self.accessed = False
+
+    @property
+    def new(self):
+        return self.sid is None
+
+    def __getitem__(self, key):
+        self.accessed = True
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed = True
+        return super().get(key, default)
+
+    def setdefault(self, key, default=None):
+        self.accessed = True
+        return super().setdefault(key, default)
+
+    def regenerate(self):
+        """Move the data to a fresh session id, dropping the old one; call when the user logs in or out."""
+        self.regenerated = True
+        self.modified = True
+
+    def clear(self):
+        super().clear()
+        self.regenerate()
+
+
+class SessionCache:
+    """Small LRU of serialized sessions keyed by ``(sid, version)``.
+
+    A version is never reused, so an entry can only go stale by its session
+    being deleted elsewhere; the TTL bounds how long that goes unnoticed. An
+    entry whose session has expired is dropped on lookup.
+    """
+
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sid, version):
+        with self._lock:
+            entry = self._entries.get((sid, version))
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic() or entry[2] < time.time():
+                del self._entries[(sid, version)]
+                return None
+            self._entries.move_to_end((sid, version))
+            return entry[1]
+
+    def put(self, sid, version, data, expires_at):
+        """Cache a session's data; ``expires_at`` is the session's own expiry in epoch seconds."""
+        with self._lock:
+            self._entries[(sid, version)] = (time.monotonic() + self.ttl, data, expires_at)
+            self._entries.move_to_end((sid, version))
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def discard(self, sid, version):
+        with self._lock:
+            self._entries.pop((sid, version), None)
+
+
+class ServerSessionInterface(SessionInterface):
+    """Sessions stored in the application database, so every worker and node sees the same ones.
+
+    Requests are served from the in-process cache whenever the cookie's
+    session version is cached, and read the ``user_session`` row otherwise.
+    Rows are only written when the session changes.
+    """
+
+    serializer = TaggedJSONSerializer()
+    session_class = ServerSession
+
+    def __init__(self, engine, cache_size=None, cache_ttl=None):
+        self.engine = engine
+        self.cache = SessionCache(
+            cache_size or Config.SESSION_CACHE_SIZE,
+            Config.SESSION_CACHE_TTL if cache_ttl is None else cache_ttl
+        )
+        self._purged_at = 0.0
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='server-session')
+
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if not cookie or not app.secret_key:
+            return self.session_class()
+        try:
+            sid, version = self._signer(app).unsign(cookie).decode().rsplit('.', 1)
+            version = int(version)
+        except (BadSignature, ValueError):
+            return self.session_class()
+
+        data = self.cache.get(sid, version)
+        if data is None:
+            try:
+                with self.engine.connect() as conn:
+                    row = conn.execute(_LOAD, {'sid': sid}).first()
+            except Exception as e:
+                logger.error("Error loading session: %s", e)
+                return self.session_class()
+            if row is None or row.expires_at < time.time():
+                return self.session_class()
+            data, version = row.data, row.version
+            self.cache.put(sid, version, data, row.expires_at)
+        return self.session_class(self.serializer.loads(data), sid=sid, version=version)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+        if not session.modified:
+            return
+
+        with self.engine.begin() as conn:
+            if session.sid is not None and (session.regenerated or not session):
+                conn.execute(_DELETE, {'sid': session.sid})
+                self.cache.discard(session.sid, session.version)
+                session.sid = None
+
+            if not session:
+                response.delete_cookie(name, domain=domain, path=path, secure=secure,
+                                       samesite=samesite, httponly=httponly)
+                response.vary.add('Cookie')
+                return
+
+            if session.sid is None:
+                session.sid = secrets.token_urlsafe(32)
+            data = self.serializer.dumps(dict(session))
+            expires_at = int(time.time() + app.permanent_session_lifetime.total_seconds())
+            session.version = conn.execute(_SAVE, {
+                'sid': session.sid, 'data': data, 'expires_at': expires_at
+            }).scalar()
+            self._purge_expired(conn)
+        self.cache.put(session.sid, session.version, data, expires_at)
+
+        cookie = self._signer(app).sign(f'{session.sid}.{session.version}').decode()
+        response.set_cookie(name, cookie, expires=self.get_expiration_time(app, session), httponly=httponly,
+                            domain=domain, path=path, secure=secure, samesite=samesite)
+        response.vary.add('Cookie')
+
+    def _purge_expired(self, conn):
+        """Delete expired sessions, at most once per ``SESSION_PURGE_INTERVAL``."""
+        now = time.time()
+        if now - self._purged_at >= Config.SESSION_PURGE_INTERVAL:
+            self._purged_at = now
+            conn.execute(_PURGE, {'now': int(now)})
@@ -0,0 +1,153 @@
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import numpy as np
+from services.load_series import LoadSeries
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PKWSNAP1'
+# magic, sequence, version, fetched_at, metadata bytes, load points
+HEADER = struct.Struct('<8sQQdII')
+HEADER_SIZE = 64
+SEQUENCE_OFFSET = 8
+VERSION_OFFSET = 16
+NO_LOAD = 0xFFFFFFFF  # Load point count meaning the snapshot's systemLoad is None
+READ_ATTEMPTS = 100
+
+
+def _aligned(n):
+    return (n + 7) & ~7
+
+
+def encode(data):
+    """Split a dashboard snapshot into JSON metadata and the raw columns of its LoadSeries."""
+    load = data.get('systemLoad')
+    meta = json.dumps({k: v for k, v in data.items() if k != 'systemLoad'}, separators=(',', ':')).encode()
+    if not isinstance(load, LoadSeries):
+        return meta, NO_LOAD, b''
+    return meta, len(load), load.times.tobytes() + load.actual.tobytes() + load.forecast.tobytes()
+
+
+def decode(meta, points, columns):
+    """Rebuild a snapshot from ``encode``'s parts."""
+    data = json.loads(meta)
+    if points == NO_LOAD:
+        data['systemLoad'] = None
+    else:
+        times = np.frombuffer(columns, dtype=np.int64, count=points)
+        actual = np.frombuffer(columns, dtype=np.float32, count=points, offset=points * 8)
+        forecast = np.frombuffer(columns, dtype=np.float32, count=points, offset=points * 12)
+        data['systemLoad'] = LoadSeries(times, actual, forecast)
+    return data
+
+
+class SharedSnapshot:
+    """The dashboard snapshot published through a memory-mapped file shared by every worker.
+
+    One process at a time holds an exclusive ``flock`` on the file and is the
+    writer; it fetches from ISO-NE and publishes. Everyone else reads. The
+    header is a seqlock: the writer makes the sequence odd, writes the
+    snapshot, then makes it even again, and a reader retries until it copies
+    the snapshot between two equal, even sequence reads. Checking for a new
+    version reads eight bytes of the mapping in place, so readers only decode
+    when something new was published. A lock holder that exits releases the
+    lock, and another worker takes over writing.
+    """
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+        self.is_writer = False
+        self._lock = threading.Lock()
+        self._open()
+        os.register_at_fork(after_in_child=self._reopen)
+
+    def _open(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < self.size:
+            os.ftruncate(self._fd, self.size)
+        self._map = mmap.mmap(self._fd, self.size)
+
+    def _reopen(self):
+        """A forked child gets its own lock file description, so it never inherits the parent's writer role."""
+        self._lock = threading.Lock()
+        self.is_writer = False
+        os.close(self._fd)
+        self._map.close()
+        self._open()
+
+    def try_become_writer(self):
+        """Take the writer role if no other process holds it; returns whether this process is the writer."""
+        with self._lock:
+            if not self.is_writer:
+                try:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    self.is_writer = True
+                    logger.info("Process %s is now the shared snapshot writer", os.getpid())
+                except BlockingIOError:
+                    pass
+            return self.is_writer
+
+    @property
+    def version(self):
+        """Version of the published snapshot, 0 when nothing has been published."""
+        if self._map[:8] != MAGIC:
+            return 0
+        return struct.unpack_from('<Q', self._map, VERSION_OFFSET)[0]
+
+    def publish(self, data, fetched_at):
+        """Write ``data`` as the next version; returns that version, or None if it does not fit."""
+        meta, points, columns = encode(data)
+        meta_start = HEADER_SIZE
+        columns_start = meta_start + _aligned(len(meta))
+        if columns_start + len(columns) > self.size:
+            logger.error("Snapshot of %s bytes does not fit the %s byte shared file",
+                         columns_start + len(columns), self.size)
+            return None
+
+        with self._lock:
+            if not self.is_writer:
+                return None
+            m = self._map
+            previous = HEADER.unpack_from(m, 0) if m[:8] == MAGIC else (MAGIC, 0, 0, 0.0, 0, 0)
+            sequence, version = (previous[1] + 1) | 1, previous[2] + 1
+            struct.pack_into('<8sQ', m, 0, MAGIC, sequence)  # Odd: readers retry until it is even again
+            m[meta_start:meta_start + len(meta)] = meta
+            m[columns_start:columns_start + len(columns)] = columns
+            HEADER.pack_into(m, 0, MAGIC, sequence, version, fetched_at, len(meta), points)
+            # The even sequence goes last, on its own, so no reader pairs it with a half-written header
+            struct.pack_into('<Q', m, SEQUENCE_OFFSET, sequence + 1)
+            return version
+
+    def read(self):
+        """Copy out the published snapshot; returns ``(version, fetched_at, data)`` or None."""
+        m = self._map
+        for attempt in range(READ_ATTEMPTS):
+            magic, sequence, version, fetched_at, meta_length, points = HEADER.unpack_from(m, 0)
+            if magic != MAGIC or version == 0:
+                return None
+            if sequence % 2 == 0:
+                columns_start = HEADER_SIZE + _aligned(meta_length)
+                columns_length = 0 if points == NO_LOAD else points * 16
+                if columns_start + columns_length <= self.size:
+                    meta = m[HEADER_SIZE:HEADER_SIZE + meta_length]
+                    columns = m[columns_start:columns_start + columns_length]
+                    if struct.unpack_from('<Q', m, SEQUENCE_OFFSET)[0] == sequence:
+                        return version, fetched_at, decode(meta, points, columns)
+            time.sleep(0.001 * attempt)  # A publish is in progress
+        logger.warning("Gave up reading the shared snapshot after %s attempts", READ_ATTEMPTS)
+        return None
+
+    def close(self):
+        with self._lock:
+            if self.is_writer:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+                self.is_writer = False
+            self._map.close()
+            os.close(self._fd)
@@ -0,0 +1,100 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+
+# Attributes every LogRecord has; anything else on a record came from ``extra=``
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line.
+
+    The unformatted message template is emitted as ``event`` so log pipelines
+    can group on it, and fields passed through ``extra=`` become top-level keys.
+    """
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'event': record.msg if isinstance(record.msg, str) else repr(record.msg),
+            'message': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """Per-message-key token bucket for records below WARNING.
+
+    The key is the logger name plus the unformatted message template, which is
+    why call sites must use lazy ``%s`` arguments instead of f-strings. Records
+    that pass after some were dropped carry a ``suppressed`` count. Warnings
+    and errors always pass. Only the ``max_keys`` most recently used keys keep
+    a bucket, so messages built with f-strings cannot grow it without bound.
+    """
+
+    def __init__(self, per_minute=None, burst=None, max_keys=None):
+        super().__init__()
+        self.rate = (per_minute or Config.LOG_RATE_LIMIT_PER_MINUTE) / 60.0
+        self.burst = burst or Config.LOG_RATE_LIMIT_BURST
+        self.max_keys = max_keys or Config.LOG_RATE_LIMIT_KEYS
+        self._buckets = OrderedDict()  # key -> [tokens, last refill, suppressed], least recently used first
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+
+            bucket[0] -= 1
+            if bucket[2]:
+                record.suppressed = bucket[2]
+                bucket[2] = 0
+        return True
+
+
+def log_payload(logger, message, payload):
+    """Log an upstream payload body at DEBUG, only when ``Config.LOG_PAYLOADS`` is on."""
+    if Config.LOG_PAYLOADS and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(message, payload)
+
+
+def configure_logging():
+    """Install the root handler: JSON lines when ``Config.LOG_JSON`` is set, rate limited per message."""
+    handler = logging.StreamHandler()
+    if Config.LOG_JSON:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(Config.LOG_FORMAT))
+    handler.addFilter(RateLimitFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(Config.LOG_LEVEL)
+    # Neither format shows process details, so skip looking them up for every record
+    logging.logMultiprocessing = False
+    logging.logProcesses = False
@@ -0,0 +1,165 @@
+import os
+import sqlite3
+import threading
+import logging
+from datetime import datetime
+from config import Config
+from services.load_series import LoadSeries
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = [
+    # Integer epoch-second keys are the rowid, so appends land at the end of the B-tree
+    """CREATE TABLE IF NOT EXISTS price_ticks (
+        ts INTEGER PRIMARY KEY,
+        price REAL NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS load_points (
+        ts INTEGER PRIMARY KEY,
+        actual REAL NOT NULL,
+        forecast REAL
+    )""",
+    """CREATE TABLE IF NOT EXISTS fuel_mix (
+        ts INTEGER NOT NULL,
+        fuel TEXT NOT NULL,
+        mw REAL NOT NULL,
+        PRIMARY KEY (ts, fuel)
+    ) WITHOUT ROWID""",
+]
+
+
+def to_epoch(value):
+    """Convert a datetime, ISO-8601 string or number to epoch seconds."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return int(value.timestamp())
+
+
+def to_iso(ts):
+    """Convert epoch seconds to a local, timezone-aware ISO-8601 string."""
+    return datetime.fromtimestamp(ts).astimezone().isoformat()
+
+
+class TimeSeriesStore:
+    """Embedded SQLite store for every price tick, fuel mix and load point we ingest."""
+
+    SERIES = ('price', 'load', 'fuel_mix')
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+        conn = self._connection()
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=Config.TIMESERIES_BUSY_TIMEOUT)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _write(self, sql, rows):
+        if not rows:
+            return 0
+        conn = self._connection()
+        with self._write_lock, conn:
+            conn.executemany(sql, rows)
+        return len(rows)
+
+    def record_price(self, ts, price):
+        """Record a single price tick."""
+        return self._write(
+            'INSERT OR REPLACE INTO price_ticks (ts, price) VALUES (?, ?)',
+            [(to_epoch(ts), float(price))]
+        )
+
+    def record_fuel_mix(self, ts, megawatts):
+        """Record a fuel mix snapshot as one row per fuel category."""
+        ts = to_epoch(ts)
+        return self._write(
+            'INSERT OR REPLACE INTO fuel_mix (ts, fuel, mw) VALUES (?, ?, ?)',
+            [(ts, fuel, float(mw)) for fuel, mw in megawatts.items()]
+        )
+
+    def record_load(self, timestamps, actual, forecast):
+        """Record load points; later revisions of the same interval replace earlier ones."""
+        return self._write(
+            'INSERT OR REPLACE INTO load_points (ts, actual, forecast) VALUES (?, ?, ?)',
+            [(to_epoch(t), float(a), float(f)) for t, a, f in zip(timestamps, actual, forecast)]
+        )
+
+    def record_snapshot(self, data, fetched_at=None):
+        """Record the API-sourced price and fuel mix of a dashboard snapshot."""
+        api_info = data.get('api_info', {})
+        fetched_at = to_epoch(fetched_at or datetime.now())
+        # Price and fuel mix have no upstream timestamp, so align them to the ISO interval
+        interval_start = fetched_at - fetched_at % Config.ISO_PUBLICATION_INTERVAL
+
+        if api_info.get('price_data_source') == 'api':
+            self.record_price(interval_start, data['price']['current'])
+
+        if api_info.get('fuel_mix_source') == 'api':
+            self.record_fuel_mix(interval_start, data['resourceMix']['megawatts'])
+
+        # Load points are recorded as they are ingested, see IsoNeService._fetch_system_load
+
+    def price_rows(self, start, end):
+        """Return raw (ts, price) rows with start <= ts <= end."""
+        return self._connection().execute(
+            'SELECT ts, price FROM price_ticks WHERE ts BETWEEN ? AND ? ORDER BY ts',
+            (to_epoch(start), to_epoch(end))
+        ).fetchall()
+
+    def load_rows(self, start, end):
+        """Return raw (ts, actual, forecast) load rows with start <= ts <= end."""
+        return self._connection().execute(
+            'SELECT ts, actual, forecast FROM load_points WHERE ts BETWEEN ? AND ? ORDER BY ts',
+            (to_epoch(start), to_epoch(end))
+        ).fetchall()
+
+    def fuel_mix_rows(self, start, end):
+        """Return raw (ts, fuel, mw) fuel mix rows with start <= ts <= end."""
+        return self._connection().execute(
+            'SELECT ts, fuel, mw FROM fuel_mix WHERE ts BETWEEN ? AND ? ORDER BY ts, fuel',
+            (to_epoch(start), to_epoch(end))
+        ).fetchall()
+
+    def query(self, series, start, end):
+        """Return the points of ``series`` with start <= ts <= end, ordered by time."""
+        if series not in self.SERIES:
+            raise ValueError(f"Unknown series '{series}', expected one of {', '.join(self.SERIES)}")
+
+        start, end = to_epoch(start), to_epoch(end)
+
+        if series == 'price':
+            rows = self.price_rows(start, end)
+            return {
+                'timestamps': [to_iso(ts) for ts, _ in rows],
+                'price': [price for _, price in rows]
+            }
+
+        if series == 'load':
+            return LoadSeries.from_points(self.load_rows(start, end))
+
+        rows = self.fuel_mix_rows(start, end)
+        times = sorted({ts for ts, _, _ in rows})
+        index = {ts: i for i, ts in enumerate(times)}
+        megawatts = {}
+        for ts, fuel, mw in rows:
+            megawatts.setdefault(fuel, [0.0] * len(times))[index[ts]] = mw
+        return {
+            'timestamps': [to_iso(ts) for ts in times],
+            'megawatts': megawatts
+        }
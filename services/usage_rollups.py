@@ -0,0 +1,132 @@
+import numpy as np
+from sqlalchemy import text
+from config import Config
+from services.fuel_mix import carbon_intensity
+from services.local_time import bin_starts as local_bin_starts, local_hours
+
+# Rollup period -> bin width in seconds
+PERIODS = {'hour': 3600, 'day': 86400}
+
+# kg CO2/kWh used for hours without stored grid history
+DEFAULT_CARBON_PER_KWH = carbon_intensity(Config.DEFAULT_FUEL_MIX) / 1000
+
+_EXISTING_READINGS = text(
+    'SELECT ts, kwh FROM usage_reading WHERE user_id = :user_id AND ts BETWEEN :start AND :end'
+)
+_UPSERT_READING = text(
+    'INSERT INTO usage_reading (user_id, ts, kwh) VALUES (:user_id, :ts, :kwh) '
+    'ON CONFLICT (user_id, ts) DO UPDATE SET kwh = excluded.kwh'
+)
+_UPSERT_ROLLUP = text(
+    'INSERT INTO usage_rollup (user_id, period, start, kwh, peak_kwh, cost, carbon_kg) '
+    'VALUES (:user_id, :period, :start, :kwh, :peak_kwh, :cost, :carbon_kg) '
+    'ON CONFLICT (user_id, period, start) DO UPDATE SET '
+    'kwh = usage_rollup.kwh + excluded.kwh, '
+    'peak_kwh = usage_rollup.peak_kwh + excluded.peak_kwh, '
+    'cost = usage_rollup.cost + excluded.cost, '
+    'carbon_kg = usage_rollup.carbon_kg + excluded.carbon_kg'
+)
+_USER_READINGS = text('SELECT ts, kwh FROM usage_reading WHERE user_id = :user_id ORDER BY ts')
+_DELETE_ROLLUPS = text('DELETE FROM usage_rollup WHERE user_id = :user_id')
+_LATEST_ROLLUPS = text(
+    'SELECT * FROM (SELECT period, start, kwh, peak_kwh, cost, carbon_kg FROM usage_rollup '
+    "WHERE user_id = :user_id AND period = 'hour' ORDER BY start DESC LIMIT :hours) AS hours "
+    'UNION ALL '
+    'SELECT * FROM (SELECT period, start, kwh, peak_kwh, cost, carbon_kg FROM usage_rollup '
+    "WHERE user_id = :user_id AND period = 'day' ORDER BY start DESC LIMIT :days) AS days"
+)
+
+
+def bin_starts(ts, period):
+    """Start of the local hour or day containing each epoch timestamp."""
+    return local_bin_starts(ts, PERIODS[period])
+
+
+def rollup_rows(user_id, ts, kwh, carbon_by_hour=None):
+    """Aggregate (ts, kwh) readings into hourly and daily rollup rows.
+
+    ``kwh`` may be a change rather than a full reading, which is how
+    revisions of already-rolled-up intervals are applied. ``carbon_by_hour``
+    maps local hour starts to grid intensity in kg CO2/kWh.
+    """
+    ts = np.asarray(ts, dtype=np.int64)
+    kwh = np.asarray(kwh, dtype=np.float64)
+    hours = bin_starts(ts, 'hour')
+
+    peak = np.isin(local_hours(ts), Config.PEAK_HOURS)
+    peak_kwh = np.where(peak, kwh, 0.0)
+    cost = kwh * np.where(peak, Config.PEAK_RATE, Config.BASE_RATE)
+
+    carbon_by_hour = carbon_by_hour or {}
+    intensity = np.fromiter(
+        (carbon_by_hour.get(hour, DEFAULT_CARBON_PER_KWH) for hour in hours.tolist()),
+        dtype=np.float64, count=len(hours)
+    )
+    carbon = kwh * intensity
+
+    rows = []
+    for period in PERIODS:
+        starts, inverse = np.unique(bin_starts(ts, period), return_inverse=True)
+        totals = [np.bincount(inverse, weights=column, minlength=len(starts))
+                  for column in (kwh, peak_kwh, cost, carbon)]
+        for i, start in enumerate(starts.tolist()):
+            rows.append({
+                'user_id': user_id, 'period': period, 'start': start,
+                'kwh': totals[0][i], 'peak_kwh': totals[1][i],
+                'cost': totals[2][i], 'carbon_kg': totals[3][i]
+            })
+    return rows
+
+
+def apply_readings(conn, user_id, readings, carbon_by_hour=None):
+    """Upsert a user's interval readings and fold the changes into their rollups.
+
+    Runs in the caller's transaction. Readings already stored with the same
+    value are skipped and revised ones only contribute the difference, so
+    re-importing overlapping data never double counts. Returns the number of
+    readings that were new or changed.
+    """
+    latest = {int(ts): float(kwh) for ts, kwh in readings}  # Last value wins within a batch
+    if not latest:
+        return 0
+
+    existing = dict(conn.execute(
+        _EXISTING_READINGS,
+        {'user_id': user_id, 'start': min(latest), 'end': max(latest)}
+    ).all())
+    changed = {ts: kwh for ts, kwh in latest.items() if existing.get(ts) != kwh}
+    if not changed:
+        return 0
+
+    conn.execute(_UPSERT_READING, [
+        {'user_id': user_id, 'ts': ts, 'kwh': kwh} for ts, kwh in changed.items()
+    ])
+    ts = list(changed)
+    deltas = [kwh - existing.get(t, 0.0) for t, kwh in changed.items()]
+    conn.execute(_UPSERT_ROLLUP, rollup_rows(user_id, ts, deltas, carbon_by_hour))
+    return len(changed)
+
+
+def user_readings(conn, user_id):
+    """All of a user's stored readings as ``(ts, kwh)`` rows, oldest first."""
+    return conn.execute(_USER_READINGS, {'user_id': user_id}).all()
+
+
+def rebuild_rollups(conn, user_id, readings, carbon_by_hour=None):
+    """Replace a user's rollups with ones recomputed from ``readings`` (normally all of them)."""
+    conn.execute(_DELETE_ROLLUPS, {'user_id': user_id})
+    if not readings:
+        return 0
+    ts, kwh = zip(*readings)
+    rows = rollup_rows(user_id, ts, kwh, carbon_by_hour)
+    conn.execute(_UPSERT_ROLLUP, rows)
+    return len(rows)
+
+
+def latest_rollups(conn, user_id, hours=24, days=2):
+    """The user's most recent hourly and daily rollups in one indexed read, oldest first."""
+    rows = conn.execute(_LATEST_ROLLUPS, {'user_id': user_id, 'hours': hours, 'days': days}).mappings().all()
+    return {
+        period: sorted((dict(row) for row in rows if row['period'] == period), key=lambda row: row['start'])
+        for period in PERIODS
+    }
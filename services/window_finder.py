@@ -0,0 +1,95 @@
+from collections import namedtuple
+import numpy as np
+
+METRICS = {'price': '$/MWh', 'carbon': 'kg CO₂eq/MWh', 'load': 'MW'}  # metric -> unit
+
+Window = namedtuple('Window', ['start', 'end', 'average', 'baseline'])
+
+
+def regular_grid(times, values, interval):
+    """Resample an irregular (times, values) series onto a fixed ``interval`` grid by interpolation."""
+    times = np.asarray(times, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    if not len(times):
+        return times, values
+    grid = np.arange(times[0] - times[0] % interval, times[-1] + 1, interval, dtype=np.int64)
+    return grid, np.interp(grid, times, values)
+
+
+def persistence_forecast(times, values, now, horizon):
+    """Extend a series ``horizon`` seconds past ``now`` by repeating the same time one day earlier.
+
+    Points already at or after ``now`` (such as an ISO load forecast) are
+    kept as they are; the repeated day only fills in beyond them.
+    """
+    times = np.asarray(times, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    future = times >= now
+    last = times[future][-1] if future.any() else now - 1
+
+    shifted = times + 86400
+    fill = (shifted > last) & (shifted <= now + horizon)
+    order = np.argsort(np.concatenate((times[future], shifted[fill])), kind='stable')
+    return (
+        np.concatenate((times[future], shifted[fill]))[order],
+        np.concatenate((values[future], values[fill]))[order]
+    )
+
+
+def _suffix_argmin(values):
+    """``result[i]`` is the index of the smallest ``values[j]`` with ``j >= i``; ties go to the earliest j."""
+    reverse = values[::-1]
+    is_min = reverse <= np.minimum.accumulate(reverse)
+    latest = np.maximum.accumulate(np.where(is_min, np.arange(len(values)), 0))
+    return (len(values) - 1 - latest)[::-1]
+
+
+class WindowIndex:
+    """Lowest-average contiguous windows of a forecast, precomputed for a set of durations.
+
+    Built once per forecast update in O(n) per duration from prefix sums and
+    a suffix argmin, after which the best window starting at or after any
+    time is a binary search plus an array lookup. Lower is better, so the
+    index works unchanged for price, carbon intensity or load.
+    """
+
+    def __init__(self, times, values, interval, durations=()):
+        self.times, self.values = regular_grid(times, values, interval)
+        self.interval = interval
+        self._prefix = np.concatenate(([0.0], np.cumsum(self.values)))
+        self._tables = {}
+        for minutes in durations:
+            self._table(self._steps(minutes))
+
+    def __len__(self):
+        return len(self.times)
+
+    def _steps(self, minutes):
+        return max(1, -(-int(minutes) * 60 // self.interval))
+
+    def _table(self, steps):
+        """(window sums, suffix argmin) for windows of ``steps`` intervals, built on first use."""
+        table = self._tables.get(steps)
+        if table is None and steps <= len(self.times):
+            sums = self._prefix[steps:] - self._prefix[:-steps]
+            table = self._tables[steps] = (sums, _suffix_argmin(sums))
+        return table
+
+    def best(self, minutes, earliest=None):
+        """The lowest-average window of ``minutes`` starting at or after ``earliest``, or None."""
+        steps = self._steps(minutes)
+        table = self._table(steps)
+        if table is None:
+            return None
+        sums, best_from = table
+
+        first = 0 if earliest is None else int(np.searchsorted(self.times, earliest))
+        if first >= len(sums):
+            return None
+        best = best_from[first]
+        return Window(
+            start=int(self.times[best]),
+            end=int(self.times[best]) + steps * self.interval,
+            average=float(sums[best] / steps),
+            baseline=float(sums[first] / steps)
+        )
@@ -321,8 +321,26 @@ function updateGenerationMixChart(mixData) {
     }
 }
 
+// Expand the compact load wire format ({start, step|offsets, actual, forecast})
+// into millisecond timestamps for the time axis
+function decodeLoadSeries(loadData) {
+    if (!loadData || Array.isArray(loadData.timestamps)) {
+        return loadData;
+    }
+    const start = loadData.start || 0;
+    const timestamps = Array.isArray(loadData.offsets)
+        ? loadData.offsets.map(offset => (start + offset) * 1000)
+        : loadData.actual.map((_, i) => (start + i * (loadData.step || 0)) * 1000);
+    return {
+        timestamps,
+        actual: loadData.actual,
+        forecast: loadData.forecast
+    };
+}
+
 function updateSystemLoadChart(loadData) {
     try {
+        loadData = decodeLoadSeries(loadData);
         console.log('Attempting to update system load chart with data:', loadData);
         
         if (!systemLoadChart) {
@@ -431,10 +449,16 @@ function updateDashboard(data) {
     }
 }
 
+// Ask the server for roughly one load point per pixel of the chart
+function chartPointBudget() {
+    const canvas = document.getElementById('system-load-chart');
+    return canvas && canvas.clientWidth ? Math.round(canvas.clientWidth) : 500;
+}
+
 // Function to fetch real data from ISO-NE API
 async function fetchRealISOData() {
     try {
-        const url = '/api/dashboard-data';
+        const url = `/api/dashboard-data?points=${chartPointBudget()}`;
         console.log('Fetching real data from backend:', url);
         
         const response = await fetch(url);
@@ -474,6 +498,62 @@ function updateApiStatus(status, message) {
     }
 }
 
+// Receive a new snapshot from the server each time fresh ISO data lands
+function startLiveUpdates() {
+    const source = new EventSource(`/api/stream?points=${chartPointBudget()}`);
+    let failures = 0;
+
+    // A connection that opens counts as recovered, even before the next snapshot
+    source.onopen = () => {
+        failures = 0;
+    };
+
+    source.addEventListener('snapshot', (event) => {
+        try {
+            updateDashboard(JSON.parse(event.data));
+        } catch (error) {
+            console.error('Error handling streamed update:', error);
+        }
+    });
+
+    source.onerror = () => {
+        // A refused connection (e.g. 503 when the server has too many streams) is never retried
+        if (source.readyState === EventSource.CLOSED) {
+            console.warn('Live updates refused, falling back to polling');
+            startPolling();
+            return;
+        }
+        // Otherwise EventSource reconnects on its own; give up after repeated failures
+        failures += 1;
+        if (failures >= 3) {
+            console.warn('Live updates unavailable, falling back to polling');
+            source.close();
+            startPolling();
+        }
+    };
+}
+
+// Fetch once, then poll every 5 minutes
+async function startPolling() {
+    try {
+        const data = await fetchRealISOData();
+        updateDashboard(data);
+    } catch (error) {
+        console.error('Error fetching initial data:', error);
+        updateApiStatus('error', `Initial data fetch failed: ${error.message}`);
+    }
+
+    setInterval(async () => {
+        try {
+            const data = await fetchRealISOData();
+            updateDashboard(data);
+        } catch (error) {
+            console.error('Error in periodic update:', error);
+            updateApiStatus('error', `Update failed: ${error.message}`);
+        }
+    }, 5 * 60 * 1000);
+}
+
 // Initialize dashboard updates
 async function initDashboard() {
     try {
@@ -525,26 +605,12 @@ async function initDashboard() {
             });
         }
 
-        // Initial data fetch
-        try {
-            const data = await fetchRealISOData();
-            console.log('Initial data:', data);
-            updateDashboard(data);
-        } catch (error) {
-            console.error('Error fetching initial data:', error);
-            updateApiStatus('error', `Initial data fetch failed: ${error.message}`);
+        // Prefer server-pushed updates; fall back to polling without EventSource support
+        if (window.EventSource) {
+            startLiveUpdates();
+        } else {
+            await startPolling();
         }
-        
-        // Set up periodic updates every 5 minutes
-        setInterval(async () => {
-            try {
-                const data = await fetchRealISOData();
-                updateDashboard(data);
-            } catch (error) {
-                console.error('Error in periodic update:', error);
-                updateApiStatus('error', `Update failed: ${error.message}`);
-            }
-        }, 5 * 60 * 1000);
     } catch (error) {
         console.error('Error initializing dashboard:', error);
         updateApiStatus('error', `Dashboard initialization error: ${error.message}`);
@@ -0,0 +1,51 @@
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from config import Config
+from services.interval_import import parse_csv
+from services.local_time import ZONE, bin_starts, local_hours
+
+
+@pytest.fixture(autouse=True)
+def server_in_another_zone(monkeypatch):
+    """Run with the process clock in a zone far from ``Config.TIMEZONE``, as on a UTC or overseas host."""
+    monkeypatch.setenv('TZ', 'Asia/Tokyo')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def csv_lines(rows):
+    return ['Start Time,Usage (kWh)'] + [f'{start},{kwh}' for start, kwh in rows]
+
+
+def test_naive_times_are_read_in_the_configured_zone():
+    rows = [(f'2024-07-15 {hour:02d}:00', 1.0) for hour in range(24)]
+    epochs = [ts for ts, _ in parse_csv(csv_lines(rows))]
+
+    assert epochs == [int(datetime(2024, 7, 15, hour, tzinfo=ZONE).timestamp()) for hour in range(24)]
+    assert local_hours(epochs).tolist() == list(range(24))
+    # One file day is one rollup day
+    assert len(np.unique(bin_starts(epochs, 86400))) == 1
+
+
+def test_us_date_format_is_read_in_the_configured_zone():
+    (epoch, _), = parse_csv(csv_lines([('01/15/2024 18:00', 2.0)]))
+    assert epoch == int(datetime(2024, 1, 15, 18, tzinfo=ZONE).timestamp())
+
+
+def test_explicit_offsets_are_kept():
+    (epoch, _), = parse_csv(csv_lines([('2024-07-15T18:00:00+00:00', 1.0)]))
+    assert epoch == int(datetime.fromisoformat('2024-07-15T18:00:00+00:00').timestamp())
+
+
+@pytest.mark.skipif(Config.TIMEZONE != 'America/New_York', reason="fall-back date is specific to New York")
+def test_repeated_fall_back_hour_is_the_second_pass():
+    starts = ['00:00', '01:00', '01:30', '01:00', '01:30', '02:00']
+    epochs = [ts for ts, _ in parse_csv(csv_lines([(f'2024-11-03 {start}', 0.5) for start in starts]))]
+
+    assert np.diff(epochs).tolist() == [3600, 1800, 1800, 1800, 1800]
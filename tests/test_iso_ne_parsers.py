@@ -0,0 +1,25 @@
+import pytest
+
+from services.iso_ne_parsers import parse_load, parse_timestamp
+
+
+def test_parse_timestamp_rejects_an_empty_value():
+    with pytest.raises(ValueError):
+        parse_timestamp('')
+
+
+def test_parse_timestamp_accepts_utc_suffix():
+    assert parse_timestamp('2024-07-01T16:00:00Z') == parse_timestamp('2024-07-01T12:00:00-04:00')
+
+
+def test_parse_load_skips_blank_begin_dates():
+    data = {"SystemLoads": {"SystemLoad": [
+        {"BeginDate": "2024-07-01T12:00:00.000-04:00", "LoadMw": 14000, "LoadMwForecasted": 14100},
+        {"BeginDate": "", "LoadMw": 14050, "LoadMwForecasted": 14150},
+        {"BeginDate": "2024-07-01T12:10:00.000-04:00", "LoadMw": 14100, "LoadMwForecasted": 14200},
+    ]}}
+
+    points = parse_load(data)
+
+    assert [actual for _, actual, _ in points] == [14000.0, 14100.0]
+    assert parse_load(data, since=points[0][0]) == points[1:]